@@ -1,21 +1,31 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, ValidationError
+from fastapi import FastAPI, HTTPException, Request, Response
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from datetime import datetime
-import uvicorn
+from contextlib import asynccontextmanager
+from typing import List
 import sys
 import os
 import numpy as np
 import joblib
 import pandas as pd
 import logging
+import random
+import time
 
 # Add the parent directory to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from scripts.feature_engineering import (
-    FeatureEngineering,
-)  # Import feature engineering class
-from scripts.credit_scoring_model import CreditScoreRFM  # Import RFM class
+from scripts.feature_pipeline import FeaturePipeline  # Import fused feature pipeline
+from scripts.preprocessing import FeaturePreprocessor
+from scripts.feature_store import CustomerFeatureStore
+from api.executor import ExecutorOverloaded, InferenceExecutor
+from api.batcher import MicroBatcher
+from api.result_cache import PredictionCache, SQLiteCacheBackend
+from scripts.cache import file_digest
+from scripts.tree_engine import CompiledTreeEnsemble
+from scripts.scorecard import CreditScorecard
+from scripts.feature_selection import load_selected_features
+from api.metrics import CONTENT_TYPE, MetricsRegistry
 
 # Configure logging
 logging.basicConfig(
@@ -23,22 +33,405 @@ logging.basicConfig(
 )
 
 
-# Load the model using joblib (instead of pickle)
-try:
-    with open("api/model/best_model.pkl", "rb") as f:
-        model = joblib.load(f)
-    logging.info("Model loaded successfully.")
-    print(f"Loaded model type: {type(model)}")
+# Artifact locations, resolved relative to this file so the API can be started
+# from any working directory
+API_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.getenv("MODEL_PATH", os.path.join(API_DIR, "model", "best_model.pkl"))
+PREPROCESSOR_PATH = os.getenv(
+    "PREPROCESSOR_PATH", os.path.join(API_DIR, "model", "preprocessor.pkl")
+)
+# Optional CreditScorecard (score scaling, loan bands, calibration); the
+# defaults of CreditScorecard are used when the file does not exist
+SCORECARD_PATH = os.getenv("SCORECARD_PATH", os.path.join(API_DIR, "model", "scorecard.pkl"))
+# Model features chosen by scripts.feature_selection; REQUIRED_FEATURES is used
+# when the file does not exist
+SELECTED_FEATURES_PATH = os.getenv(
+    "SELECTED_FEATURES_PATH", os.path.join(API_DIR, "model", "selected_features.json")
+)
+
+# joblib mmap_mode for the model, e.g. 'r' to memory-map the node arrays of a
+# compiled model exported by api.serve instead of copying them into the process
+MODEL_MMAP_MODE = os.getenv("MODEL_MMAP_MODE") or None
+
+# Optional customer feature store: unset disables it, ':memory:' keeps it in
+# process, any other value is a SQLite file that persists across restarts
+FEATURE_STORE_PATH = os.getenv("FEATURE_STORE_PATH")
+# Number of recent TransactionIds the store remembers to skip replayed transactions
+FEATURE_STORE_DEDUP_WINDOW = int(os.getenv("FEATURE_STORE_DEDUP_WINDOW", "100000"))
+
+# Inference backend: 'sklearn' calls the trained estimator, 'compiled' flattens
+# it into a CompiledTreeEnsemble at startup (a MODEL_PATH that already holds a
+# compiled model is served as is)
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "sklearn")
+
+# Inference thread pool: number of threads, maximum running + queued calls
+# before answering 503, and BLAS/OpenMP threads per call (0 leaves them as is)
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "0")) or None
+INFERENCE_MAX_PENDING = int(os.getenv("INFERENCE_MAX_PENDING", "0")) or None
+INFERENCE_BLAS_THREADS = int(os.getenv("INFERENCE_BLAS_THREADS", "1"))
+
+# Opt-in micro-batching of concurrent /predict calls: the longest time a request
+# waits for others (0 disables it) and the batch size that triggers processing
+MICROBATCH_WINDOW_MS = float(os.getenv("MICROBATCH_WINDOW_MS", "0"))
+MICROBATCH_MAX_SIZE = int(os.getenv("MICROBATCH_MAX_SIZE", "64"))
+
+# Cache of /predict results for repeated payloads: number of entries kept in
+# memory (0 disables it), their lifetime in seconds, and an optional SQLite
+# file shared by the workers of one host
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "60"))
+PREDICTION_CACHE_PATH = os.getenv("PREDICTION_CACHE_PATH")
+
+# Fraction of requests whose per-request log lines are written: 1 logs every
+# request at INFO, lower values log that sampled fraction at DEBUG, 0 disables them
+REQUEST_LOG_SAMPLE_RATE = float(os.getenv("REQUEST_LOG_SAMPLE_RATE", "1"))
+
+# Features of the shipped model, in training order, used when no selected
+# feature list has been exported
+REQUIRED_FEATURES = [
+    "ProductCategory",
+    "PricingStrategy",
+    "Transaction_Count",
+    "Transaction_Month",
+    "Transaction_Year",
+    "Recency",
+    "Frequency",
+]
+
+# Synthetic transaction used to warm up the feature pipeline and the model
+WARMUP_RECORD = {
+    "TransactionId": 0,
+    "CustomerId": 0,
+    "ProductCategory": 0,
+    "ChannelId": "ChannelId_3",
+    "Amount": 0.0,
+    "TransactionStartTime": "2019-01-01T00:00:00Z",
+    "PricingStrategy": 2,
+}
+
+# Set by load_artifacts(), get_executor() and get_batcher(), at startup or on first use
+model = None
+model_version = None
+feature_pipeline = None
+scorecard = None
+prediction_cache = None
+executor = None
+batcher = None
+
+# Prometheus metrics exposed on /metrics
+metrics = MetricsRegistry()
+REQUEST_COUNT = metrics.counter(
+    "credit_api_requests_total", "HTTP requests handled, by route and status code.",
+    ["path", "status"],
+)
+REQUEST_LATENCY = metrics.histogram(
+    "credit_api_request_duration_seconds", "End-to-end HTTP request latency, by route.",
+    ["path"],
+)
+REQUESTS_IN_FLIGHT = metrics.gauge(
+    "credit_api_requests_in_flight", "HTTP requests currently being handled."
+)
+STAGE_LATENCY = metrics.histogram(
+    "credit_api_stage_duration_seconds",
+    "Time spent per inference stage: parse, frame, features_customer, features_columns, "
+    "store_flush, model and scoring.",
+    ["stage"],
+)
+BATCH_ROWS = metrics.histogram(
+    "credit_api_prediction_batch_rows", "Records scored per model call.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096),
+)
+metrics.callback(
+    "credit_api_prediction_cache_hits_total", "Prediction cache hits.",
+    lambda: prediction_cache.hits if prediction_cache is not None else None, "counter",
+)
+metrics.callback(
+    "credit_api_prediction_cache_misses_total", "Prediction cache misses.",
+    lambda: prediction_cache.misses if prediction_cache is not None else None, "counter",
+)
+metrics.callback(
+    "credit_api_prediction_cache_entries", "Entries held in the prediction cache.",
+    lambda: len(prediction_cache) if prediction_cache is not None else None,
+)
+metrics.callback(
+    "credit_api_inference_pending", "Inference calls running or queued in the thread pool.",
+    lambda: executor.pending if executor is not None else None,
+)
+
+
+def sample_request_log() -> int:
+    """
+    Decide whether this request's log lines are written.
+
+    Returns
+    -------
+    int
+        The logging level to use, or 0 to skip the request's log lines.
+    """
+    if REQUEST_LOG_SAMPLE_RATE >= 1:
+        return logging.INFO
+    if REQUEST_LOG_SAMPLE_RATE > 0 and random.random() < REQUEST_LOG_SAMPLE_RATE:
+        return logging.DEBUG
+    return 0
+
+
+def log_request(level: int, message: str, *args) -> None:
+    """Write a per-request log line at the sampled ``level`` (0 skips it)."""
+    if level:
+        logging.log(level, message, *args)
+
+
+def load_model(path: str = None, mmap_mode: str = None):
+    """
+    Load the trained model with joblib.
+
+    Parameters
+    ----------
+    path : str, optional
+        Model file. Defaults to ``MODEL_PATH``.
+    mmap_mode : str, optional
+        joblib ``mmap_mode``. Defaults to ``MODEL_MMAP_MODE``.
+
+    Returns
+    -------
+    object
+        The fitted model.
+    """
+    path = path or MODEL_PATH
+    mmap_mode = mmap_mode or MODEL_MMAP_MODE
+    try:
+        loaded = joblib.load(path, mmap_mode=mmap_mode)
+    except FileNotFoundError:
+        logging.error(f"Model file not found at '{path}'. Set MODEL_PATH to the trained model.")
+        raise
+    if mmap_mode and not isinstance(loaded, CompiledTreeEnsemble):
+        # sklearn trees copy their node arrays on unpickling, so they are not mapped
+        logging.warning(
+            "MODEL_MMAP_MODE does not share the trees of an sklearn model between processes; "
+            "export a compiled copy with 'python -m api.serve --export-model <path>'."
+        )
+    logging.info(f"Model loaded from '{path}': {type(loaded).__name__}.")
+    return loaded
+
+
+def load_required_features() -> List[str]:
+    """
+    Return the model features: the exported selection if there is one, else
+    ``REQUIRED_FEATURES``.
+
+    Raises
+    ------
+    ValueError
+        If a feature cannot be computed from the ``InputData`` fields, or if the
+        loaded model was trained on other features.
+    """
+    if os.path.exists(SELECTED_FEATURES_PATH):
+        features = load_selected_features(SELECTED_FEATURES_PATH)
+        logging.info(f"Selected features loaded from '{SELECTED_FEATURES_PATH}': {features}.")
+    else:
+        features = list(REQUIRED_FEATURES)
+    # The pipeline would silently fill these with 0
+    input_fields = list(InputData.model_fields)
+    unknown = [name for name in features if not FeaturePipeline.can_compute(name, input_fields)]
+    if unknown:
+        raise ValueError(
+            f"Features {unknown} cannot be computed from the /predict input fields "
+            f"{input_fields}; select features the feature pipeline can derive."
+        )
+    trained_on = getattr(model, "feature_names_in_", None)
+    if trained_on is not None and list(trained_on) != features:
+        raise ValueError(
+            f"The model was trained on {list(trained_on)} but the feature list is {features}; "
+            "retrain the model on the selected features or remove the selection."
+        )
+    return features
+
+
+def load_artifacts() -> None:
+    """
+    Load the model, preprocessor and feature store, plan the feature pipeline and
+    create the prediction cache.
+    """
+    global model, model_version, feature_pipeline, scorecard, prediction_cache
+    if model is None:
+        if MODEL_BACKEND not in ("sklearn", "compiled"):
+            raise ValueError(f"Unknown MODEL_BACKEND '{MODEL_BACKEND}'; use 'sklearn' or 'compiled'.")
+        model = load_model()
+        if MODEL_BACKEND == "compiled" and not isinstance(model, CompiledTreeEnsemble):
+            model = CompiledTreeEnsemble.from_sklearn(model)
+            logging.info(f"Model compiled into {model.n_trees} flattened trees.")
+        # Identifies the artifacts that determine predictions, to key cached results
+        artifacts = [MODEL_PATH] + [
+            path for path in (PREPROCESSOR_PATH, SCORECARD_PATH, SELECTED_FEATURES_PATH)
+            if os.path.exists(path)
+        ]
+        model_version = "-".join(file_digest(path)[:16] for path in artifacts)
+
+    if feature_pipeline is None:
+        # Load the preprocessor fitted alongside the model, if one has been exported
+        if os.path.exists(PREPROCESSOR_PATH):
+            preprocessor = FeaturePreprocessor.load(PREPROCESSOR_PATH)
+            logging.info("Preprocessor loaded successfully.")
+        else:
+            preprocessor = None
+            logging.warning(
+                "Preprocessor file not found; encoders and scalers will be fitted per request. "
+                "Run 'python -m scripts.preprocessing <data.csv>' to export one."
+            )
+
+        if FEATURE_STORE_PATH:
+            feature_store = CustomerFeatureStore(FEATURE_STORE_PATH, dedup_window=FEATURE_STORE_DEDUP_WINDOW)
+            logging.info(f"Customer feature store enabled with {len(feature_store)} customers.")
+            if preprocessor is None:
+                logging.error(
+                    "Feature store enabled without a preprocessor; stored customer aggregates are "
+                    "served unscaled. Export one with 'python -m scripts.preprocessing <data.csv>'."
+                )
+        else:
+            feature_store = None
+
+        # Plan the feature computation once for every request
+        feature_pipeline = FeaturePipeline(
+            load_required_features(), preprocessor=preprocessor, feature_store=feature_store
+        )
+
+    if scorecard is None:
+        if os.path.exists(SCORECARD_PATH):
+            scorecard = CreditScorecard.load(SCORECARD_PATH)
+            logging.info("Scorecard loaded successfully.")
+        else:
+            scorecard = CreditScorecard()
+
+    if prediction_cache is None and PREDICTION_CACHE_SIZE > 0:
+        backend = (
+            SQLiteCacheBackend(PREDICTION_CACHE_PATH, max_entries=PREDICTION_CACHE_SIZE)
+            if PREDICTION_CACHE_PATH else None
+        )
+        prediction_cache = PredictionCache(
+            PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL, namespace=model_version, backend=backend
+        )
+
+
+def get_model():
+    """Return the loaded model, loading it on first use."""
+    if model is None:
+        load_artifacts()
+    return model
+
+
+def get_scorecard() -> CreditScorecard:
+    """Return the credit scorecard, loading artifacts on first use."""
+    if scorecard is None:
+        load_artifacts()
+    return scorecard
+
+
+def get_feature_pipeline() -> FeaturePipeline:
+    """Return the planned feature pipeline, loading artifacts on first use."""
+    if feature_pipeline is None:
+        load_artifacts()
+    return feature_pipeline
+
+
+def get_executor() -> InferenceExecutor:
+    """Return the inference thread pool, creating it on first use."""
+    global executor
+    if executor is None:
+        executor = InferenceExecutor(
+            max_workers=INFERENCE_WORKERS,
+            max_pending=INFERENCE_MAX_PENDING,
+            blas_threads=INFERENCE_BLAS_THREADS,
+        )
+    return executor
+
+
+def get_prediction_cache():
+    """Return the prediction result cache, or None when caching is disabled."""
+    if prediction_cache is None and PREDICTION_CACHE_SIZE > 0:
+        load_artifacts()
+    return prediction_cache
+
+
+async def run_in_executor(func, *args):
+    """Run ``func(*args)`` in the current inference thread pool."""
+    return await get_executor().run(func, *args)
+
+
+def get_batcher():
+    """
+    Return the /predict micro-batcher, or None when micro-batching is disabled.
+
+    Only the model call is batched: each request's features are computed on their own
+    beforehand, so a result never depends on which requests shared its batch.
+    """
+    global batcher
+    if batcher is None and MICROBATCH_WINDOW_MS > 0:
+        batcher = MicroBatcher(
+            score_feature_rows,
+            run=run_in_executor,
+            max_wait_ms=MICROBATCH_WINDOW_MS,
+            max_batch_size=MICROBATCH_MAX_SIZE,
+        )
+    return batcher
+
+
+def warm_up() -> None:
+    """
+    Run one synthetic prediction so the first real request does not pay for
+    first-call costs (lazy imports, allocator and cache warm-up).
 
-except FileNotFoundError:
-    logging.error(
-        "Model file not found. Ensure the model exists in the 'model' directory."
+    It goes through ``score_features``, like every serving path, so ``predict_proba``
+    and the scoring are warmed up too. The warm-up bypasses the feature store, so it
+    leaves no customer history behind.
+    """
+    pipeline = FeaturePipeline(
+        get_feature_pipeline().required_features, preprocessor=get_feature_pipeline().preprocessor
     )
-    raise
+    input_df = records_to_frame([InputData(**WARMUP_RECORD)])
+    score_features(pipeline.transform_frame(input_df))
+    logging.info("Warm-up prediction complete.")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global executor, batcher
+    load_artifacts()
+    warm_up()
+    get_executor()
+    logging.info("API ready.")
+    yield
+    if batcher is not None:
+        await batcher.close()
+        batcher = None
+    if executor is not None:
+        executor.shutdown()
+        executor = None
+    if feature_pipeline is not None and feature_pipeline.feature_store is not None:
+        feature_pipeline.feature_store.close()
+    if prediction_cache is not None:
+        prediction_cache.close()
 
 
 # Create FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    REQUESTS_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        REQUESTS_IN_FLIGHT.dec()
+        # Label by route template rather than raw path, to keep the label set bounded
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        REQUEST_LATENCY.observe(time.perf_counter() - start, path=path)
+        REQUEST_COUNT.inc(path=path, status=str(status))
 
 
 # Input schema
@@ -52,6 +445,10 @@ class InputData(BaseModel):
     PricingStrategy: int
 
 
+# Validator for JSON-array batch payloads
+input_batch_adapter = TypeAdapter(List[InputData])
+
+
 @app.get("/")
 async def read_root():
     return {
@@ -65,86 +462,272 @@ async def read_root():
         "note": "Make sure to use the base URL followed by /docs. 🔗"
     }
 
+
+@app.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    """Expose request, stage latency and cache metrics in the Prometheus text format."""
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
+
+
+def records_to_frame(records: List[InputData]) -> pd.DataFrame:
+    """
+    Build a transaction DataFrame from validated input records, column by column.
+
+    Parameters
+    ----------
+    records : list of InputData
+        Validated request payloads.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per record, in input order.
+    """
+    fields = list(InputData.model_fields)
+    return pd.DataFrame(
+        {field: [getattr(record, field) for record in records] for field in fields},
+        columns=fields,
+    )
+
+
+def engineer_features(input_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute the model input matrix for a batch with the compiled feature pipeline.
+
+    Parameters
+    ----------
+    input_df : pd.DataFrame
+        Raw transactions as built by ``records_to_frame``.
+
+    Returns
+    -------
+    pd.DataFrame
+        The model input matrix with the model's feature columns, one row per
+        input transaction and in input order.
+    """
+    pipeline = get_feature_pipeline()
+    timings = {}
+    final_df = pipeline.transform_frame(input_df, timings=timings)
+    for stage, seconds in timings.items():
+        STAGE_LATENCY.observe(seconds, stage=f"features_{stage}")
+    if pipeline.feature_store is not None:
+        with STAGE_LATENCY.time(stage="store_flush"):
+            pipeline.feature_store.flush()
+    return final_df
+
+
+def label_predictions(prediction: np.ndarray) -> List[str]:
+    """Map model class predictions to risk labels."""
+    return np.where(prediction == 0, "Good", "Bad").tolist()
+
+
+def score_probabilities(bad_probability: np.ndarray) -> List[dict]:
+    """
+    Turn model probabilities of the "Bad" class into API results.
+
+    Parameters
+    ----------
+    bad_probability : np.ndarray
+        ``predict_proba`` column of class 1, one value per record.
+
+    Returns
+    -------
+    list of dict
+        ``predicted_risk``, ``risk_probability``, ``credit_score``, ``loan_amount``
+        and ``loan_term_months`` per record.
+    """
+    # The label uses the model's own probability, so it matches model.predict
+    predicted_risk = label_predictions((bad_probability >= 0.5).astype(int))
+    scores = get_scorecard().evaluate(bad_probability)
+    columns = {"predicted_risk": predicted_risk}
+    columns.update({name: values.tolist() for name, values in scores.items()})
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def predict_records(records: List[InputData]) -> List[dict]:
+    """
+    Engineer features and score validated records in one vectorized pass.
+
+    This is the CPU-bound part of a request; endpoints run it in the inference
+    thread pool rather than on the event loop.
+
+    Returns
+    -------
+    list of dict
+        Risk label, risk probability, credit score and recommended loan terms
+        per record, as returned by ``score_probabilities``.
+    """
+    return score_features(request_features(records))
+
+
+def request_features(records: List[InputData]) -> pd.DataFrame:
+    """Build the model input matrix of one request's records."""
+    with STAGE_LATENCY.time(stage="frame"):
+        input_df = records_to_frame(records)
+    return engineer_features(input_df)
+
+
+def score_feature_rows(rows: List[np.ndarray]) -> List[dict]:
+    """
+    Score feature rows computed by separate requests with one model call.
+
+    Parameters
+    ----------
+    rows : list of np.ndarray
+        One model input row per request, from ``request_features``.
+
+    Returns
+    -------
+    list of dict
+        One result per row, as returned by ``score_probabilities``.
+    """
+    final_df = pd.DataFrame(
+        np.vstack(rows), columns=get_feature_pipeline().required_features, copy=False
+    )
+    return score_features(final_df)
+
+
+def score_features(final_df: pd.DataFrame) -> List[dict]:
+    """Run the model over a model input matrix and turn its probabilities into results."""
+    BATCH_ROWS.observe(len(final_df))
+    current_model = get_model()
+    with STAGE_LATENCY.time(stage="model"):
+        proba = current_model.predict_proba(final_df)
+    bad_column = list(current_model.classes_).index(1)
+    with STAGE_LATENCY.time(stage="scoring"):
+        return score_probabilities(proba[:, bad_column])
+
+
+def overloaded_error(error: ExecutorOverloaded) -> HTTPException:
+    """Build the 503 response returned when the inference queue is full."""
+    logging.warning(f"Rejecting request: {error}")
+    return HTTPException(status_code=503, detail=str(error), headers={"Retry-After": "1"})
+
+
 @app.post("/predict")
 async def predict(input_data: InputData):
     try:
-        # Log received data
-        logging.info(f"Received input data: {input_data}")
-
-        # Prepare input data as a DataFrame
-        input_data_dict = {
-            "TransactionId": input_data.TransactionId,
-            "CustomerId": input_data.CustomerId,
-            "ProductCategory": input_data.ProductCategory,
-            "ChannelId": input_data.ChannelId,
-            "Amount": input_data.Amount,
-            "TransactionStartTime": input_data.TransactionStartTime,
-            "PricingStrategy": input_data.PricingStrategy,
-        }
-        input_df = pd.DataFrame([input_data_dict])
-
-        # Log preprocessing start
-        logging.info("Starting feature engineering...")
-
-        # Feature Engineering
-        fe = FeatureEngineering()
-        input_df = fe.create_aggregate_features(input_df)
-        input_df = fe.create_transaction_features(input_df)
-        input_df = fe.extract_time_features(input_df)
-
-        # Encode categorical features
-        categorical_cols = ["ProductCategory", "ChannelId"]
-        input_df = fe.encode_categorical_features(input_df, categorical_cols)
-
-        # Normalize numerical features
-        numeric_cols = input_df.select_dtypes(include="number").columns.tolist()
-        exclude_cols = ["Amount", "TransactionId"]
-        numeric_cols = [col for col in numeric_cols if col not in exclude_cols]
-        input_df = fe.normalize_numerical_features(
-            input_df, numeric_cols, method="standardize"
+        # Log received data, for the sampled fraction of requests
+        log_level = sample_request_log()
+        log_request(log_level, "Received input data: %s", input_data)
+
+        # Retries and duplicate submissions are answered from the result cache
+        cache = get_prediction_cache()
+        cache_key = cache.key(input_data.model_dump()) if cache is not None else None
+        result = await cache.aget(cache_key) if cache is not None else None
+
+        if result is not None:
+            log_request(log_level, "Prediction served from cache.")
+        else:
+            # Feature engineering and prediction run in the inference thread pool; with
+            # micro-batching, the model call is coalesced with concurrent requests
+            log_request(log_level, "Making prediction...")
+            request_batcher = get_batcher()
+            if request_batcher is not None:
+                features = await run_in_executor(request_features, [input_data])
+                result = await request_batcher.submit(features.to_numpy()[0])
+            else:
+                result = (await run_in_executor(predict_records, [input_data]))[0]
+            if cache is not None:
+                await cache.aput(cache_key, result)
+
+        # Log prediction result
+        log_request(
+            log_level,
+            "Prediction complete: Customer ID %s, Predicted Risk: %s, Credit Score: %s",
+            input_data.CustomerId, result["predicted_risk"], result["credit_score"],
         )
 
-        # RFM Calculation
-        rfm = CreditScoreRFM(input_df.reset_index())
-        rfm_df = rfm.calculate_rfm()
-
-        # Merge RFM features with the input data
-        final_df = pd.merge(input_df, rfm_df, on="CustomerId", how="left")
-
-        # Ensure all required features exist in the final_df
-        required_features = [
-            "ProductCategory",
-            "PricingStrategy",
-            "Transaction_Count",
-            "Transaction_Month",
-            "Transaction_Year",
-            "Recency",
-            "Frequency",
-        ]
+        # Return response
+        return {"customer_id": input_data.CustomerId, **result}
 
-        # Fill missing features with default values (e.g., 0 for numerical features)
-        for feature in required_features:
-            if feature not in final_df.columns:
-                final_df[feature] = 0  # Fill with default value
+    except ExecutorOverloaded as oe:
+        raise overloaded_error(oe)
+    except ValidationError as ve:
+        logging.error(f"Validation error: {ve}")
+        raise HTTPException(status_code=400, detail=f"Validation error: {ve}")
+    except Exception as e:
+        logging.error(f"An error occurred: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"An internal error occurred: {str(e)}"
+        )
 
-        # Reindex the final_df to match the training feature order
-        final_df = final_df.reindex(columns=required_features, fill_value=0)
 
-        # Log prediction start
-        logging.info("Making prediction...")
+def parse_batch(body: bytes, content_type: str) -> List[InputData]:
+    """
+    Parse a batch request body as a JSON array or as NDJSON (one record per line).
 
-        # Make prediction
-        prediction = model.predict(final_df)
-        predicted_risk = "Good" if prediction[0] == 0 else "Bad"
+    Parameters
+    ----------
+    body : bytes
+        Raw request body.
+    content_type : str
+        The request ``Content-Type`` header.
 
-        # Log prediction result
-        logging.info(
-            f"Prediction complete: Customer ID {input_data.CustomerId}, Predicted Risk: {predicted_risk}"
+    Returns
+    -------
+    list of InputData
+        Validated records, in input order.
+    """
+    with STAGE_LATENCY.time(stage="parse"):
+        if "ndjson" in content_type or "jsonlines" in content_type:
+            return [
+                InputData.model_validate_json(line)
+                for line in body.splitlines()
+                if line.strip()
+            ]
+        return input_batch_adapter.validate_json(body)
+
+
+
+@app.post(
+    "/predict/batch",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/InputData"},
+                    }
+                },
+                "application/x-ndjson": {
+                    "schema": {"$ref": "#/components/schemas/InputData"}
+                },
+            },
+        }
+    },
+)
+async def predict_batch(request: Request):
+    try:
+        records = await run_in_executor(
+            parse_batch, await request.body(), request.headers.get("content-type", "")
         )
+        if not records:
+            return {"predictions": []}
 
-        # Return response
-        return {"customer_id": input_data.CustomerId, "predicted_risk": predicted_risk}
+        log_level = sample_request_log()
+        log_request(log_level, "Received batch of %d records.", len(records))
+
+        # Run the feature pipeline and the model once over the whole batch
+        results = await run_in_executor(predict_records, records)
+
+        log_request(log_level, "Batch prediction complete for %d records.", len(records))
+
+        return {
+            "predictions": [
+                {
+                    "transaction_id": record.TransactionId,
+                    "customer_id": record.CustomerId,
+                    **result,
+                }
+                for record, result in zip(records, results)
+            ]
+        }
 
+    except ExecutorOverloaded as oe:
+        raise overloaded_error(oe)
     except ValidationError as ve:
         logging.error(f"Validation error: {ve}")
         raise HTTPException(status_code=400, detail=f"Validation error: {ve}")
@@ -0,0 +1,101 @@
+import asyncio
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-item requests into batches.
+
+    Each ``submit`` adds one item to the open batch and waits for its result. The batch is
+    processed as soon as it holds ``max_batch_size`` items, or ``max_wait_ms`` after its
+    first item arrived, whichever comes first; ``process_batch`` is then called once with
+    all items and its results are handed back to the waiting callers in order. Callers
+    trade at most ``max_wait_ms`` of added latency for one vectorized call per batch.
+
+    Methods
+    -------
+    submit(item) -> Any
+        Adds an item to the open batch and awaits its result.
+
+    close() -> None
+        Processes any open batch and waits for batches in flight.
+    """
+
+    def __init__(self, process_batch, run=None, max_wait_ms: float = 2.0, max_batch_size: int = 64):
+        """
+        Parameters
+        ----------
+        process_batch : callable
+            Synchronous function taking a list of items and returning one result per item,
+            in the same order.
+        run : coroutine function, optional
+            ``await run(process_batch, items)`` executes a batch, e.g.
+            ``InferenceExecutor.run`` to keep it off the event loop. By default the batch
+            runs directly on the event loop.
+        max_wait_ms : float, optional
+            Longest time the first item of a batch waits for more items.
+        max_batch_size : int, optional
+            Number of items that triggers processing immediately.
+        """
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be non-negative")
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.process_batch = process_batch
+        self._run = run
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_size = int(max_batch_size)
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+
+    async def submit(self, item):
+        """
+        Adds an item to the open batch and awaits its result.
+
+        Exceptions raised while processing the batch are raised in every caller of that batch.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif len(self._pending) == 1:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    async def close(self) -> None:
+        """Processes any open batch and waits for batches in flight."""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._process(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, batch: list) -> None:
+        items = [item for item, _ in batch]
+        try:
+            if self._run is None:
+                results = self.process_batch(items)
+            else:
+                results = await self._run(self.process_batch, items)
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"process_batch returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            # A caller may have been cancelled (e.g. the client disconnected)
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,88 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from threadpoolctl import threadpool_limits
+
+
+class ExecutorOverloaded(RuntimeError):
+    """Raised when the inference executor already holds its maximum number of pending calls."""
+
+
+class InferenceExecutor:
+    """
+    A bounded thread pool for running CPU-bound inference off the event loop.
+
+    Feature engineering and ``model.predict`` are synchronous pandas, NumPy and sklearn
+    work; running them directly in an ``async`` endpoint blocks the event loop, so
+    concurrent requests queue behind each other. ``run`` hands the work to a fixed pool of
+    threads (NumPy and sklearn release the GIL in their inner loops) and awaits the result.
+
+    At most ``max_pending`` calls may be running or queued at once; beyond that ``run``
+    raises ``ExecutorOverloaded`` immediately, so the API can answer 503 instead of letting
+    latency grow without bound. BLAS/OpenMP thread pools are limited with ``threadpoolctl``
+    so that ``max_workers`` concurrent predictions do not oversubscribe the cores.
+
+    Methods
+    -------
+    run(func, *args, **kwargs) -> Any
+        Awaits ``func(*args, **kwargs)`` executed in the pool.
+
+    shutdown() -> None
+        Waits for running calls, stops the threads and restores the BLAS thread limits.
+    """
+
+    def __init__(self, max_workers: int = None, max_pending: int = None, blas_threads: int = 1):
+        """
+        Parameters
+        ----------
+        max_workers : int, optional
+            Number of inference threads. Defaults to the number of CPUs, capped at 4.
+        max_pending : int, optional
+            Maximum number of calls running or waiting for a thread. Defaults to
+            ``16 * max_workers``.
+        blas_threads : int, optional
+            Thread limit applied to BLAS and OpenMP libraries; ``None`` leaves them unchanged.
+        """
+        self.max_workers = max(int(max_workers or min(4, os.cpu_count() or 1)), 1)
+        self.max_pending = max(int(max_pending or 16 * self.max_workers), 1)
+        self.pending = 0
+        # Workers release their slot directly, as the loop that took it may be closed by then
+        self._lock = threading.Lock()
+        self._limiter = threadpool_limits(limits=blas_threads) if blas_threads else None
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Runs ``func(*args, **kwargs)`` in the pool and returns its result.
+
+        Raises
+        ------
+        ExecutorOverloaded
+            If ``max_pending`` calls are already running or queued.
+        """
+        with self._lock:
+            if self.pending >= self.max_pending:
+                raise ExecutorOverloaded(
+                    f"Inference queue is full ({self.pending} pending calls); retry later.")
+            self.pending += 1
+        try:
+            future = self._pool.submit(func, *args, **kwargs)
+        except BaseException:
+            self._release(None)
+            raise
+        # Release the slot when the work itself finishes, even if the request was cancelled
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        """Waits for running calls, stops the threads and restores the BLAS thread limits."""
+        self._pool.shutdown(wait=True)
+        if self._limiter is not None:
+            self._limiter.restore_original_limits()
+            self._limiter = None
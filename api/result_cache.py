@@ -0,0 +1,303 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+
+def canonical_key(fields: dict, namespace: str = "") -> str:
+    """
+    Hashes request fields into a cache key that does not depend on how they were sent.
+
+    Field order, JSON whitespace and the UTC offset of timestamps do not change the key:
+    fields are sorted and timezone-aware datetimes are converted to UTC.
+
+    Parameters
+    ----------
+    fields : dict
+        Validated request fields, e.g. ``InputData.model_dump()``.
+    namespace : str, optional
+        Prefix separating keys of different models, e.g. the model version.
+
+    Returns
+    -------
+    str
+        Hex SHA-256 digest.
+    """
+    normalized = {}
+    for name, value in fields.items():
+        if isinstance(value, datetime):
+            if value.tzinfo is not None:
+                value = value.astimezone(timezone.utc)
+            value = value.isoformat()
+        normalized[name] = value
+    payload = json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{namespace}\0{payload}".encode()).hexdigest()
+
+
+class SQLiteCacheBackend:
+    """
+    A SQLite file shared by several worker processes on one host.
+
+    Each process opens its own connection on first use (also after a fork), and the
+    database runs in WAL mode so readers do not block the writer. The file stays
+    bounded: ``put`` deletes expired entries and trims the table to ``max_entries``
+    (dropping the entries closest to expiry) every ``purge_interval`` seconds, or
+    sooner once a tenth of ``max_entries`` has been written since the last purge.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000, purge_interval: float = 60.0):
+        """
+        Parameters
+        ----------
+        path : str
+            SQLite file; created if missing.
+        max_entries : int, optional
+            Number of entries the file is trimmed to.
+        purge_interval : float, optional
+            Longest time in seconds between two purges.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = path
+        self.max_entries = int(max_entries)
+        self.purge_interval = float(purge_interval)
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._next_purge = time.time() + self.purge_interval
+        self._puts_since_purge = 0
+
+    def get(self, key: str):
+        """Returns the stored value, or None if the key is missing or expired."""
+        entry = self.get_entry(key)
+        return None if entry is None else entry[0]
+
+    def get_entry(self, key: str):
+        """
+        Returns
+        -------
+        tuple or None
+            The stored value and its remaining lifetime in seconds, or None if the
+            key is missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM predictions WHERE key = ? AND expires_at > ?",
+                (key, now)).fetchone()
+        return None if row is None else (json.loads(row[0]), row[1] - now)
+
+    def put(self, key: str, value, ttl_seconds: float) -> None:
+        """Stores a JSON-serializable value until ``ttl_seconds`` from now."""
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO predictions (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), now + ttl_seconds))
+                self._puts_since_purge += 1
+                if now >= self._next_purge or self._puts_since_purge >= max(self.max_entries // 10, 1):
+                    self._purge(connection, now)
+
+    def purge_expired(self) -> int:
+        """Deletes expired entries, trims the table to ``max_entries`` and returns how many were removed."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                return self._purge(connection, time.time())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+    def _purge(self, connection: sqlite3.Connection, now: float) -> int:
+        removed = connection.execute("DELETE FROM predictions WHERE expires_at <= ?", (now,)).rowcount
+        removed += connection.execute(
+            "DELETE FROM predictions WHERE key IN "
+            "(SELECT key FROM predictions ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)).rowcount
+        self._next_purge = now + self.purge_interval
+        self._puts_since_purge = 0
+        return removed
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections must not be shared across fork(); reopen in each process
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS predictions "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+                self._connection.execute(
+                    "CREATE INDEX IF NOT EXISTS predictions_expires_at ON predictions (expires_at)")
+            self._pid = os.getpid()
+        return self._connection
+
+
+class PredictionCache:
+    """
+    An in-process LRU cache of prediction results with a time-to-live.
+
+    Keys are canonical hashes of the request fields within a namespace (the model
+    version), so retries and duplicate submissions of the same payload are answered
+    without running the feature pipeline or the model, and a new model never serves
+    results of the old one. At most ``max_size`` entries are kept; the least recently
+    used entry is evicted first and entries expire ``ttl_seconds`` after being stored.
+
+    An optional shared backend (``SQLiteCacheBackend``) is consulted on local misses and
+    written through on every ``put``, so worker processes on one host share results. A
+    result read from the backend keeps its remaining lifetime. Coroutines use ``aget``
+    and ``aput``, which run the backend I/O in a thread so a contended SQLite file does
+    not block the event loop. Backend errors are logged and treated as misses.
+
+    Attributes
+    ----------
+    hits : int
+        Number of ``get`` calls answered from the local cache or the backend.
+    misses : int
+        Number of ``get`` calls that found nothing.
+    evictions : int
+        Number of entries dropped to stay within ``max_size``.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl_seconds: float = 60.0, namespace: str = "",
+                 backend: SQLiteCacheBackend = None):
+        """
+        Parameters
+        ----------
+        max_size : int, optional
+            Maximum number of entries held in memory.
+        ttl_seconds : float, optional
+            Lifetime of an entry.
+        namespace : str, optional
+            Separates keys of different models, e.g. the model version.
+        backend : SQLiteCacheBackend, optional
+            Shared store used by several worker processes.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = int(max_size)
+        self.ttl_seconds = float(ttl_seconds)
+        self.namespace = namespace
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, fields: dict) -> str:
+        """Returns the cache key for request fields in this cache's namespace."""
+        return canonical_key(fields, self.namespace)
+
+    def get(self, key: str):
+        """Returns the cached value for ``key``, or None on a miss."""
+        now = time.monotonic()
+        value = self._get_local(key, now)
+        if value is None:
+            value = self._add_backend_entry(key, self._get_backend(key), now)
+        return value
+
+    async def aget(self, key: str):
+        """Same as ``get``, reading the backend in a worker thread."""
+        now = time.monotonic()
+        value = self._get_local(key, now)
+        if value is None:
+            entry = await asyncio.to_thread(self._get_backend, key) if self.backend is not None else None
+            value = self._add_backend_entry(key, entry, now)
+        return value
+
+    def put(self, key: str, value) -> None:
+        """Stores a JSON-serializable value for ``key``."""
+        with self._lock:
+            self._store(key, value, time.monotonic() + self.ttl_seconds)
+        self._put_backend(key, value)
+
+    async def aput(self, key: str, value) -> None:
+        """Same as ``put``, writing the backend in a worker thread."""
+        with self._lock:
+            self._store(key, value, time.monotonic() + self.ttl_seconds)
+        if self.backend is not None:
+            await asyncio.to_thread(self._put_backend, key, value)
+
+    def clear(self) -> None:
+        """Drops all local entries and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Returns the size and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        if self.backend is not None:
+            self.backend.close()
+
+    def _get_local(self, key: str, now: float):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+        return None
+
+    def _get_backend(self, key: str):
+        if self.backend is None:
+            return None
+        try:
+            return self.backend.get_entry(key)
+        except sqlite3.Error as e:
+            logging.warning(f"Prediction cache backend read failed: {e}")
+            return None
+
+    def _put_backend(self, key: str, value) -> None:
+        if self.backend is None:
+            return
+        try:
+            self.backend.put(key, value, self.ttl_seconds)
+        except sqlite3.Error as e:
+            logging.warning(f"Prediction cache backend write failed: {e}")
+
+    def _add_backend_entry(self, key: str, entry, now: float):
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            value, remaining = entry
+            self._store(key, value, now + min(remaining, self.ttl_seconds))
+        return value
+
+    def _store(self, key: str, value, expires_at: float) -> None:
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
@@ -0,0 +1,158 @@
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+
+import joblib
+import uvicorn
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import api.api as api_module
+from scripts.tree_engine import CompiledTreeEnsemble
+
+
+def export_model(path: str, source: str = None) -> str:
+    """
+    Save a copy of the model that ``MODEL_MMAP_MODE=r`` can share between workers.
+
+    Memory-mapping a pickled sklearn tree model does not share its trees:
+    ``Tree.__setstate__`` copies the node arrays into private memory, and only small
+    arrays such as the scaler parameters stay mapped. Tree models are therefore
+    exported as a ``CompiledTreeEnsemble``, whose node arrays are plain NumPy arrays
+    that ``CompiledTreeEnsemble.load(..., mmap_mode='r')`` maps read-only from the
+    page cache. Models the engine cannot compile are re-saved uncompressed as they are.
+
+    Parameters
+    ----------
+    path : str
+        Destination file.
+    source : str, optional
+        Model to export. Defaults to ``api.api.MODEL_PATH``.
+
+    Returns
+    -------
+    str
+        The destination path.
+    """
+    model = joblib.load(source or api_module.MODEL_PATH)
+    if not isinstance(model, CompiledTreeEnsemble):
+        try:
+            model = CompiledTreeEnsemble.from_sklearn(model)
+        except (TypeError, NotImplementedError) as e:
+            logging.warning(f"Exporting the model without compiling it: {e}")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if isinstance(model, CompiledTreeEnsemble):
+        model.save(tmp_path)
+    else:
+        joblib.dump(model, tmp_path, compress=0)
+    os.replace(tmp_path, path)
+    return path
+
+
+def preload() -> None:
+    """Load the API artifacts and warm them up in the current (parent) process."""
+    api_module.load_artifacts()
+    api_module.warm_up()
+    # Move everything loaded so far out of the collector's reach, so garbage
+    # collections in the workers do not write to (and un-share) these pages
+    gc.collect()
+    gc.freeze()
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """Create the listening socket shared by all workers."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock: socket.socket, log_level: str) -> None:
+    """Serve the app on an already-bound socket until told to stop."""
+    config = uvicorn.Config(api_module.app, log_level=log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(host: str, port: int, workers: int, log_level: str = "info") -> None:
+    """
+    Preload the model, then fork ``workers`` uvicorn workers on one socket.
+
+    Unlike ``uvicorn --workers``, which starts fresh interpreters that each
+    load a private copy of the model, the model is loaded and warmed up once
+    here and shared copy-on-write with the forked workers. With a model saved
+    by ``export_model`` and ``MODEL_MMAP_MODE=r``, its tree node arrays are also
+    read-only memory maps backed by the page cache. Requires ``os.fork``.
+
+    The parent forwards SIGINT/SIGTERM to the workers and exits once all of
+    them have stopped.
+    """
+    if workers > 1 and api_module.FEATURE_STORE_PATH:
+        raise SystemExit(
+            "FEATURE_STORE_PATH cannot be used with several workers: each worker "
+            "would keep its own diverging copy of the customer aggregates."
+        )
+
+    preload()
+    sock = bind_socket(host, port)
+    logging.info(f"Serving on {host}:{port} with {workers} worker(s).")
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                run_worker(sock, log_level)
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    def stop(signum, frame):
+        for child in children:
+            try:
+                os.kill(child, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for child in children:
+        try:
+            os.waitpid(child, 0)
+        except ChildProcessError:
+            pass
+    sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve the credit scoring API with pre-forked workers sharing one model.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")),
+                        help="Number of worker processes (defaults to $WEB_CONCURRENCY or 1).")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--export-model", metavar="PATH",
+                        help="Write a memory-mappable (compiled) copy of the model to PATH and exit.")
+    args = parser.parse_args()
+
+    if args.export_model:
+        export_model(args.export_model)
+        print(f"Memory-mappable compiled model saved to '{args.export_model}'. "
+              f"Serve it with MODEL_PATH={args.export_model} MODEL_MMAP_MODE=r.")
+        return
+    serve(args.host, args.port, max(args.workers, 1), args.log_level)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+
+# Metrics compared against a baseline; lower is better for all of them
+COMPARED_METRICS = ('seconds', 'p50_ms', 'p99_ms')
+
+
+def _peak_memory_mb(func, setup=None) -> float:
+    args = setup() if setup is not None else ()
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2**20
+
+
+def measure(func, setup=None, rows: int = None, repeat: int = 5, warmup: int = 1,
+            trace_memory: bool = True) -> dict:
+    """
+    Times repeated calls of ``func`` and measures its peak memory.
+
+    Parameters
+    ----------
+    func : callable
+        The code under test, called as ``func(*setup())``.
+    setup : callable, optional
+        Returns a fresh tuple of arguments before every call, e.g. a copy of a frame that
+        ``func`` modifies in place. Its time is not measured.
+    rows : int, optional
+        Rows processed per call, to report throughput.
+    repeat : int, optional
+        Number of timed calls; the median is reported.
+    warmup : int, optional
+        Untimed calls made first, so lazy imports and caches do not count.
+    trace_memory : bool, optional
+        Also make one call under ``tracemalloc`` to record the peak of Python and NumPy
+        allocations. It runs separately, so tracing does not slow the timed calls.
+
+    Returns
+    -------
+    dict
+        ``seconds`` (median), ``min_seconds``, ``repeat``, and ``rows_per_sec`` and
+        ``peak_memory_mb`` when requested.
+    """
+    for _ in range(warmup):
+        func(*(setup() if setup is not None else ()))
+    timings = []
+    for _ in range(repeat):
+        args = setup() if setup is not None else ()
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    seconds = statistics.median(timings)
+    result = {'seconds': seconds, 'min_seconds': min(timings), 'repeat': repeat}
+    if rows is not None:
+        result['rows'] = rows
+        result['rows_per_sec'] = rows / seconds if seconds > 0 else float('inf')
+    if trace_memory:
+        result['peak_memory_mb'] = _peak_memory_mb(func, setup)
+    return result
+
+
+def measure_latency(func, calls: list, rows_per_call: int = 1, warmup: int = 5,
+                    trace_memory: bool = True) -> dict:
+    """
+    Times each call of ``func`` over a sequence of arguments and reports latency percentiles.
+
+    Parameters
+    ----------
+    func : callable
+        Called once per element of ``calls``, e.g. one HTTP request per payload.
+    calls : list
+        Arguments of each call; the first ``warmup`` are only used to warm up.
+    rows_per_call : int, optional
+        Rows processed per call, to report throughput.
+    warmup : int, optional
+        Number of untimed calls made first.
+    trace_memory : bool, optional
+        Also repeat the first call under ``tracemalloc`` to record its peak allocations.
+
+    Returns
+    -------
+    dict
+        ``p50_ms``, ``p99_ms``, ``mean_ms``, ``calls``, ``calls_per_sec``, ``rows_per_sec``
+        and ``peak_memory_mb`` when requested.
+    """
+    for args in calls[:warmup]:
+        func(args)
+    latencies = []
+    start = time.perf_counter()
+    for args in calls[warmup:]:
+        call_start = time.perf_counter()
+        func(args)
+        latencies.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+    if not latencies:
+        raise ValueError("measure_latency needs more calls than warm-up calls")
+
+    latencies_ms = np.array(latencies) * 1000.0
+    result = {
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p99_ms': float(np.percentile(latencies_ms, 99)),
+        'mean_ms': float(latencies_ms.mean()),
+        'calls': len(latencies),
+        'calls_per_sec': len(latencies) / elapsed,
+        'rows_per_sec': len(latencies) * rows_per_call / elapsed,
+    }
+    if trace_memory:
+        result['peak_memory_mb'] = _peak_memory_mb(func, lambda: (calls[0],))
+    return result
+
+
+def environment() -> dict:
+    """Describes the interpreter, libraries and machine, stored alongside every result."""
+    import pandas as pd
+    import sklearn
+
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'scikit-learn': sklearn.__version__,
+        'platform': platform.platform(),
+        'processor': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def save_results(results: dict, path: str) -> None:
+    """Writes benchmark results to a JSON file."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load_results(path: str) -> dict:
+    """Reads benchmark results written by ``save_results``."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.25) -> list:
+    """
+    Finds benchmarks that got slower than the baseline by more than ``tolerance``.
+
+    Only benchmarks and metrics present in both runs are compared, and only runs with
+    the same parameters (data size, seed, batch size) are comparable.
+
+    Parameters
+    ----------
+    results, baseline : dict
+        Output of ``benchmarks.run``: parameters and a ``benchmarks`` dict of metrics.
+    tolerance : float, optional
+        Allowed relative slowdown, e.g. 0.25 for 25%.
+
+    Returns
+    -------
+    list of dict
+        One entry per regression with the benchmark, metric, both values and their ratio.
+
+    Raises
+    ------
+    ValueError
+        If the two runs used different parameters.
+    """
+    if results.get('parameters') != baseline.get('parameters'):
+        raise ValueError(
+            f"Results were produced with parameters {results.get('parameters')}, "
+            f"the baseline with {baseline.get('parameters')}; they are not comparable.")
+    regressions = []
+    for name, metrics in results['benchmarks'].items():
+        reference = baseline['benchmarks'].get(name, {})
+        for metric in COMPARED_METRICS:
+            if metric not in metrics or not reference.get(metric):
+                continue
+            ratio = metrics[metric] / reference[metric]
+            if ratio > 1 + tolerance:
+                regressions.append({
+                    'benchmark': name,
+                    'metric': metric,
+                    'baseline': reference[metric],
+                    'current': metrics[metric],
+                    'ratio': ratio,
+                })
+    return regressions
@@ -0,0 +1,479 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+
+import httpx
+import numpy as np
+
+# Add the project root to the path when run as a script
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.harness import compare, environment, load_results, save_results
+from benchmarks.synthetic import api_records, generate_transactions
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def load_payloads(path: str = None, n_synthetic: int = 10_000, seed: int = 0) -> list:
+    """
+    Loads recorded ``InputData`` payloads, or generates synthetic ones.
+
+    Parameters
+    ----------
+    path : str, optional
+        A JSON array of payloads or an NDJSON file with one payload per line, e.g. a
+        ``/predict/batch`` request body captured from production traffic.
+    n_synthetic : int, optional
+        Number of payloads generated with ``benchmarks.synthetic`` when ``path`` is not given.
+    seed : int, optional
+        Seed of the generated payloads.
+
+    Returns
+    -------
+    list of dict
+        The payloads, in file order.
+    """
+    if path is None:
+        return api_records(generate_transactions(n_synthetic, n_customers=max(n_synthetic // 25, 1), seed=seed))
+    with open(path) as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def free_port(host: str = "127.0.0.1") -> int:
+    """Returns a TCP port that is currently free on ``host``."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def start_server(host: str, port: int, workers: int = 1, env: dict = None,
+                 timeout: float = 60.0) -> subprocess.Popen:
+    """
+    Starts the API with the pre-fork launcher (``python -m api.serve``) and waits until
+    it answers ``GET /``.
+
+    Parameters
+    ----------
+    host, port : str, int
+        Address to serve on.
+    workers : int, optional
+        Number of uvicorn worker processes.
+    env : dict, optional
+        Extra environment variables for the server, e.g. ``MODEL_BACKEND``.
+    timeout : float, optional
+        Seconds to wait for the server to come up.
+
+    Returns
+    -------
+    subprocess.Popen
+        The launcher process; its children are the workers.
+    """
+    server_env = {**os.environ, "REQUEST_LOG_SAMPLE_RATE": "0", **(env or {})}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "api.serve", "--host", host, "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=PROJECT_DIR, env=server_env,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API server exited with status {process.returncode} during startup")
+        try:
+            if httpx.get(f"http://{host}:{port}/", timeout=1.0).status_code == 200:
+                return process
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    stop_server(process)
+    raise TimeoutError(f"API server did not answer on {host}:{port} within {timeout} s")
+
+
+def stop_server(process: subprocess.Popen, timeout: float = 10.0) -> None:
+    """Stops a server started by ``start_server``; the launcher stops its workers."""
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+class ProcessSampler:
+    """
+    Samples the CPU usage and resident memory of a process and its children from ``/proc``.
+
+    A background thread reads ``/proc/<pid>/stat`` and ``/proc/<pid>/status`` of the root
+    process and of every process whose parent is the root (the forked workers) every
+    ``interval`` seconds, between ``start`` and ``stop``. CPU is reported in percent of one
+    core, so four busy workers show about 400%.
+
+    Methods
+    -------
+    start() -> None
+        Starts sampling.
+
+    stop() -> dict
+        Stops sampling and returns mean and maximum CPU and RSS.
+    """
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        """
+        Parameters
+        ----------
+        pid : int
+            The root process, e.g. the API launcher.
+        interval : float, optional
+            Seconds between samples.
+        """
+        self.pid = pid
+        self.interval = interval
+        self.cpu_percent = []
+        self.rss_mb = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def pids(self) -> list:
+        """Returns the root process and its direct children."""
+        children = []
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                stat = self._read_stat(int(entry))
+                if stat is not None and int(stat[1]) == self.pid:
+                    children.append(int(entry))
+        return [self.pid] + children
+
+    def cpu_seconds(self, pids: list) -> float:
+        """Returns the user plus system CPU time used so far by ``pids``."""
+        total = 0
+        for pid in pids:
+            stat = self._read_stat(pid)
+            if stat is not None:
+                # utime and stime, fields 14 and 15 of /proc/<pid>/stat
+                total += int(stat[11]) + int(stat[12])
+        return total / CLOCK_TICKS
+
+    def rss(self, pids: list) -> float:
+        """Returns the summed resident set size of ``pids`` in MiB."""
+        total_kb = 0
+        for pid in pids:
+            try:
+                with open(f"/proc/{pid}/status") as f:
+                    for line in f:
+                        if line.startswith("VmRSS:"):
+                            total_kb += int(line.split()[1])
+                            break
+            except (FileNotFoundError, ProcessLookupError):
+                continue
+        return total_kb / 1024
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> dict:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return {
+            "cpu_percent_mean": float(np.mean(self.cpu_percent)) if self.cpu_percent else 0.0,
+            "cpu_percent_max": float(np.max(self.cpu_percent)) if self.cpu_percent else 0.0,
+            "rss_mb_mean": float(np.mean(self.rss_mb)) if self.rss_mb else 0.0,
+            "rss_mb_max": float(np.max(self.rss_mb)) if self.rss_mb else 0.0,
+            "processes": len(self.pids()),
+        }
+
+    def _run(self) -> None:
+        pids = self.pids()
+        last_cpu, last_time = self.cpu_seconds(pids), time.monotonic()
+        while not self._stop.wait(self.interval):
+            pids = self.pids()
+            cpu, now = self.cpu_seconds(pids), time.monotonic()
+            self.cpu_percent.append(100.0 * (cpu - last_cpu) / (now - last_time))
+            self.rss_mb.append(self.rss(pids))
+            last_cpu, last_time = cpu, now
+
+    @staticmethod
+    def _read_stat(pid: int):
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                stat = f.read()
+        except (FileNotFoundError, ProcessLookupError, PermissionError):
+            return None
+        # The command name may contain spaces; the remaining fields follow its closing ')'
+        return stat[stat.rindex(")") + 2:].split()
+
+
+def summarize(latencies: list, statuses: Counter, elapsed: float, rows_per_request: int) -> dict:
+    """
+    Summarizes request outcomes into throughput, error and latency metrics.
+
+    Parameters
+    ----------
+    latencies : list of float
+        Latency of every completed request in seconds.
+    statuses : collections.Counter
+        Count per HTTP status code, or per exception name for transport errors.
+    elapsed : float
+        Length of the measured period in seconds.
+    rows_per_request : int
+        Records sent per request.
+
+    Returns
+    -------
+    dict
+        Request and error counts, throughput and latency percentiles in milliseconds.
+    """
+    requests = sum(statuses.values())
+    ok = sum(count for status, count in statuses.items() if isinstance(status, int) and status < 400)
+    latencies_ms = np.array(latencies, dtype=np.float64) * 1000.0
+    result = {
+        "requests": requests,
+        "ok": ok,
+        "errors": requests - ok,
+        "error_rate": (requests - ok) / requests if requests else 0.0,
+        "errors_by_status": {str(status): count for status, count in sorted(statuses.items(), key=str)
+                             if not (isinstance(status, int) and status < 400)},
+        "requests_per_sec": ok / elapsed if elapsed else 0.0,
+        "rows_per_sec": ok * rows_per_request / elapsed if elapsed else 0.0,
+    }
+    if len(latencies_ms):
+        for name, q in (("p50_ms", 50), ("p90_ms", 90), ("p99_ms", 99), ("p999_ms", 99.9)):
+            result[name] = float(np.percentile(latencies_ms, q))
+        result["mean_ms"] = float(latencies_ms.mean())
+        result["max_ms"] = float(latencies_ms.max())
+    return result
+
+
+async def generate_load(base_url: str, payloads: list, duration: float, concurrency: int = None,
+                        rate: float = None, batch_size: int = 1, warmup: float = 0.0,
+                        timeout: float = 30.0, transport: httpx.AsyncBaseTransport = None) -> dict:
+    """
+    Sends ``/predict`` (or ``/predict/batch``) requests for ``duration`` seconds.
+
+    With ``concurrency``, that many clients each send their next request as soon as the
+    previous one completes (closed loop), which finds the throughput ceiling. With ``rate``,
+    requests are started on a fixed schedule regardless of completions (open loop), and
+    latency is measured from the scheduled start, so queueing at an overloaded server is
+    not hidden by the client slowing down.
+
+    Each request gets a fresh TransactionId, so the server's prediction cache never answers
+    repeated payloads.
+
+    Parameters
+    ----------
+    base_url : str
+        Server address, e.g. 'http://127.0.0.1:8000'.
+    payloads : list of dict
+        ``InputData`` payloads, used in a cycle.
+    duration : float
+        Length of the measured period in seconds.
+    concurrency : int, optional
+        Number of closed-loop clients.
+    rate : float, optional
+        Requests per second for an open-loop run.
+    batch_size : int, optional
+        Records per request; above 1, requests go to ``/predict/batch``.
+    warmup : float, optional
+        Seconds of load sent first and not measured.
+    timeout : float, optional
+        Per-request timeout in seconds; timeouts count as errors.
+    transport : httpx.AsyncBaseTransport, optional
+        Custom transport, e.g. ``httpx.ASGITransport`` to drive the app in process.
+
+    Returns
+    -------
+    dict
+        Output of ``summarize`` for the measured period.
+    """
+    if (concurrency is None) == (rate is None):
+        raise ValueError("Pass exactly one of concurrency and rate")
+    path = "/predict/batch" if batch_size > 1 else "/predict"
+    sequence = 0
+
+    def next_body():
+        nonlocal sequence
+        records = []
+        for _ in range(batch_size):
+            records.append({**payloads[sequence % len(payloads)], "TransactionId": sequence + 1})
+            sequence += 1
+        return records if batch_size > 1 else records[0]
+
+    latencies = []
+    statuses = Counter()
+    measure_from = None
+
+    async def send(client, scheduled):
+        try:
+            response = await client.post(path, json=next_body())
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        if scheduled >= measure_from:
+            statuses[status] += 1
+            if isinstance(status, int) and status < 400:
+                latencies.append(time.perf_counter() - scheduled)
+
+    max_connections = concurrency or max(int(rate * timeout), 1)
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits,
+                                 transport=transport) as client:
+        start = time.perf_counter()
+        measure_from = start + warmup
+        end = measure_from + duration
+
+        if concurrency is not None:
+            async def closed_loop():
+                while (now := time.perf_counter()) < end:
+                    await send(client, now)
+            await asyncio.gather(*(closed_loop() for _ in range(concurrency)))
+        else:
+            tasks = []
+            interval = 1.0 / rate
+            scheduled = start
+            while scheduled < end:
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.ensure_future(send(client, scheduled)))
+                scheduled += interval
+            await asyncio.gather(*tasks)
+
+    return summarize(latencies, statuses, duration, batch_size)
+
+
+def run_load_test(payloads: list, duration: float = 30.0, concurrency: int = None, rate: float = None,
+                  batch_size: int = 1, warmup: float = 5.0, workers: int = 1, url: str = None,
+                  server_env: dict = None) -> dict:
+    """
+    Starts the API locally (unless ``url`` is given), drives it with ``generate_load`` and
+    samples the server's CPU and memory.
+
+    Parameters
+    ----------
+    payloads : list of dict
+        ``InputData`` payloads, e.g. from ``load_payloads``.
+    duration, concurrency, rate, batch_size, warmup : optional
+        Load shape; see ``generate_load``.
+    workers : int, optional
+        Number of worker processes of the local server.
+    url : str, optional
+        An already-running server to target instead; server metrics are then not sampled.
+    server_env : dict, optional
+        Extra environment variables for the local server.
+
+    Returns
+    -------
+    dict
+        ``parameters``, ``environment``, ``benchmarks`` (client metrics under the endpoint
+        name, in the layout of ``benchmarks.run`` so ``compare`` works on it) and ``server``.
+    """
+    host = "127.0.0.1"
+    process = None
+    if url is None:
+        port = free_port(host)
+        process = start_server(host, port, workers, server_env)
+        url = f"http://{host}:{port}"
+    sampler = ProcessSampler(process.pid) if process is not None else None
+    try:
+        if sampler is not None:
+            sampler.start()
+        client = asyncio.run(generate_load(url, payloads, duration, concurrency, rate, batch_size, warmup))
+    finally:
+        server = sampler.stop() if sampler is not None else {}
+        if process is not None:
+            stop_server(process)
+
+    name = "loadtest.predict_batch" if batch_size > 1 else "loadtest.predict"
+    return {
+        "parameters": {
+            "duration": duration,
+            "concurrency": concurrency,
+            "rate": rate,
+            "batch_size": batch_size,
+            "workers": workers,
+            "server_env": server_env or {},
+        },
+        "environment": environment(),
+        "benchmarks": {name: client},
+        "server": server,
+    }
+
+
+def format_report(report: dict, baseline: dict = None) -> str:
+    """Formats a load-test report, side by side with a baseline report when given."""
+    lines = []
+    rows = []
+    for name, metrics in report["benchmarks"].items():
+        reference = (baseline or {}).get("benchmarks", {}).get(name, {})
+        rows.extend((f"{name}.{key}", value, reference.get(key)) for key, value in metrics.items()
+                    if isinstance(value, (int, float)))
+    reference_server = (baseline or {}).get("server", {})
+    rows.extend((f"server.{key}", value, reference_server.get(key))
+                for key, value in report.get("server", {}).items())
+    for key, value, reference in rows:
+        line = f"{key:<40} {value:>14,.2f}"
+        if reference:
+            line += f" {reference:>14,.2f} {100.0 * (value - reference) / reference:>+8.1f}%"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test the credit scoring API on this machine at a fixed concurrency or request rate.")
+    parser.add_argument("--payloads", help="JSON array or NDJSON file of recorded InputData payloads. "
+                                           "Synthetic payloads are generated when omitted.")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, help="Closed-loop clients (default: 16).")
+    load.add_argument("--rate", type=float, help="Open-loop request rate per second.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds.")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds of load sent first.")
+    parser.add_argument("--batch-size", type=int, default=1, help="Records per request; above 1 uses /predict/batch.")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes of the local server.")
+    parser.add_argument("--env", nargs="*", default=[], metavar="NAME=VALUE",
+                        help="Environment of the local server, e.g. MODEL_BACKEND=compiled.")
+    parser.add_argument("--url", help="Target an already-running server instead of starting one.")
+    parser.add_argument("--output", help="Write the report to this JSON file.")
+    parser.add_argument("--compare", metavar="REPORT", help="Earlier report to compare with.")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed latency increase against --compare before failing, e.g. 0.25 for 25%%.")
+    args = parser.parse_args()
+
+    server_env = dict(item.split("=", 1) for item in args.env)
+    concurrency = args.concurrency or (16 if args.rate is None else None)
+    report = run_load_test(load_payloads(args.payloads), args.duration, concurrency, args.rate,
+                           args.batch_size, args.warmup, args.workers, args.url, server_env)
+    baseline = load_results(args.compare) if args.compare else None
+    print(format_report(report, baseline))
+    if args.output:
+        save_results(report, args.output)
+
+    if baseline is not None:
+        try:
+            regressions = compare(report, baseline, args.tolerance)
+        except ValueError as e:
+            print(f"Not compared: {e}")
+            return
+        for regression in regressions:
+            print(f"REGRESSION {regression['benchmark']} {regression['metric']}: "
+                  f"{regression['baseline']:.4g} -> {regression['current']:.4g} "
+                  f"({regression['ratio']:.2f}x)")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
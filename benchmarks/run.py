@@ -0,0 +1,231 @@
+import argparse
+import contextlib
+import fnmatch
+import io
+import logging
+import os
+import sys
+import tempfile
+
+# Add the project root to the path when run as a script
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.harness import compare, environment, load_results, measure, measure_latency, save_results
+from benchmarks.synthetic import api_records, generate_transactions, write_csv
+from scripts.credit_scoring_model import CreditScoreRFM
+from scripts.data_loader import iter_data_chunks, load_data
+from scripts.feature_engineering import FeatureEngineering
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baselines", "baseline.json")
+
+CATEGORICAL_COLUMNS = ['ProviderId', 'ProductCategory', 'ChannelId']
+NUMERICAL_COLUMNS = ['Amount', 'Value']
+
+
+def quiet(func):
+    """Wraps ``func`` so its progress prints do not end up in the benchmark output."""
+    def wrapper(*args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func(*args)
+    return wrapper
+
+
+def data_benchmarks(df, csv_path: str, repeat: int) -> dict:
+    rows = len(df)
+    return {
+        'data_loader.load_data': measure(quiet(load_data), lambda: (csv_path,), rows, repeat),
+        'data_loader.iter_data_chunks': measure(
+            quiet(lambda path: sum(len(chunk) for chunk in iter_data_chunks(path))),
+            lambda: (csv_path,), rows, repeat),
+    }
+
+
+def feature_benchmarks(df, repeat: int) -> dict:
+    rows = len(df)
+    # Most FeatureEngineering methods modify their input, so every call gets a fresh copy
+    fresh = lambda: (df.copy(),)
+    with_time = FeatureEngineering.extract_time_features(df.copy())
+    cases = {
+        'create_aggregate_features': FeatureEngineering.create_aggregate_features,
+        'create_transaction_features': FeatureEngineering.create_transaction_features,
+        'create_customer_features': FeatureEngineering.create_customer_features,
+        'extract_time_features': FeatureEngineering.extract_time_features,
+        'encode_categorical_features':
+            lambda frame: FeatureEngineering.encode_categorical_features(frame, CATEGORICAL_COLUMNS),
+        'handle_missing_values': FeatureEngineering.handle_missing_values,
+        'normalize_numerical_features':
+            lambda frame: FeatureEngineering.normalize_numerical_features(frame, NUMERICAL_COLUMNS),
+    }
+    results = {}
+    for name, func in cases.items():
+        setup = (lambda: (with_time.copy(),)) if name == 'handle_missing_values' else fresh
+        results[f'feature_engineering.{name}'] = measure(func, setup, rows, repeat)
+    return results
+
+
+def rfm_benchmarks(df, repeat: int) -> dict:
+    rows = len(df)
+    rfm = CreditScoreRFM(df.copy()).calculate_rfm()
+    return {
+        'rfm.calculate_rfm': measure(
+            lambda frame: CreditScoreRFM(frame).calculate_rfm(), lambda: (df.copy(),), rows, repeat),
+        'rfm.calculate_rfm_scores': measure(
+            lambda frame: CreditScoreRFM(frame).calculate_rfm_scores(frame),
+            lambda: (rfm.copy(),), len(rfm), repeat),
+    }
+
+
+def api_benchmarks(df, n_requests: int, batch_size: int, seed: int) -> dict:
+    """Times /predict and /predict/batch in process through the FastAPI test client."""
+    # Per-request log lines would dominate the timings
+    os.environ.setdefault("REQUEST_LOG_SAMPLE_RATE", "0")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    from fastapi.testclient import TestClient
+    from api.api import app
+
+    # Every payload is a distinct transaction, so the prediction cache never answers
+    payloads = api_records(generate_transactions(
+        n_requests + batch_size * 10, n_customers=df['CustomerId'].nunique(), seed=seed + 1))
+    batches = [payloads[i:i + batch_size] for i in range(0, batch_size * 10, batch_size)]
+    singles = payloads[batch_size * 10:]
+
+    def post(path):
+        def call(body):
+            response = client.post(path, json=body)
+            response.raise_for_status()
+        return call
+
+    with TestClient(app) as client:
+        return {
+            'api.predict': measure_latency(post("/predict"), singles),
+            'api.predict_batch': measure_latency(post("/predict/batch"), batches,
+                                                 rows_per_call=batch_size, warmup=2),
+        }
+
+
+def run_benchmarks(n_transactions: int = 100_000, n_customers: int = 3_700, seed: int = 0,
+                   repeat: int = 5, n_requests: int = 200, batch_size: int = 256,
+                   only: list = None) -> dict:
+    """
+    Runs the benchmark suite on synthetic Xente transactions.
+
+    Parameters
+    ----------
+    n_transactions, n_customers, seed : int, optional
+        Size and seed of the generated data.
+    repeat : int, optional
+        Timed calls per batch benchmark.
+    n_requests : int, optional
+        Number of timed /predict requests.
+    batch_size : int, optional
+        Records per /predict/batch request.
+    only : list, optional
+        Glob patterns of benchmark groups or names to run, e.g. ``['rfm.*']``.
+
+    Returns
+    -------
+    dict
+        ``parameters``, ``environment`` and ``benchmarks``, a dict of metrics per benchmark.
+    """
+    df = generate_transactions(n_transactions, n_customers, seed)
+
+    def selected(group):
+        # A pattern selects a group by its first component, e.g. 'rfm.*' or 'rfm'
+        return not only or any(fnmatch.fnmatch(group, pattern.split('.')[0]) for pattern in only)
+
+    benchmarks = {}
+    if selected('data_loader'):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            benchmarks.update(data_benchmarks(df, write_csv(df, os.path.join(tmp_dir, 'data.csv')), repeat))
+    if selected('feature_engineering'):
+        benchmarks.update(feature_benchmarks(df, repeat))
+    if selected('rfm'):
+        benchmarks.update(rfm_benchmarks(df, repeat))
+    if selected('api'):
+        benchmarks.update(api_benchmarks(df, n_requests, batch_size, seed))
+    if only:
+        benchmarks = {name: metrics for name, metrics in benchmarks.items()
+                      if any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(name, f'{pattern}.*')
+                             for pattern in only)}
+
+    return {
+        'parameters': {
+            'transactions': n_transactions,
+            'customers': n_customers,
+            'seed': seed,
+            'requests': n_requests,
+            'batch_size': batch_size,
+        },
+        'environment': environment(),
+        'benchmarks': benchmarks,
+    }
+
+
+def format_table(results: dict) -> str:
+    """Formats benchmark results as an aligned text table."""
+    header = f"{'benchmark':<48} {'median s':>10} {'rows/s':>12} {'peak MB':>9} {'p50 ms':>8} {'p99 ms':>8}"
+    lines = [header, '-' * len(header)]
+
+    def cell(metrics, key, width, fmt):
+        return f"{metrics[key]:>{width}{fmt}}" if key in metrics else ' ' * width
+
+    for name, metrics in results['benchmarks'].items():
+        lines.append(' '.join([
+            f"{name:<48}",
+            cell(metrics, 'seconds', 10, '.4f'),
+            cell(metrics, 'rows_per_sec', 12, ',.0f'),
+            cell(metrics, 'peak_memory_mb', 9, '.1f'),
+            cell(metrics, 'p50_ms', 8, '.2f'),
+            cell(metrics, 'p99_ms', 8, '.2f'),
+        ]))
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark data loading, feature engineering, RFM scoring and the prediction API "
+                    "on synthetic transactions, and compare against a saved baseline.")
+    parser.add_argument('--transactions', type=int, default=100_000, help="Number of generated transactions.")
+    parser.add_argument('--customers', type=int, default=3_700, help="Number of generated customers.")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the generated data.")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed calls per benchmark.")
+    parser.add_argument('--requests', type=int, default=200, help="Number of timed /predict requests.")
+    parser.add_argument('--batch-size', type=int, default=256, help="Records per /predict/batch request.")
+    parser.add_argument('--only', nargs='+', help="Benchmarks to run, as names or glob patterns, e.g. 'rfm.*'.")
+    parser.add_argument('--output', help="Also write the results to this JSON file.")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON file to compare with.")
+    parser.add_argument('--save-baseline', action='store_true', help="Overwrite the baseline with these results.")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed slowdown against the baseline before failing, e.g. 0.25 for 25%%.")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.transactions, args.customers, args.seed, args.repeat,
+                             args.requests, args.batch_size, args.only)
+    print(format_table(results))
+    if args.output:
+        save_results(results, args.output)
+
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"Baseline saved to '{args.baseline}'.")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at '{args.baseline}'; run with --save-baseline to create one.")
+        return
+    try:
+        regressions = compare(results, load_results(args.baseline), args.tolerance)
+    except ValueError as e:
+        print(f"Not compared with the baseline: {e}")
+        return
+    for regression in regressions:
+        print(f"REGRESSION {regression['benchmark']} {regression['metric']}: "
+              f"{regression['baseline']:.4g} -> {regression['current']:.4g} "
+              f"({regression['ratio']:.2f}x)")
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions beyond {args.tolerance:.0%} against '{args.baseline}'.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+
+# Column order of the Xente transaction export
+XENTE_COLUMNS = [
+    'TransactionId', 'BatchId', 'AccountId', 'SubscriptionId', 'CustomerId',
+    'CurrencyCode', 'CountryCode', 'ProviderId', 'ProductId', 'ProductCategory',
+    'ChannelId', 'Amount', 'Value', 'TransactionStartTime', 'PricingStrategy', 'FraudResult',
+]
+
+# Category shares roughly matching the Xente data
+PRODUCT_CATEGORIES = {
+    'financial_services': 0.475,
+    'airtime': 0.471,
+    'utility_bill': 0.020,
+    'data_bundles': 0.017,
+    'tv': 0.013,
+    'ticket': 0.002,
+    'movies': 0.001,
+    'transport': 0.0005,
+    'other': 0.0005,
+}
+CHANNELS = {'ChannelId_3': 0.595, 'ChannelId_2': 0.387, 'ChannelId_5': 0.014, 'ChannelId_1': 0.004}
+PRICING_STRATEGIES = {2: 0.835, 4: 0.004, 1: 0.155, 0: 0.006}
+
+
+def _choice(rng: np.random.Generator, shares: dict, size: int) -> np.ndarray:
+    values = np.array(list(shares.keys()))
+    p = np.array(list(shares.values()), dtype=np.float64)
+    return values[rng.choice(len(values), size=size, p=p / p.sum())]
+
+
+def generate_transactions(n_transactions: int = 100_000, n_customers: int = 3_700, seed: int = 0,
+                          start: str = '2018-11-15', days: int = 90,
+                          missing_rate: float = 0.0) -> pd.DataFrame:
+    """
+    Generates synthetic transactions with the columns, formats and rough distributions of the
+    Xente export, for benchmarks that must not depend on the real data.
+
+    Customer activity is heavy-tailed (a few customers make most transactions, as in the real
+    data), amounts are log-normal with a share of negative credits in financial services, and
+    identifiers are prefixed strings such as 'CustomerId_17'. The same arguments always give
+    the same frame.
+
+    Parameters
+    ----------
+    n_transactions : int, optional
+        Number of rows.
+    n_customers : int, optional
+        Number of distinct customers to draw from.
+    seed : int, optional
+        Random seed.
+    start : str, optional
+        First day of the period.
+    days : int, optional
+        Length of the period; timestamps are sorted and spread uniformly over it.
+    missing_rate : float, optional
+        Fraction of Amount values replaced by NaN, to exercise missing-value handling.
+
+    Returns
+    -------
+    pd.DataFrame
+        Transactions with the ``XENTE_COLUMNS`` columns, as read from the raw CSV.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(n_transactions)
+
+    # Zipf-like activity: the customer of rank k is drawn with probability ~ 1 / k
+    weights = 1.0 / np.arange(1, n_customers + 1)
+    customer = rng.choice(n_customers, size=n, p=weights / weights.sum()) + 1
+
+    category = _choice(rng, PRODUCT_CATEGORIES, n)
+    amount = np.round(np.exp(rng.normal(7.0, 1.5, size=n)), -1)
+    is_credit = (category == 'financial_services') & (rng.random(n) < 0.4)
+    amount = np.where(is_credit, -np.minimum(amount, 5_000.0), amount)
+    value = np.abs(amount).astype(np.int64)
+    amount = amount.astype(np.float64)
+    if missing_rate > 0:
+        amount[rng.random(n) < missing_rate] = np.nan
+
+    offsets = np.sort(rng.integers(0, days * 86_400, size=n))
+    timestamps = pd.Timestamp(start, tz='UTC') + pd.to_timedelta(offsets, unit='s')
+
+    def prefixed(prefix, ids):
+        return pd.Series(ids).astype(str).radd(f'{prefix}_').to_numpy()
+
+    df = pd.DataFrame({
+        'TransactionId': prefixed('TransactionId', rng.permutation(n) + 1),
+        'BatchId': prefixed('BatchId', rng.integers(1, max(n // 2, 2), size=n)),
+        # One account and subscription per customer
+        'AccountId': prefixed('AccountId', customer + 1_000),
+        'SubscriptionId': prefixed('SubscriptionId', customer + 2_000),
+        'CustomerId': prefixed('CustomerId', customer),
+        'CurrencyCode': 'UGX',
+        'CountryCode': 256,
+        'ProviderId': prefixed('ProviderId', rng.integers(1, 7, size=n)),
+        'ProductId': prefixed('ProductId', rng.integers(1, 28, size=n)),
+        'ProductCategory': category,
+        'ChannelId': _choice(rng, CHANNELS, n),
+        'Amount': amount,
+        'Value': value,
+        'TransactionStartTime': timestamps.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'PricingStrategy': _choice(rng, PRICING_STRATEGIES, n),
+        'FraudResult': (rng.random(n) < 0.002).astype(np.int64),
+    })
+    return df[XENTE_COLUMNS]
+
+
+def write_csv(df: pd.DataFrame, path: str) -> str:
+    """Writes generated transactions in the layout of the Xente CSV and returns the path."""
+    df.to_csv(path, index=False)
+    return path
+
+
+def api_records(df: pd.DataFrame) -> list:
+    """
+    Converts generated transactions to ``InputData`` payloads for the prediction API.
+
+    Prefixed identifiers become their numeric part and ProductCategory becomes a category
+    code, matching the integer fields of the API schema.
+
+    Returns
+    -------
+    list of dict
+        One JSON-serializable payload per transaction.
+    """
+    def numeric(column):
+        return pd.to_numeric(df[column].str.rpartition('_')[2]).tolist()
+
+    categories = pd.Categorical(df['ProductCategory'], categories=list(PRODUCT_CATEGORIES))
+    return [
+        {
+            'TransactionId': transaction_id,
+            'CustomerId': customer_id,
+            'ProductCategory': int(category),
+            'ChannelId': channel,
+            'Amount': float(amount) if amount == amount else 0.0,
+            'TransactionStartTime': timestamp,
+            'PricingStrategy': int(strategy),
+        }
+        for transaction_id, customer_id, category, channel, amount, timestamp, strategy in zip(
+            numeric('TransactionId'), numeric('CustomerId'), categories.codes,
+            df['ChannelId'], df['Amount'], df['TransactionStartTime'], df['PricingStrategy'])
+    ]
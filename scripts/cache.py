@@ -0,0 +1,343 @@
+import hashlib
+import inspect
+import json
+import os
+import sys
+import types
+
+import pandas as pd
+
+from scripts.data_loader import load_data
+
+# Bump when the on-disk layout or the load_data parsing changes, to invalidate old entries
+CACHE_VERSION = 1
+
+
+def file_digest(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    Computes the SHA-256 digest of a file's content.
+
+    Parameters
+    ----------
+    file_path : str
+        The file to hash.
+    block_size : int, optional
+        Number of bytes read per block.
+
+    Returns
+    -------
+    str
+        Hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """
+    Computes a content digest of a DataFrame, including its index, columns and dtypes.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The DataFrame to hash.
+
+    Returns
+    -------
+    str
+        Hex digest of the DataFrame content.
+    """
+    digest = hashlib.sha256()
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _module_file(module) -> str:
+    try:
+        return inspect.getsourcefile(module)
+    except TypeError:
+        # Built-in and C extension modules have no source
+        return None
+
+
+def _project_modules(module_name: str) -> list:
+    """
+    Lists a module and the modules of its project it references, transitively.
+
+    A module belongs to the project when its source file is under the directory of the
+    module's top-level package (or, for a top-level module, its directory), so library
+    modules are left out.
+    """
+    module = sys.modules.get(module_name)
+    top = sys.modules.get(module_name.split('.')[0])
+    root_file = _module_file(top) if top is not None else None
+    if module is None or root_file is None:
+        return []
+    root = os.path.dirname(os.path.abspath(root_file)) + os.sep
+
+    found, stack = {}, [module]
+    while stack:
+        module = stack.pop()
+        path = _module_file(module)
+        if module.__name__ in found or path is None or not os.path.abspath(path).startswith(root):
+            continue
+        found[module.__name__] = path
+        for value in vars(module).values():
+            if isinstance(value, types.ModuleType):
+                stack.append(value)
+            elif isinstance(getattr(value, '__module__', None), str) and value.__module__ in sys.modules:
+                stack.append(sys.modules[value.__module__])
+    return sorted(found.items())
+
+
+def function_digest(func) -> str:
+    """
+    Identifies a function by its qualified name, bytecode and the source of its project.
+
+    Besides the function itself, the digest covers the source files of its module and of
+    every project module that module references, so editing a callee (e.g.
+    ``FeatureEngineering.customer_aggregates`` under ``create_customer_features``) also
+    invalidates cached results. Library upgrades are not detected; bump ``CACHE_VERSION``.
+    """
+    digest = hashlib.sha256(f"{func.__module__}.{func.__qualname__}".encode())
+    code = getattr(func, '__code__', None)
+    if code is not None:
+        digest.update(code.co_code)
+        digest.update(repr(code.co_consts).encode())
+    for name, path in _project_modules(func.__module__):
+        digest.update(f"\0{name}\0".encode())
+        digest.update(file_digest(path).encode())
+    return digest.hexdigest()
+
+
+class FeatureCache:
+    """
+    A content-hash-keyed, on-disk columnar cache for loaded and engineered datasets.
+
+    Entries are uncompressed Feather (Arrow IPC) files read back with memory mapping, so
+    repeated runs on unchanged inputs skip CSV parsing and feature computation, and numeric
+    columns are served from the page cache instead of being re-parsed.
+
+    Keys chain through a pipeline: ``load_csv`` keys on the file content, and each ``apply``
+    derives its key from the upstream key, the stage function and its arguments, so a stage
+    is only recomputed when something upstream of it changed.
+
+    Methods
+    -------
+    load_csv(file_path: str) -> tuple
+        Loads a CSV like ``load_data``, returning the DataFrame and its cache key.
+
+    read_table(file_path: str) -> pd.DataFrame
+        Reads a feature table like ``pd.read_csv``, from the cache when unchanged.
+
+    apply(func, df: pd.DataFrame, *args, key: str = None, **kwargs) -> tuple
+        Runs (or loads the cached result of) a feature engineering stage.
+    """
+
+    def __init__(self, cache_dir: str = 'data/cache'):
+        """
+        Parameters
+        ----------
+        cache_dir : str, optional
+            Directory holding the Feather files; created if missing.
+        """
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError("FeatureCache requires 'pyarrow'; install it with 'pip install pyarrow'.") from e
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self._digest_index_path = os.path.join(cache_dir, 'file_digests.json')
+
+    def key(self, *parts) -> str:
+        """Builds a cache key from any number of parts."""
+        digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+        for part in parts:
+            digest.update(b'\0')
+            digest.update(str(part).encode())
+        return digest.hexdigest()
+
+    def path(self, key: str) -> str:
+        """Returns the Feather file path for a cache key."""
+        return os.path.join(self.cache_dir, f"{key}.feather")
+
+    def get(self, key: str):
+        """
+        Reads a cached DataFrame with memory mapping.
+
+        Returns
+        -------
+        pd.DataFrame or None
+            The cached DataFrame, or None on a cache miss.
+        """
+        import pyarrow.feather as feather
+
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        table = feather.read_table(path, memory_map=True)
+        return table.to_pandas(split_blocks=True)
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """Writes a DataFrame (including its index) as an uncompressed Feather file."""
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+
+    def load_csv(self, file_path: str) -> tuple:
+        """
+        Loads a CSV file like ``load_data``, from the cache when the file content is unchanged.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the dataset file.
+
+        Returns
+        -------
+        tuple
+            The loaded DataFrame and its cache key, to be passed to ``apply``.
+        """
+        if not os.path.exists(file_path):
+            return load_data(file_path), None
+        key = self.key('load_data', self._file_digest(file_path))
+        df = self.get(key)
+        if df is None:
+            df = load_data(file_path)
+            if not df.empty:
+                self.put(key, df)
+        else:
+            print(f"Data loaded from cache for '{file_path}' with {df.shape[0]} rows and {df.shape[1]} columns.")
+        return df, key
+
+    def read_table(self, file_path: str) -> pd.DataFrame:
+        """
+        Reads a CSV table such as ``extracted_features.csv`` like ``pd.read_csv``, from the
+        cache when the file content is unchanged. Parquet files are read directly.
+
+        Parameters
+        ----------
+        file_path : str
+            The table to read.
+
+        Returns
+        -------
+        pd.DataFrame
+            The table.
+        """
+        if file_path.endswith('.parquet'):
+            return pd.read_parquet(file_path)
+        key = self.key('read_csv', self._file_digest(file_path))
+        df = self.get(key)
+        if df is None:
+            df = pd.read_csv(file_path)
+            self.put(key, df)
+        return df
+
+    def apply(self, func, df: pd.DataFrame, *args, key: str = None, **kwargs) -> tuple:
+        """
+        Runs a feature engineering stage, or loads its cached output.
+
+        The stage runs on a copy of ``df``, so stages that modify their input (e.g.
+        ``extract_time_features`` adds columns to it) leave the caller's DataFrame
+        unchanged on a miss, just as on a hit.
+
+        Parameters
+        ----------
+        func : callable
+            Stage taking a DataFrame as first argument and returning a DataFrame,
+            e.g. ``FeatureEngineering.create_aggregate_features``.
+        df : pd.DataFrame
+            The stage input.
+        *args, **kwargs
+            Extra stage arguments; they are part of the cache key.
+        key : str, optional
+            Cache key of ``df`` as returned by ``load_csv`` or a previous ``apply``. When
+            omitted, the key is computed by hashing ``df``.
+
+        Returns
+        -------
+        tuple
+            The stage output and its cache key.
+        """
+        if key is None:
+            key = frame_digest(df)
+        stage_key = self.key(key, function_digest(func), repr(args), repr(sorted(kwargs.items())))
+        result = self.get(stage_key)
+        if result is None:
+            result = func(df.copy(), *args, **kwargs)
+            self.put(stage_key, result)
+        return result, stage_key
+
+    def _file_digest(self, file_path: str) -> str:
+        # Remember digests by (size, mtime) so unchanged files are not re-hashed on every run
+        stat = os.stat(file_path)
+        entry_key = f"{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        try:
+            with open(self._digest_index_path) as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            index = {}
+        digest = index.get(entry_key)
+        if digest is None:
+            digest = file_digest(file_path)
+            # Entries for older versions of the same file can never match again
+            path_key = os.path.abspath(file_path)
+            index = {key: value for key, value in index.items() if key.rsplit(':', 2)[0] != path_key}
+            index[entry_key] = digest
+            # Written like put, so concurrent runs never read a half-written index
+            tmp_path = f"{self._digest_index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(index, f)
+            os.replace(tmp_path, self._digest_index_path)
+        return digest
+
+
+def cached_load_data(file_path: str, cache_dir: str = 'data/cache') -> pd.DataFrame:
+    """
+    Load dataset from a CSV file through the columnar cache.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the dataset file.
+    cache_dir : str, optional
+        Directory holding the cache.
+
+    Returns
+    -------
+    pd.DataFrame
+        Loaded dataset, identical to ``load_data(file_path)``.
+    """
+    df, _ = FeatureCache(cache_dir).load_csv(file_path)
+    return df
+
+
+def read_table(file_path: str, cache_dir: str = None) -> pd.DataFrame:
+    """
+    Reads a CSV or Parquet table, through the columnar cache when ``cache_dir`` is given.
+
+    Parameters
+    ----------
+    file_path : str
+        The table to read; '.parquet' files are read as Parquet, anything else as CSV.
+    cache_dir : str, optional
+        Directory holding the cache. When omitted, the table is read without caching.
+
+    Returns
+    -------
+    pd.DataFrame
+        The table.
+    """
+    if cache_dir is not None:
+        return FeatureCache(cache_dir).read_table(file_path)
+    return pd.read_parquet(file_path) if file_path.endswith('.parquet') else pd.read_csv(file_path)
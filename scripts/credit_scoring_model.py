@@ -1,13 +1,21 @@
 # Import libraries
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import joblib
+
+try:
+    from scripts.feature_engineering import CustomerSlots, FeatureEngineering
+except ImportError:
+    # Imported from the scripts directory, as the notebooks do
+    from feature_engineering import CustomerSlots, FeatureEngineering
 
 
 class CreditScoreRFM:
     """
     A class to calculate Recency, Frequency, Monetary values and perform RFM scoring with visualizations.
+
+    Plotting libraries are imported by the plot methods only, so serving code can use the
+    scoring helpers in this module without loading matplotlib or seaborn.
     """
 
     def __init__(self, rfm_data):
@@ -40,36 +48,52 @@ class CreditScoreRFM:
         ].drop_duplicates()
         return rfm_data
 
+    @staticmethod
+    def calculate_rfm_streaming(chunks, end_date=None):
+        """
+        Calculate Recency, Frequency and Monetary values from an iterable of
+        transaction chunks without holding the full history in memory.
+
+        Parameters
+        ----------
+        chunks : iterable of pd.DataFrame
+            Transaction chunks, e.g. from a chunked ``pd.read_csv`` or a generator.
+        end_date : pd.Timestamp, optional
+            Reference time for Recency. Defaults to the current UTC time.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per customer with CustomerId, Recency, Frequency and Monetary.
+        """
+        accumulator = RFMAccumulator()
+        for chunk in chunks:
+            accumulator.update(chunk)
+        return accumulator.to_frame(end_date)
+
     def calculate_rfm_scores(self, rfm_data):
-        rfm_data["r_quartile"] = pd.qcut(
-            rfm_data["Recency"], 4, labels=["4", "3", "2", "1"]
-        )
-        rfm_data["f_quartile"] = pd.qcut(
-            rfm_data["Frequency"], 4, labels=["1", "2", "3", "4"]
-        )
-        rfm_data["m_quartile"] = pd.qcut(
-            rfm_data["Monetary"], 4, labels=["1", "2", "3", "4"]
-        )
+        """
+        Assign R, F and M quartiles, the weighted RFM_Score and the Risk_Label.
 
-        rfm_data["RFM_Score"] = (
-            rfm_data["r_quartile"].astype(int) * 0.1
-            + rfm_data["f_quartile"].astype(int) * 0.45
-            + rfm_data["m_quartile"].astype(int) * 0.45
-        )
-        low_threshold = rfm_data["RFM_Score"].quantile(0.5)
-        rfm_data["Risk_Label"] = rfm_data["RFM_Score"].apply(
-            lambda x: "Good" if x >= low_threshold else "Bad"
-        )
+        Quartile edges are fitted on ``rfm_data`` with ``RFMScorer``; use the
+        scorer directly to reuse the fitted edges for new customers.
+        """
+        scores = RFMScorer().fit(rfm_data).transform(rfm_data)
+        for col in scores.columns:
+            rfm_data[col] = scores[col].to_numpy()
         return rfm_data
 
     def assign_label(self, rfm_data):
-        low_threshold = rfm_data["RFM_Score"].quantile(0.5)
-        rfm_data["Risk_Label"] = rfm_data["RFM_Score"].apply(
-            lambda x: "Good" if x >= low_threshold else "Bad"
+        low_threshold = np.nanquantile(rfm_data["RFM_Score"].to_numpy(dtype=np.float64), 0.5)
+        rfm_data["Risk_Label"] = np.where(
+            rfm_data["RFM_Score"].to_numpy() >= low_threshold, "Good", "Bad"
         )
         return rfm_data
 
     def plot_pairplot(self):
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         sns.set_palette("pastel")
         sns.pairplot(
             self.rfm_data[["Recency", "Frequency", "Monetary"]], diag_kind="hist"
@@ -78,6 +102,9 @@ class CreditScoreRFM:
         plt.show()
 
     def plot_heatmap(self):
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         sns.set_palette("pastel")
         corr = self.rfm_data[["Recency", "Frequency", "Monetary"]].corr()
         sns.heatmap(corr, annot=True, cmap="viridis", fmt=".2f")
@@ -85,6 +112,9 @@ class CreditScoreRFM:
         plt.show()
 
     def plot_histograms(self):
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         sns.set_palette("pastel")
         fig, axes = plt.subplots(1, 3, figsize=(18, 6))
 
@@ -114,10 +144,22 @@ class CreditScoreRFM:
         """
         Calculate good and bad counts for each RFM_bin.
         """
-        grouped_data = data.groupby("RFM_bin")
-        good_count = grouped_data["Risk_Label"].apply(lambda x: (x == "Good").sum())
-        bad_count = grouped_data["Risk_Label"].apply(lambda x: (x == "Bad").sum())
+        codes, bins = pd.factorize(data["RFM_bin"], sort=True)
+        valid = codes >= 0
+        codes = codes[valid]
+        labels = data["Risk_Label"].to_numpy()[valid]
+        index = pd.Index(bins, name="RFM_bin")
 
+        good_count = pd.Series(
+            np.bincount(codes, weights=labels == "Good", minlength=len(bins)).astype(np.int64),
+            index=index,
+            name="Risk_Label",
+        )
+        bad_count = pd.Series(
+            np.bincount(codes, weights=labels == "Bad", minlength=len(bins)).astype(np.int64),
+            index=index,
+            name="Risk_Label",
+        )
         return good_count, bad_count
 
     def calculate_woe(self, good_count, bad_count):
@@ -137,3 +179,435 @@ class CreditScoreRFM:
 
         # Return WoE as a Series with the same index as good_count
         return pd.Series(woe, index=good_count.index)
+
+
+class RFMScorer:
+    """
+    Vectorized RFM quartile scoring with reusable quartile edges.
+
+    ``fit`` computes the Recency, Frequency and Monetary quartile edges with
+    ``np.quantile`` and the median RFM_Score used as the Good/Bad threshold.
+    ``transform`` buckets any customers with ``np.searchsorted`` against those
+    edges, so new customers are scored consistently with the training
+    population. The buckets match ``pd.qcut(..., 4)``: right-closed intervals,
+    with Recency quartiles reversed (most recent customers score 4). A missing
+    value gets quartile 0 and makes the customer's RFM_Score NaN, so the
+    customer is labelled "Bad" instead of falling into a top quartile.
+    """
+
+    WEIGHTS = {"Recency": 0.1, "Frequency": 0.45, "Monetary": 0.45}
+    QUARTILE_COLUMNS = {
+        "Recency": "r_quartile",
+        "Frequency": "f_quartile",
+        "Monetary": "m_quartile",
+    }
+
+    def fit(self, rfm_data):
+        """
+        Fit the quartile edges and the Risk_Label threshold.
+
+        Parameters
+        ----------
+        rfm_data : pd.DataFrame
+            Recency, Frequency and Monetary per customer.
+
+        Returns
+        -------
+        RFMScorer
+            The fitted scorer.
+        """
+        self.edges_ = {}
+        for col in self.WEIGHTS:
+            values = rfm_data[col].to_numpy(dtype=np.float64)
+            edges = np.nanquantile(values, [0.0, 0.25, 0.5, 0.75, 1.0])
+            if len(np.unique(edges)) < len(edges):
+                raise ValueError(f"Bin edges must be unique for {col}: {edges.tolist()}")
+            self.edges_[col] = edges
+        score = self._weighted_score(self.quartiles(rfm_data))
+        self.threshold_ = float(np.nanquantile(score, 0.5))
+        return self
+
+    def transform(self, rfm_data):
+        """
+        Score customers with the fitted edges.
+
+        Parameters
+        ----------
+        rfm_data : pd.DataFrame
+            Recency, Frequency and Monetary per customer.
+
+        Returns
+        -------
+        pd.DataFrame
+            r_quartile, f_quartile, m_quartile (1-4, 0 for a missing value),
+            RFM_Score (NaN if any value is missing) and Risk_Label, aligned with
+            ``rfm_data``.
+        """
+        self._check_is_fitted()
+        quartiles = self.quartiles(rfm_data)
+        score = self._weighted_score(quartiles)
+        result = pd.DataFrame(
+            {self.QUARTILE_COLUMNS[col]: quartiles[col] for col in self.WEIGHTS},
+            index=rfm_data.index,
+        )
+        result["RFM_Score"] = score
+        result["Risk_Label"] = np.where(score >= self.threshold_, "Good", "Bad")
+        return result
+
+    def quartiles(self, rfm_data):
+        """
+        Bucket Recency, Frequency and Monetary into quartiles 1-4.
+
+        Returns
+        -------
+        dict
+            An int8 array of quartiles per RFM column, 0 where the value is missing.
+        """
+        self._check_is_fitted()
+        quartiles = {}
+        for col, edges in self.edges_.items():
+            values = rfm_data[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            bucket = np.searchsorted(edges[1:-1], values, side="left").astype(np.int8)
+            quartile = (4 - bucket) if col == "Recency" else (bucket + 1)
+            # searchsorted places NaN after every edge, which would be a top quartile
+            quartile[np.isnan(values)] = 0
+            quartiles[col] = quartile
+        return quartiles
+
+    def save(self, path):
+        """Save the fitted edges and threshold with joblib."""
+        self._check_is_fitted()
+        joblib.dump({"edges": self.edges_, "threshold": self.threshold_}, path)
+
+    @staticmethod
+    def load(path):
+        """Load a scorer saved with ``save``."""
+        state = joblib.load(path)
+        scorer = RFMScorer()
+        scorer.edges_ = state["edges"]
+        scorer.threshold_ = state["threshold"]
+        return scorer
+
+    def _weighted_score(self, quartiles):
+        score = np.zeros(len(next(iter(quartiles.values()))), dtype=np.float64)
+        for col, weight in self.WEIGHTS.items():
+            score += quartiles[col] * weight
+            score[quartiles[col] == 0] = np.nan
+        return score
+
+    def _check_is_fitted(self):
+        if not hasattr(self, "edges_"):
+            raise RuntimeError("RFMScorer is not fitted yet; call 'fit' first.")
+
+
+class WoEBinner:
+    """
+    Weight of Evidence binning with precomputed lookup tables.
+
+    ``fit`` bins each feature on training data (quantile bins for numeric
+    features, one bin per value for categorical ones), counts good and bad
+    labels per bin with ``CreditScoreRFM.calculate_counts`` and converts them
+    with ``CreditScoreRFM.calculate_woe``. Only the bin edges (or sorted
+    categories) and the WoE of each bin are kept, as NumPy arrays, so
+    ``transform`` is one ``np.searchsorted`` and one array lookup per feature.
+
+    Each feature has an extra last bin for missing values and, for categorical
+    features, values not seen during ``fit``; its WoE is 0 unless the training
+    data had missing values.
+
+    Attributes
+    ----------
+    categorical_ : list
+        Features binned by value rather than by quantile.
+    edges_ : dict
+        Interior bin edges (numeric) or sorted categories (categorical) per feature.
+    woe_ : dict
+        WoE per bin, with the missing-value bin last, per feature.
+    iv_ : dict
+        Information Value per feature.
+    """
+
+    def __init__(self, features, n_bins=10, target="Risk_Label", good_label="Good", bad_label="Bad"):
+        """
+        Parameters
+        ----------
+        features : list
+            Columns to bin, in the order used by ``transform_array``.
+        n_bins : int, optional
+            Maximum number of quantile bins per numeric feature; tied edges are merged.
+        target : str, optional
+            Label column used by ``fit``.
+        good_label, bad_label : str, optional
+            Values of ``target`` counted as good and bad.
+        """
+        self.features = list(features)
+        self.n_bins = n_bins
+        self.target = target
+        self.good_label = good_label
+        self.bad_label = bad_label
+
+    def fit(self, df):
+        """
+        Fit bins and WoE values for every feature.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Training data with ``features`` and the ``target`` column.
+
+        Returns
+        -------
+        WoEBinner
+            The fitted binner.
+        """
+        scorer = CreditScoreRFM(None)
+        target = df[self.target].to_numpy()
+        labels = np.select([target == self.good_label, target == self.bad_label], ["Good", "Bad"], "")
+        self.edges_, self.woe_, self.iv_ = {}, {}, {}
+        self.categorical_ = []
+        for feature in self.features:
+            values = df[feature]
+            if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+                numeric = values.to_numpy(dtype=np.float64, na_value=np.nan)
+                quantiles = np.linspace(0.0, 1.0, self.n_bins + 1)
+                edges = np.unique(np.nanquantile(numeric, quantiles)) if np.isfinite(numeric).any() else np.empty(0)
+                self.edges_[feature] = edges[1:-1]
+            else:
+                self.categorical_.append(feature)
+                self.edges_[feature] = np.unique(values.dropna().to_numpy().astype(str))
+            bins = self._bin(feature, values)
+            n_bins = self._n_bins(feature)
+
+            good_count, bad_count = scorer.calculate_counts(
+                pd.DataFrame({"RFM_bin": bins, "Risk_Label": labels})
+            )
+            good_count = good_count.reindex(range(n_bins), fill_value=0)
+            bad_count = bad_count.reindex(range(n_bins), fill_value=0)
+            woe = scorer.calculate_woe(good_count, bad_count).to_numpy(dtype=np.float64)
+
+            # Bins without training rows (e.g. the missing bin) carry no evidence
+            empty = (good_count.to_numpy() + bad_count.to_numpy()) == 0
+            woe[empty] = 0.0
+            self.woe_[feature] = woe
+
+            good_rate = good_count.to_numpy() / max(good_count.sum(), 1)
+            bad_rate = bad_count.to_numpy() / max(bad_count.sum(), 1)
+            self.iv_[feature] = float(np.sum((good_rate - bad_rate) * woe))
+        return self
+
+    def transform(self, df):
+        """
+        Replace each feature with the WoE of its bin.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Data with the fitted ``features``.
+
+        Returns
+        -------
+        pd.DataFrame
+            WoE values for ``features``, aligned with ``df``.
+        """
+        self._check_is_fitted()
+        return pd.DataFrame(
+            {feature: self.woe_[feature][self._bin(feature, df[feature])] for feature in self.features},
+            index=df.index,
+        )
+
+    def transform_array(self, X):
+        """
+        Apply the WoE lookup tables to a 2-D array of numeric features.
+
+        Parameters
+        ----------
+        X : np.ndarray
+            Array of shape ``(n_rows, len(features))`` in ``features`` order.
+            Categorical features are not supported here; use ``transform``.
+
+        Returns
+        -------
+        np.ndarray
+            Float64 array of WoE values with the same shape as ``X``.
+        """
+        self._check_is_fitted()
+        X = np.asarray(X, dtype=np.float64)
+        out = np.empty(X.shape, dtype=np.float64)
+        for j, feature in enumerate(self.features):
+            column = X[:, j]
+            bins = np.searchsorted(self.edges_[feature], column, side="left")
+            bins[np.isnan(column)] = self._n_bins(feature) - 1
+            np.take(self.woe_[feature], bins, out=out[:, j])
+        return out
+
+    def information_value(self):
+        """Return the Information Value of each feature, highest first."""
+        self._check_is_fitted()
+        return pd.Series(self.iv_, name="IV").sort_values(ascending=False)
+
+    def save(self, path):
+        """Save the fitted binner with joblib."""
+        self._check_is_fitted()
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path):
+        """Load a binner saved with ``save``."""
+        binner = joblib.load(path)
+        if not isinstance(binner, WoEBinner):
+            raise TypeError(f"Expected a WoEBinner in '{path}', found {type(binner)}")
+        return binner
+
+    def _bin(self, feature, values):
+        edges = self.edges_[feature]
+        missing_bin = self._n_bins(feature) - 1
+        if feature in self.categorical_:
+            # Categorical: exact match against the sorted categories
+            values = pd.Series(values)
+            missing = values.isna().to_numpy()
+            strings = values.to_numpy().astype(str)
+            if len(edges) == 0:
+                return np.full(len(strings), missing_bin, dtype=np.intp)
+            idx = np.minimum(np.searchsorted(edges, strings), len(edges) - 1)
+            return np.where((edges[idx] == strings) & ~missing, idx, missing_bin)
+        numeric = pd.Series(values).to_numpy(dtype=np.float64, na_value=np.nan)
+        bins = np.searchsorted(edges, numeric, side="left")
+        bins[np.isnan(numeric)] = missing_bin
+        return bins
+
+    def _n_bins(self, feature):
+        edges = self.edges_[feature]
+        # Numeric: len(edges) + 1 value bins; categorical: one bin per category; plus the missing bin
+        return len(edges) + (1 if feature in self.categorical_ else 2)
+
+    def _check_is_fitted(self):
+        if not hasattr(self, "woe_"):
+            raise RuntimeError("WoEBinner is not fitted yet; call 'fit' first.")
+
+
+class RFMAccumulator:
+    """
+    Incrementally accumulates per-customer RFM state from transaction chunks.
+
+    The state is one entry per customer in compact NumPy arrays (last-seen
+    timestamp, transaction count and monetary sum), so memory grows with the
+    number of customers rather than the number of transactions. Chunks are
+    reduced with ``FeatureEngineering.customer_aggregates`` and folded into
+    ``CustomerSlots``, whose arrays grow geometrically, so folding in a chunk
+    costs time proportional to the chunk, not to the state. Partial
+    states built by several workers can be combined with ``merge``.
+    """
+
+    _NO_TIMESTAMP = np.iinfo(np.int64).min
+
+    def __init__(self, initial_capacity=1024):
+        self._slots = CustomerSlots({
+            "last_seen": (np.int64, self._NO_TIMESTAMP),
+            "frequency": (np.int64, 0),
+            "monetary": (np.float64, 0.0),
+        }, initial_capacity)
+        self.has_amount = False
+
+    def __len__(self):
+        return len(self._slots)
+
+    @property
+    def customer_ids(self):
+        """Customer ids in first-seen order."""
+        return pd.Index(self._slots.customer_ids)
+
+    @property
+    def last_seen(self):
+        """Latest transaction time of each customer, as int64 nanoseconds since the epoch (UTC)."""
+        return self._slots.view("last_seen")
+
+    @property
+    def frequency(self):
+        """Number of transactions of each customer."""
+        return self._slots.view("frequency")
+
+    @property
+    def monetary(self):
+        """Sum of the transaction amounts of each customer."""
+        return self._slots.view("monetary")
+
+    def update(self, chunk):
+        """
+        Fold a chunk of transactions into the running state.
+
+        Parameters
+        ----------
+        chunk : pd.DataFrame
+            Transactions with CustomerId, TransactionId and TransactionStartTime
+            columns, and optionally Amount.
+
+        Returns
+        -------
+        RFMAccumulator
+            The updated accumulator.
+        """
+        features = ["Transaction_Count", "Last_Access_Date"]
+        if "Amount" in chunk.columns:
+            self.has_amount = True
+            features.append("Total_Transaction_Amount")
+        _, uniques, stats = FeatureEngineering.customer_aggregates(chunk, features)
+        monetary = stats.get("Total_Transaction_Amount", np.zeros(len(uniques), dtype=np.float64))
+        self._combine(uniques, stats["Last_Access_Date"].view(np.int64),
+                      stats["Transaction_Count"], monetary)
+        return self
+
+    def merge(self, other):
+        """
+        Merge the state of another accumulator into this one.
+
+        Parameters
+        ----------
+        other : RFMAccumulator
+            A partial state, e.g. built by another worker.
+
+        Returns
+        -------
+        RFMAccumulator
+            The updated accumulator.
+        """
+        self.has_amount = self.has_amount or other.has_amount
+        self._combine(other._slots.customer_ids, other.last_seen, other.frequency, other.monetary)
+        return self
+
+    def to_frame(self, end_date=None):
+        """
+        Emit the RFM values for every customer seen so far, in first-seen order.
+
+        Parameters
+        ----------
+        end_date : pd.Timestamp, optional
+            Reference time for Recency. Defaults to the current UTC time.
+
+        Returns
+        -------
+        pd.DataFrame
+            CustomerId, Recency, Frequency and Monetary columns, matching
+            ``CreditScoreRFM.calculate_rfm``.
+        """
+        if end_date is None:
+            end_date = pd.Timestamp.utcnow()
+        end_date = pd.Timestamp(end_date)
+        if end_date.tzinfo is None:
+            end_date = end_date.tz_localize("UTC")
+
+        last_access = pd.to_datetime(self.last_seen.view("datetime64[ns]"), utc=True)
+        return pd.DataFrame(
+            {
+                "CustomerId": self.customer_ids,
+                "Recency": (end_date - last_access).days,
+                "Frequency": self.frequency.copy(),
+                "Monetary": self.monetary.copy() if self.has_amount else 1,
+            }
+        )
+
+    def _combine(self, customer_ids, last_seen, frequency, monetary):
+        slots = self._slots.slots_for(customer_ids)
+        arrays = self._slots.arrays
+        arrays["last_seen"][slots] = np.maximum(arrays["last_seen"][slots], last_seen)
+        arrays["frequency"][slots] += frequency
+        arrays["monetary"][slots] += monetary
@@ -1,6 +1,26 @@
 # Import necessary library
+import io
+import os
+
+import numpy as np
 import pandas as pd
 
+# Columns of the Xente export holding prefixed identifiers such as 'CustomerId_4406'
+ID_COLUMNS = ['TransactionId', 'BatchId', 'AccountId', 'SubscriptionId', 'CustomerId', 'ProductId']
+
+# Compact dtypes for the remaining Xente columns
+XENTE_DTYPES = {
+    'CurrencyCode': 'category',
+    'CountryCode': 'int16',
+    'ProviderId': 'category',
+    'ProductCategory': 'category',
+    'ChannelId': 'category',
+    'Amount': 'float64',
+    'Value': 'int32',
+    'PricingStrategy': 'int8',
+    'FraudResult': 'int8',
+}
+
 # Load data function
 def load_data(file_path: str) -> pd.DataFrame:
     """
@@ -27,3 +47,172 @@ def load_data(file_path: str) -> pd.DataFrame:
     except Exception as e:
         print(f"Unexpected error occurred: {e}")
     return pd.DataFrame()
+
+
+def parse_id_column(series: pd.Series) -> pd.Series:
+    """
+    Convert prefixed identifiers such as 'CustomerId_4406' to int32.
+
+    The column is factorized first and only its distinct strings are parsed, so
+    repeated identifiers (customers, accounts, products) are parsed once per chunk.
+
+    Parameters:
+    -----------
+    series : pd.Series
+        Identifier column, either prefixed strings or already numeric.
+
+    Returns:
+    --------
+    pd.Series
+        The numeric part of each identifier as int32.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype('int32')
+    codes, uniques = pd.factorize(series)
+    if (codes < 0).any():
+        raise ValueError(f"Column '{series.name}' has missing identifiers.")
+    numbers = np.fromiter((int(value[value.rfind('_') + 1:]) for value in uniques),
+                          dtype=np.int32, count=len(uniques))
+    return pd.Series(numbers.take(codes), index=series.index, name=series.name)
+
+
+def iter_data_chunks(file_path: str, chunksize: int = 100_000, columns: list = None,
+                     categories: dict = None):
+    """
+    Stream a Xente-format CSV file as typed DataFrame chunks with bounded memory.
+
+    Identifier columns are parsed to int32, ProviderId/ProductCategory/ChannelId/CurrencyCode
+    become categoricals, small integer columns are downcast and TransactionStartTime is parsed
+    as a UTC datetime. Unlike ``load_data``, TransactionId stays a regular column so chunks can
+    be passed straight to ``FeatureEngineering``, ``RFMAccumulator`` or ``CustomerFeatureStore``.
+
+    Parameters:
+    -----------
+    file_path : str
+        The path to the dataset file.
+    chunksize : int, optional
+        Number of rows per chunk; at most one chunk is materialized at a time.
+    columns : list, optional
+        Columns to read (column projection). Defaults to all columns.
+    categories : dict, optional
+        Fixed categories per categorical column, so codes are consistent across chunks.
+        Without it, each chunk only contains the categories it observed.
+
+    Yields:
+    -------
+    pd.DataFrame
+        Typed chunks of at most ``chunksize`` rows.
+    """
+    dtypes = _chunk_dtypes(columns, categories)
+    n_rows = 0
+    n_chunks = 0
+    try:
+        reader = pd.read_csv(file_path, usecols=columns, dtype=dtypes, chunksize=chunksize)
+        with reader:
+            for chunk in reader:
+                chunk = convert_chunk_types(chunk)
+                n_rows += len(chunk)
+                n_chunks += 1
+                yield chunk
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        return
+    except pd.errors.EmptyDataError:
+        print(f"Error: The file '{file_path}' is empty or invalid.")
+        return
+    print(f"Data successfully streamed from '{file_path}' with {n_rows} rows in {n_chunks} chunks.")
+
+
+def _chunk_dtypes(columns: list = None, categories: dict = None) -> dict:
+    dtypes = dict(XENTE_DTYPES)
+    for col, values in (categories or {}).items():
+        dtypes[col] = pd.CategoricalDtype(values)
+    if columns is not None:
+        dtypes = {col: dtype for col, dtype in dtypes.items() if col in columns}
+    return dtypes
+
+
+def convert_chunk_types(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Parse the identifier and timestamp columns of a chunk read with ``XENTE_DTYPES``.
+
+    Parameters:
+    -----------
+    chunk : pd.DataFrame
+        Rows of a Xente-format CSV file.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The same chunk with int32 identifiers and a UTC TransactionStartTime.
+    """
+    for col in ID_COLUMNS:
+        if col in chunk.columns:
+            chunk[col] = parse_id_column(chunk[col])
+    if 'TransactionStartTime' in chunk.columns:
+        chunk['TransactionStartTime'] = pd.to_datetime(chunk['TransactionStartTime'], utc=True)
+    return chunk
+
+
+def csv_byte_ranges(file_path: str, target_bytes: int = 32 * 2**20) -> tuple:
+    """
+    Split a CSV file into byte ranges of whole lines, so parts can be parsed in parallel.
+
+    Assumes that no quoted field contains a line break, which holds for the Xente export.
+
+    Parameters:
+    -----------
+    file_path : str
+        The path to the dataset file.
+    target_bytes : int, optional
+        Approximate size of each range.
+
+    Returns:
+    --------
+    tuple
+        The column names from the header line and a list of ``(start, end)`` byte offsets
+        covering the data lines, in file order.
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        names = pd.read_csv(io.BytesIO(f.readline()), nrows=0).columns.tolist()
+        start = f.tell()
+        ranges = []
+        while start < size:
+            f.seek(min(start + target_bytes, size))
+            if f.tell() < size:
+                # Extend the range to the end of the line it stops in
+                f.readline()
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return names, ranges
+
+
+def read_csv_range(file_path: str, start: int, end: int, names: list,
+                   categories: dict = None) -> pd.DataFrame:
+    """
+    Read and type the data lines between two byte offsets of a Xente-format CSV file.
+
+    Parameters:
+    -----------
+    file_path : str
+        The path to the dataset file.
+    start, end : int
+        A range returned by ``csv_byte_ranges``.
+    names : list
+        Column names from the header line.
+    categories : dict, optional
+        Fixed categories per categorical column, as in ``iter_data_chunks``.
+
+    Returns:
+    --------
+    pd.DataFrame
+        The rows in the range, typed like the chunks of ``iter_data_chunks``.
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    chunk = pd.read_csv(io.BytesIO(data), names=names, header=None,
+                        dtype=_chunk_dtypes(names, categories))
+    return convert_chunk_types(chunk)
@@ -53,6 +53,9 @@ class CreditRiskAnalysis:
     def summary_statistics(self):
         """
         Function to compute summary statistics like mean, median, std, skewness, etc.
+
+        For extracts that do not fit in memory, ``streaming_stats.summarize_chunks`` computes
+        the same table in one pass over chunks.
         
         Parameters:
         -----------
@@ -0,0 +1,438 @@
+import argparse
+import base64
+import html
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from scripts.data_loader import ID_COLUMNS, iter_data_chunks
+from scripts.streaming_stats import summarize_chunks
+
+# seaborn's "pastel" palette, so report figures look like the notebook ones without seaborn
+PASTEL = ['#a1c9f4', '#ffb482', '#8de5a1', '#ff9f9b', '#d0bbff',
+          '#debb9b', '#fab0e4', '#cfcfcf', '#fffea3', '#b9f2f0']
+
+RFM_COLUMNS = ['Recency', 'Frequency', 'Monetary']
+
+
+def downsample(values: np.ndarray, max_rows: int, seed: int = 0) -> np.ndarray:
+    """
+    Returns at most ``max_rows`` values, drawn without replacement with a fixed seed.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The values of one column.
+    max_rows : int
+        Largest sample to keep; smaller inputs are returned as they are.
+    seed : int, optional
+        Seed of the sample, so reports of the same data are identical.
+    """
+    if max_rows is None or len(values) <= max_rows:
+        return values
+    rng = np.random.default_rng(seed)
+    return values[np.sort(rng.choice(len(values), size=max_rows, replace=False))]
+
+
+def kde_curve(values: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """
+    Gaussian KDE of ``values`` evaluated on ``grid``, or None for constant data.
+
+    The cost grows with ``len(values) * len(grid)``, so callers pass a downsampled column.
+    """
+    from scipy.stats import gaussian_kde
+
+    if len(values) < 2 or np.ptp(values) == 0:
+        return None
+    try:
+        return gaussian_kde(values)(grid)
+    except np.linalg.LinAlgError:
+        return None
+
+
+def histogram_spec(values: np.ndarray, bins: int = 15, max_rows: int = 100_000, seed: int = 0,
+                   kde: bool = True, title: str = '', xlabel: str = '', color: str = PASTEL[0],
+                   mean_median: bool = True) -> dict:
+    """
+    Precomputes everything a histogram figure needs, so rendering does not touch the data.
+
+    Counts, mean and median are computed on all values with NumPy, one vectorized pass
+    each. The KDE, whose cost grows with the number of points times the grid size, uses
+    a sample of at most ``max_rows`` values and is scaled to the counts like ``sns.histplot(kde=True)``.
+
+    Returns
+    -------
+    dict
+        A picklable figure description for ``render_figure``.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    spec = {'kind': 'histogram', 'title': title, 'xlabel': xlabel, 'color': color,
+            'counts': np.zeros(0), 'edges': np.zeros(1), 'kde': None, 'mean': None, 'median': None}
+    if len(values) == 0:
+        return spec
+    counts, edges = np.histogram(values, bins=bins)
+    spec.update(counts=counts, edges=edges)
+    if mean_median:
+        spec.update(mean=float(values.mean()), median=float(np.median(values)))
+    if kde:
+        grid = np.linspace(edges[0], edges[-1], 200)
+        density = kde_curve(downsample(values, max_rows, seed), grid)
+        if density is not None:
+            spec['kde'] = (grid, density * len(values) * (edges[1] - edges[0]))
+    return spec
+
+
+def boxplot_spec(values: np.ndarray, max_fliers: int = 1_000, seed: int = 0, title: str = '',
+                 ylabel: str = '') -> dict:
+    """
+    Box statistics of a column (quartiles, 1.5 IQR whiskers and outliers), for ``Axes.bxp``.
+
+    Only up to ``max_fliers`` outliers are kept for drawing; their total is in the title.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    stats = {'med': np.nan, 'q1': np.nan, 'q3': np.nan, 'whislo': np.nan, 'whishi': np.nan, 'fliers': []}
+    n_outliers = 0
+    if len(values):
+        q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+        low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        inside = values[(values >= low) & (values <= high)]
+        outliers = values[(values < low) | (values > high)]
+        n_outliers = len(outliers)
+        stats = {'med': median, 'q1': q1, 'q3': q3, 'whislo': inside.min(), 'whishi': inside.max(),
+                 'fliers': downsample(outliers, max_fliers, seed)}
+    return {'kind': 'boxplot', 'stats': stats, 'title': f'{title} ({n_outliers} outliers)', 'ylabel': ylabel}
+
+
+def render_figure(spec: dict) -> bytes:
+    """
+    Draws a figure description and returns it as PNG bytes.
+
+    Figures are created with ``matplotlib.figure.Figure`` and saved with the Agg canvas,
+    without pyplot, so rendering needs no display and changes no global backend; it is
+    safe in worker processes of a headless server.
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=spec.get('figsize', (7, 5)), layout='constrained')
+    _DRAW[spec['kind']](fig, spec)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=spec.get('dpi', 80))
+    return buffer.getvalue()
+
+
+def render_figures(specs: list, n_workers: int = None) -> list:
+    """
+    Renders figure descriptions in parallel worker processes.
+
+    Parameters
+    ----------
+    specs : list
+        Figure descriptions, e.g. from ``EDAReport.figure_specs``.
+    n_workers : int, optional
+        Worker processes. Defaults to the number of CPUs; 1 renders in process.
+
+    Returns
+    -------
+    list
+        PNG bytes of each figure, in the order of ``specs``.
+    """
+    n_workers = min(max(int(n_workers or os.cpu_count() or 1), 1), max(len(specs), 1))
+    if n_workers == 1:
+        return [render_figure(spec) for spec in specs]
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(render_figure, specs))
+
+
+def _draw_histogram(fig, spec):
+    ax = fig.subplots()
+    if len(spec['counts']):
+        ax.stairs(spec['counts'], spec['edges'], fill=True, color=spec['color'], edgecolor='black')
+    if spec['kde'] is not None:
+        ax.plot(*spec['kde'], color='black', linewidth=1.5)
+    if spec['mean'] is not None:
+        ax.axvline(spec['mean'], color='red', linestyle='dashed', linewidth=2, label='Mean')
+        ax.axvline(spec['median'], color='green', linestyle='dashed', linewidth=2, label='Median')
+        ax.legend(loc='upper right')
+    ax.set_title(spec['title'], fontsize=14, fontweight='bold')
+    ax.set_xlabel(spec['xlabel'])
+    ax.set_ylabel('Frequency')
+    ax.grid(axis='y', alpha=0.7)
+
+
+def _draw_bars(fig, spec):
+    ax = fig.subplots()
+    labels, values = [str(label) for label in spec['labels']], spec['values']
+    colors = [PASTEL[i % len(PASTEL)] for i in range(len(labels))]
+    bars = ax.bar(labels, values, color=colors, edgecolor='black')
+    ax.bar_label(bars, fmt=spec.get('fmt', '{:.0f}'), fontsize=9)
+    if spec.get('zero_line'):
+        ax.axhline(0, color='grey', linewidth=0.8, linestyle='--')
+    ax.set_title(spec['title'], fontsize=14, fontweight='bold')
+    ax.set_ylabel(spec['ylabel'])
+    ax.tick_params(axis='x', rotation=45)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+
+
+def _draw_boxplot(fig, spec):
+    ax = fig.subplots()
+    ax.bxp([spec['stats']], showfliers=True, patch_artist=True,
+           boxprops={'facecolor': 'orange'}, flierprops={'markersize': 3})
+    ax.set_title(spec['title'], fontsize=12)
+    ax.set_ylabel(spec['ylabel'])
+    ax.set_xticks([])
+
+
+def _draw_heatmap(fig, spec):
+    ax = fig.subplots()
+    matrix, labels = np.asarray(spec['matrix']), spec['labels']
+    image = ax.imshow(matrix, cmap=spec.get('cmap', 'cool'), vmin=-1, vmax=1)
+    fig.colorbar(image, ax=ax)
+    ax.set_xticks(range(len(labels)), labels, rotation=45, ha='right')
+    ax.set_yticks(range(len(labels)), labels)
+    for (i, j), value in np.ndenumerate(matrix):
+        if np.isfinite(value):
+            ax.text(j, i, f'{value:.2f}', ha='center', va='center', fontsize=8)
+    ax.set_title(spec['title'], fontsize=14)
+
+
+def _draw_pairplot(fig, spec):
+    columns, sample, histograms = spec['columns'], spec['sample'], spec['histograms']
+    axes = fig.subplots(len(columns), len(columns), squeeze=False)
+    for i, y_col in enumerate(columns):
+        for j, x_col in enumerate(columns):
+            ax = axes[i, j]
+            if i == j:
+                counts, edges = histograms[x_col]
+                ax.stairs(counts, edges, fill=True, color=PASTEL[0], edgecolor='black')
+            else:
+                ax.scatter(sample[x_col], sample[y_col], s=4, alpha=0.5, color=PASTEL[0])
+            if i == len(columns) - 1:
+                ax.set_xlabel(x_col)
+            if j == 0:
+                ax.set_ylabel(y_col)
+    fig.suptitle(spec['title'])
+
+
+_DRAW = {
+    'histogram': _draw_histogram,
+    'bars': _draw_bars,
+    'boxplot': _draw_boxplot,
+    'heatmap': _draw_heatmap,
+    'pairplot': _draw_pairplot,
+}
+
+
+class EDAReport:
+    """
+    Headless EDA report with the plots of ``CreditRiskAnalysis`` and ``CreditScoreRFM``.
+
+    The plotting methods of those classes call ``plt.show()`` and let seaborn compute
+    KDEs on every row. Here the statistics of each figure are first precomputed with
+    NumPy (histograms and box statistics on all rows, KDEs and scatter points on a
+    seeded sample of at most ``max_rows`` rows), and the resulting small, picklable
+    figure descriptions are rendered to PNG with Agg in worker processes. The figures
+    and the summary statistics are written to one self-contained HTML file.
+    """
+
+    def __init__(self, df: pd.DataFrame, rfm_data: pd.DataFrame = None, max_rows: int = 100_000,
+                 bins: int = 15, max_categories: int = 10, exclude_cols: list = None, seed: int = 0,
+                 title: str = 'Credit Risk Data Quality Report'):
+        """
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The transactions to analyze.
+        rfm_data : pd.DataFrame, optional
+            Per-customer RFM values (``CreditScoreRFM.rfm_data``), for the RFM plots.
+        max_rows : int, optional
+            Largest sample used for KDEs and scatter plots.
+        bins : int, optional
+            Histogram bins of the numeric distributions.
+        max_categories : int, optional
+            Categorical columns with more distinct values are not plotted.
+        exclude_cols : list, optional
+            Columns left out of the report. Defaults to ``ID_COLUMNS``.
+        seed : int, optional
+            Seed of the samples.
+        title : str, optional
+            Title of the HTML report.
+        """
+        self.df = df
+        self.rfm_data = rfm_data
+        self.max_rows = max_rows
+        self.bins = bins
+        self.max_categories = max_categories
+        self.exclude_cols = list(ID_COLUMNS if exclude_cols is None else exclude_cols)
+        self.seed = seed
+        self.title = title
+
+    def numeric_columns(self) -> list:
+        """Numeric columns of the data, other than the excluded ones."""
+        return [col for col in self.df.select_dtypes(include='number').columns if col not in self.exclude_cols]
+
+    def categorical_columns(self) -> list:
+        """Categorical columns with at most ``max_categories`` distinct values."""
+        columns = self.df.select_dtypes(include=['object', 'category']).columns
+        return [col for col in columns
+                if col not in self.exclude_cols and self.df[col].nunique() <= self.max_categories]
+
+    def figure_specs(self) -> list:
+        """
+        Returns
+        -------
+        list
+            ``(section, spec)`` pairs for every figure of the report, in report order.
+        """
+        numeric = self.numeric_columns()
+        specs = []
+        for i, col in enumerate(numeric):
+            specs.append(('Distribution of Numeric Variables', histogram_spec(
+                self._values(col), bins=self.bins, max_rows=self.max_rows, seed=self.seed,
+                title=f'Distribution of {col}', xlabel=col, color=PASTEL[i % len(PASTEL)])))
+        if numeric:
+            skewness = self.df[numeric].skew().sort_values(ascending=False)
+            specs.append(('Skewness', {'kind': 'bars', 'labels': skewness.index.tolist(),
+                                       'values': skewness.to_numpy(), 'fmt': '{:.2f}', 'zero_line': True,
+                                       'title': 'Skewness of Numerical Features', 'ylabel': 'Skewness',
+                                       'figsize': (10, 5)}))
+        for col in self.categorical_columns():
+            counts = self.df[col].value_counts(sort=False)
+            specs.append(('Categorical Feature Distributions', {
+                'kind': 'bars', 'labels': counts.index.tolist(), 'values': counts.to_numpy(),
+                'title': f'Distribution of {col}', 'ylabel': 'Frequency'}))
+        if len(numeric) > 1:
+            specs.append(('Correlation', self._heatmap_spec(self.df[numeric], 'Correlation Matrix', 'cool')))
+        for col in numeric:
+            specs.append(('Outliers', boxplot_spec(self._values(col), seed=self.seed,
+                                                   title=f'Boxplot of {col}', ylabel=col)))
+        specs.extend(('RFM', spec) for spec in self._rfm_specs())
+        return specs
+
+    def render(self, n_workers: int = None) -> list:
+        """
+        Renders every figure.
+
+        Returns
+        -------
+        list
+            ``(section, title, png_bytes)`` triples, in report order.
+        """
+        specs = self.figure_specs()
+        images = render_figures([spec for _, spec in specs], n_workers=n_workers)
+        return [(section, spec['title'], image) for (section, spec), image in zip(specs, images)]
+
+    def write(self, path: str, n_workers: int = None, figures_dir: str = None) -> str:
+        """
+        Renders the report to a single HTML file with embedded PNG figures.
+
+        Parameters
+        ----------
+        path : str
+            Output HTML file.
+        n_workers : int, optional
+            Worker processes rendering the figures. Defaults to the number of CPUs.
+        figures_dir : str, optional
+            If given, every figure is also saved there as a PNG file.
+
+        Returns
+        -------
+        str
+            The path of the report.
+        """
+        figures = self.render(n_workers=n_workers)
+        if figures_dir:
+            os.makedirs(figures_dir, exist_ok=True)
+            for index, (_, title, image) in enumerate(figures):
+                name = ''.join(c if c.isalnum() else '_' for c in title).strip('_').lower()
+                with open(os.path.join(figures_dir, f'{index:03d}_{name}.png'), 'wb') as f:
+                    f.write(image)
+
+        parts = [f'<h1>{html.escape(self.title)}</h1>',
+                 f'<p>{len(self.df)} rows, {self.df.shape[1]} columns.</p>']
+        numeric = self.numeric_columns()
+        if numeric:
+            summary = summarize_chunks([self.df[numeric]])
+            parts += ['<h2>Summary Statistics</h2>', summary.to_html(float_format=lambda x: f'{x:.4g}')]
+        section = None
+        for name, title, image in figures:
+            if name != section:
+                parts.append(f'<h2>{html.escape(name)}</h2>')
+                section = name
+            encoded = base64.b64encode(image).decode('ascii')
+            parts.append(f'<figure><img alt="{html.escape(title)}" src="data:image/png;base64,{encoded}">'
+                         f'</figure>')
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('<!DOCTYPE html>\n<html><head><meta charset="utf-8">'
+                    f'<title>{html.escape(self.title)}</title><style>{_STYLE}</style></head><body>\n')
+            f.write('\n'.join(parts))
+            f.write('\n</body></html>\n')
+        return path
+
+    def _values(self, col: str, df: pd.DataFrame = None) -> np.ndarray:
+        data = self.df if df is None else df
+        return data[col].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def _heatmap_spec(self, df: pd.DataFrame, title: str, cmap: str) -> dict:
+        corr = df.corr()
+        size = max(6, 0.6 * len(corr))
+        return {'kind': 'heatmap', 'matrix': corr.to_numpy(), 'labels': corr.columns.tolist(),
+                'title': title, 'cmap': cmap, 'figsize': (size + 2, size)}
+
+    def _rfm_specs(self) -> list:
+        if self.rfm_data is None:
+            return []
+        columns = [col for col in RFM_COLUMNS if col in self.rfm_data.columns]
+        if not columns:
+            return []
+        rfm = self.rfm_data[columns]
+        sample = rfm.iloc[downsample(np.arange(len(rfm)), self.max_rows, self.seed)]
+        histograms = {}
+        for col in columns:
+            values = self._values(col, rfm)
+            histograms[col] = np.histogram(values[~np.isnan(values)], bins=20)
+        specs = [{'kind': 'pairplot', 'columns': columns, 'title': 'Pair Plot of RFM Variables',
+                  'sample': {col: sample[col].to_numpy(dtype=np.float64, na_value=np.nan) for col in columns},
+                  'histograms': histograms, 'figsize': (9, 9)},
+                 self._heatmap_spec(rfm, 'Correlation Matrix of RFM Variables', 'viridis')]
+        for col, color in zip(columns, ['skyblue', 'lightgreen', 'lightcoral']):
+            specs.append(histogram_spec(self._values(col, rfm), bins=20, max_rows=self.max_rows, seed=self.seed,
+                                        title=f'{col} Distribution', xlabel=col, color=color, mean_median=False))
+        return specs
+
+
+_STYLE = ('body{font-family:sans-serif;margin:2em}figure{display:inline-block;margin:0.5em}'
+          'img{max-width:640px}table{border-collapse:collapse;font-size:0.85em}'
+          'td,th{border:1px solid #ccc;padding:2px 6px;text-align:right}')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render the EDA plots of a transactions CSV to a single HTML report, headless, "
+                    "with figures drawn in parallel worker processes.")
+    parser.add_argument('data_path', help="Xente-format CSV of transactions.")
+    parser.add_argument('--output', default='reports/eda_report.html', help="Where to write the HTML report.")
+    parser.add_argument('--rfm', help="Per-customer RFM scores (.csv or .parquet) for the RFM plots.")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: number of CPUs).")
+    parser.add_argument('--max-rows', type=int, default=100_000,
+                        help="Largest sample used for KDEs and scatter plots.")
+    parser.add_argument('--figures-dir', help="Also save every figure as a PNG file in this directory.")
+    args = parser.parse_args()
+
+    df = pd.concat(iter_data_chunks(args.data_path), ignore_index=True)
+    rfm_data = None
+    if args.rfm:
+        rfm_data = pd.read_parquet(args.rfm) if args.rfm.endswith('.parquet') else pd.read_csv(args.rfm)
+    report = EDAReport(df, rfm_data=rfm_data, max_rows=args.max_rows)
+    path = report.write(args.output, n_workers=args.workers, figures_dir=args.figures_dir)
+    print(f"EDA report written to '{path}'.")
+
+
+if __name__ == '__main__':
+    main()
@@ -24,8 +24,37 @@ class FeatureEngineering:
 
     normalize_numerical_features(df: pd.DataFrame, numerical_cols: list, method: str = 'standardize') -> pd.DataFrame
         Normalizes or standardizes numerical features.
+
+    create_customer_features(df: pd.DataFrame) -> pd.DataFrame
+        Creates the aggregate and transaction-based features in a single vectorized pass.
+
+    customer_aggregates(df: pd.DataFrame, features: list) -> tuple
+        Computes per-customer features and partial reductions as arrays over factorized
+        CustomerId codes.
     """
 
+    # Per-customer features added by create_aggregate_features and create_transaction_features
+    AGGREGATE_FEATURES = [
+        'Total_Transaction_Amount',
+        'Average_Transaction_Amount',
+        'Transaction_Count',
+        'Std_Transaction_Amount',
+    ]
+    TRANSACTION_FEATURES = [
+        'Net_Transaction_Amount',
+        'Debit_Count',
+        'Credit_Count',
+        'Debit_Credit_Ratio',
+    ]
+    # Partial reductions customer_aggregates also computes, for callers that combine
+    # batches: the number of non-missing amounts, their sum of squared deviations from the
+    # customer mean, and the latest TransactionStartTime
+    PARTIAL_AGGREGATES = [
+        'Amount_Count',
+        'Amount_M2',
+        'Last_Access_Date',
+    ]
+
     @staticmethod
     def create_aggregate_features(df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -41,16 +70,7 @@ class FeatureEngineering:
         pd.DataFrame
             The original DataFrame with added aggregate features for each customer.
         """
-        agg_features = df.groupby('CustomerId').agg(
-            Total_Transaction_Amount=('Amount', 'sum'),
-            Average_Transaction_Amount=('Amount', 'mean'),
-            Transaction_Count=('TransactionId', 'count'),
-            Std_Transaction_Amount=('Amount', 'std')
-        ).reset_index()
-        
-        # Merge aggregate features with the original DataFrame on CustomerId
-        df = df.merge(agg_features, on='CustomerId', how='left')
-        return df
+        return FeatureEngineering._add_customer_features(df, FeatureEngineering.AGGREGATE_FEATURES)
 
 
     @staticmethod
@@ -68,23 +88,139 @@ class FeatureEngineering:
         pd.DataFrame
             The DataFrame with new transaction-based features.
         """
-        # Group by 'CustomerId' to calculate net transaction amount
-        transaction_features = df.groupby('CustomerId').agg(
-            Net_Transaction_Amount=('Amount', 'sum'),
-            Debit_Count=('Amount', lambda x: (x > 0).sum()),
-            Credit_Count=('Amount', lambda x: (x < 0).sum())
-        ).reset_index()
+        return FeatureEngineering._add_customer_features(df, FeatureEngineering.TRANSACTION_FEATURES)
 
-        # Calculate the debit/credit ratio and handle division by zero
-        transaction_features['Debit_Credit_Ratio'] = transaction_features['Debit_Count'] / (
-            transaction_features['Credit_Count'] + 1)  # Adding 1 to avoid division by zero
+    @staticmethod
+    def create_customer_features(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Creates the aggregate and transaction-based features in a single pass.
 
-        # Merge the new features back to the original DataFrame on 'CustomerId'
-        df = pd.merge(df, transaction_features, on='CustomerId', how='left')
+        Equivalent to ``create_transaction_features(create_aggregate_features(df))``, but the
+        customer ids are factorized once and all per-customer reductions share that pass.
 
-        return df
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The DataFrame containing transaction data.
 
+        Returns
+        -------
+        pd.DataFrame
+            The DataFrame with aggregate and transaction-based features for each customer.
+        """
+        return FeatureEngineering._add_customer_features(
+            df, FeatureEngineering.AGGREGATE_FEATURES + FeatureEngineering.TRANSACTION_FEATURES)
+
+    @staticmethod
+    def customer_aggregates(df: pd.DataFrame, features: list) -> tuple:
+        """
+        Computes per-customer features with NumPy reductions over factorized CustomerId codes.
 
+        This is the single implementation of the per-customer reductions: the feature
+        engineering stages, ``FeaturePipeline``, ``RFMAccumulator`` and
+        ``CustomerFeatureStore`` all build on it.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The DataFrame containing transaction data. ``Amount`` is only read for amount
+            features and ``TransactionStartTime`` only for 'Last_Access_Date'.
+        features : list
+            Names from ``AGGREGATE_FEATURES``, ``TRANSACTION_FEATURES`` and
+            ``PARTIAL_AGGREGATES`` to compute.
+
+        Returns
+        -------
+        tuple
+            The row codes (-1 for a missing CustomerId), the customer ids in first-seen
+            order and a dict of per-customer arrays. 'Last_Access_Date' is a UTC
+            datetime64[ns] array, NaT for customers without a timestamp.
+        """
+        codes, uniques = pd.factorize(df['CustomerId'])
+        n_groups = len(uniques)
+        valid = codes >= 0
+        group_codes = codes[valid]
+
+        def group_sum(weights):
+            return np.bincount(group_codes, weights=weights, minlength=n_groups)
+
+        def group_count(mask):
+            return np.bincount(group_codes[mask], minlength=n_groups).astype(np.int64)
+
+        stats = {}
+        if 'Transaction_Count' in features:
+            stats['Transaction_Count'] = group_count(df['TransactionId'].notna().to_numpy()[valid])
+        if 'Last_Access_Date' in features:
+            timestamps = pd.to_datetime(df['TransactionStartTime'], utc=True)
+            timestamps = timestamps.to_numpy(dtype='datetime64[ns]').view(np.int64)[valid]
+            # NaT is the smallest int64, so it never wins the maximum
+            last_seen = np.full(n_groups, np.iinfo(np.int64).min, dtype=np.int64)
+            np.maximum.at(last_seen, group_codes, timestamps)
+            stats['Last_Access_Date'] = last_seen.view('datetime64[ns]')
+
+        amount_features = [name for name in features if name not in stats]
+        if not amount_features:
+            return codes, uniques, {name: stats[name] for name in features}
+
+        amount = df['Amount'].to_numpy(dtype=np.float64, na_value=np.nan)[valid]
+        has_amount = ~np.isnan(amount)
+        amount_filled = np.where(has_amount, amount, 0.0)
+        amount_sum = group_sum(amount_filled)
+        if 'Total_Transaction_Amount' in features:
+            stats['Total_Transaction_Amount'] = amount_sum
+        if 'Net_Transaction_Amount' in features:
+            stats['Net_Transaction_Amount'] = amount_sum
+        moments = ['Average_Transaction_Amount', 'Std_Transaction_Amount', 'Amount_Count', 'Amount_M2']
+        if any(name in features for name in moments):
+            amount_count = group_count(has_amount)
+            stats['Amount_Count'] = amount_count
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = amount_sum / amount_count
+                if 'Std_Transaction_Amount' in features or 'Amount_M2' in features:
+                    # Two-pass variance: squared deviations from each customer's mean
+                    deviation = np.where(has_amount, amount_filled - mean[group_codes], 0.0)
+                    m2 = group_sum(deviation * deviation)
+                    stats['Amount_M2'] = m2
+                    stats['Std_Transaction_Amount'] = np.where(
+                        amount_count > 1, np.sqrt(m2 / (amount_count - 1)), np.nan)
+            stats['Average_Transaction_Amount'] = mean
+        if 'Debit_Count' in features or 'Debit_Credit_Ratio' in features:
+            stats['Debit_Count'] = group_count(amount_filled > 0)
+        if 'Credit_Count' in features or 'Debit_Credit_Ratio' in features:
+            stats['Credit_Count'] = group_count(amount_filled < 0)
+        if 'Debit_Credit_Ratio' in features:
+            # Adding 1 to avoid division by zero
+            stats['Debit_Credit_Ratio'] = stats['Debit_Count'] / (stats['Credit_Count'] + 1)
+
+        return codes, uniques, {name: stats[name] for name in features}
+
+    @staticmethod
+    def _add_customer_features(df: pd.DataFrame, features: list) -> pd.DataFrame:
+        """
+        Adds per-customer features to every transaction row, like a left merge on CustomerId.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The DataFrame containing transaction data.
+        features : list
+            Names of the customer features to add, in column order.
+
+        Returns
+        -------
+        pd.DataFrame
+            A copy of the DataFrame with a fresh RangeIndex and the new feature columns.
+        """
+        codes, _, stats = FeatureEngineering.customer_aggregates(df, features)
+        missing = codes < 0
+        new_columns = {}
+        for name, values in stats.items():
+            column = values[np.where(missing, 0, codes)] if len(values) else np.empty(len(codes), values.dtype)
+            if missing.any():
+                column = np.where(missing, np.nan, column)
+            new_columns[name] = column
+        new_features = pd.DataFrame(new_columns, columns=features)
+        return pd.concat([df.reset_index(drop=True), new_features], axis=1)
 
     @staticmethod
     def extract_time_features(df: pd.DataFrame) -> pd.DataFrame:
@@ -186,4 +322,77 @@ class FeatureEngineering:
         # Set the TransactionId to index 
         df.set_index('TransactionId', inplace=True)
         
-        return df
\ No newline at end of file
+        return df
+
+class CustomerSlots:
+    """
+    Per-customer state arrays indexed by a dense slot per CustomerId.
+
+    A dict maps each customer id to its slot, in first-seen order, and the arrays grow
+    geometrically, so adding the customers of a batch costs time proportional to the
+    batch rather than to the state. Used by ``RFMAccumulator`` and ``CustomerFeatureStore``
+    to combine the per-batch output of ``FeatureEngineering.customer_aggregates``.
+
+    Attributes
+    ----------
+    customer_ids : list
+        Customer ids in slot order.
+    arrays : dict
+        One array per field, with at least ``len(self)`` entries; entries beyond that
+        hold the field's fill value.
+    """
+
+    def __init__(self, fields: dict, initial_capacity: int = 1024):
+        """
+        Parameters
+        ----------
+        fields : dict
+            Maps each field name to its ``(dtype, fill_value)``.
+        initial_capacity : int, optional
+            Number of slots allocated up front.
+        """
+        self.fields = dict(fields)
+        self.customer_ids = []
+        self._index = {}
+        capacity = max(int(initial_capacity), 1)
+        self.arrays = {name: np.full(capacity, fill, dtype=dtype)
+                       for name, (dtype, fill) in self.fields.items()}
+
+    def __len__(self) -> int:
+        return len(self.customer_ids)
+
+    def __contains__(self, customer_id) -> bool:
+        return customer_id in self._index
+
+    def find(self, customer_ids) -> np.ndarray:
+        """Returns the slot of each customer id, or -1 for unknown customers."""
+        return np.fromiter((self._index.get(customer_id, -1) for customer_id in customer_ids),
+                           dtype=np.int64, count=len(customer_ids))
+
+    def slots_for(self, customer_ids) -> np.ndarray:
+        """Returns the slot of each customer id, allocating slots for new customers."""
+        slots = np.empty(len(customer_ids), dtype=np.int64)
+        for i, customer_id in enumerate(customer_ids):
+            slot = self._index.get(customer_id)
+            if slot is None:
+                slot = len(self.customer_ids)
+                self._index[customer_id] = slot
+                self.customer_ids.append(customer_id)
+            slots[i] = slot
+        self._reserve(len(self.customer_ids))
+        return slots
+
+    def view(self, name: str) -> np.ndarray:
+        """Returns the used part of a field's array, without copying."""
+        return self.arrays[name][:len(self)]
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(next(iter(self.arrays.values()))) if self.arrays else size
+        if size <= capacity:
+            return
+        new_capacity = max(size, capacity * 2)
+        for name, array in self.arrays.items():
+            dtype, fill = self.fields[name]
+            grown = np.full(new_capacity, fill, dtype=dtype)
+            grown[:capacity] = array
+            self.arrays[name] = grown
@@ -0,0 +1,245 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from scripts.feature_engineering import FeatureEngineering
+
+
+class FeaturePipeline:
+    """
+    A compiled, single-pass version of the serving feature chain.
+
+    The API used to run ``create_aggregate_features``, ``create_transaction_features``,
+    ``extract_time_features``, ``encode_categorical_features``, ``normalize_numerical_features``
+    and ``CreditScoreRFM.calculate_rfm`` followed by a merge, copying the frame at every stage.
+    ``FeaturePipeline`` plans, once, how each of the ``required_features`` is produced and then
+    computes only those columns: CustomerId is factorized once and shared by every per-customer
+    reduction (aggregates and RFM), no intermediate DataFrames are merged, and each feature is
+    written straight into a pre-allocated C-contiguous float64 matrix in model column order.
+
+    Scaling follows the fitted ``FeaturePreprocessor`` when one is given; otherwise, like the
+    original chain, columns are label-encoded and standardized over the batch itself. With a
+    ``CustomerFeatureStore``, per-customer and RFM features are read from the store instead;
+    without a preprocessor they are then left unscaled, as standardizing full-history values
+    over a small request batch would erase them (a single row always scales to 0).
+
+    Methods
+    -------
+    transform(df: pd.DataFrame) -> np.ndarray
+        Computes the model input matrix for a batch of raw transactions.
+
+    transform_frame(df: pd.DataFrame) -> pd.DataFrame
+        Same as ``transform``, wrapped in a DataFrame with the required column names.
+    """
+
+    CATEGORICAL_COLS = ['ProductCategory', 'ChannelId']
+    CUSTOMER_FEATURES = FeatureEngineering.AGGREGATE_FEATURES + FeatureEngineering.TRANSACTION_FEATURES
+    TIME_FEATURES = {
+        'Transaction_Hour': 'hour',
+        'Transaction_Day': 'day',
+        'Transaction_Month': 'month',
+        'Transaction_Year': 'year',
+    }
+    # RFM features and the customer aggregate each one equals
+    RFM_FEATURES = {
+        'Frequency': 'Transaction_Count',
+        'Monetary': 'Total_Transaction_Amount',
+        'Recency': None,
+    }
+    # Numeric columns the original chain leaves unscaled
+    UNSCALED_COLS = ['Amount', 'TransactionId']
+    # Raw transaction columns of a serving request (the API's InputData fields)
+    INPUT_COLUMNS = ['TransactionId', 'CustomerId', 'ProductCategory', 'ChannelId', 'Amount',
+                     'TransactionStartTime', 'PricingStrategy']
+
+    def __init__(self, required_features: list, preprocessor=None, feature_store=None):
+        """
+        Parameters
+        ----------
+        required_features : list
+            Model input columns, in training order.
+        preprocessor : FeaturePreprocessor, optional
+            Fitted encoders and scaling parameters. When omitted, each batch is encoded and
+            standardized on its own, like the original chain.
+        feature_store : CustomerFeatureStore, optional
+            Store providing full-history customer and RFM features. When given, ``transform``
+            also records the batch in the store.
+        """
+        self.required_features = list(required_features)
+        self.preprocessor = preprocessor
+        self.feature_store = feature_store
+        self.plan = [self._plan_feature(name) for name in self.required_features]
+
+        # Per-customer reductions needed by the plan, computed together over one factorization
+        aggregates = []
+        for name, source, _ in self.plan:
+            if source == 'customer':
+                aggregates.append(name)
+            elif source == 'rfm' and self.RFM_FEATURES[name] is not None:
+                aggregates.append(self.RFM_FEATURES[name])
+        self.customer_aggregates = list(dict.fromkeys(aggregates))
+        self.needs_recency = any(name == 'Recency' for name, _, _ in self.plan)
+
+    @classmethod
+    def feature_source(cls, name: str) -> str:
+        """How a feature is produced: 'customer', 'rfm', 'time', 'categorical' or 'raw'."""
+        if name in cls.CUSTOMER_FEATURES:
+            return 'customer'
+        if name in cls.RFM_FEATURES:
+            return 'rfm'
+        if name in cls.TIME_FEATURES:
+            return 'time'
+        if name in cls.CATEGORICAL_COLS:
+            return 'categorical'
+        return 'raw'
+
+    @classmethod
+    def can_compute(cls, name: str, input_columns: list = None) -> bool:
+        """
+        Whether a feature is derived by the pipeline or copied from an input column.
+
+        Parameters
+        ----------
+        name : str
+            Feature name.
+        input_columns : list, optional
+            Raw columns of the transactions passed to ``transform``. Defaults to
+            ``INPUT_COLUMNS``.
+        """
+        input_columns = cls.INPUT_COLUMNS if input_columns is None else input_columns
+        return cls.feature_source(name) != 'raw' or name in input_columns
+
+    def _plan_feature(self, name: str) -> tuple:
+        source = self.feature_source(name)
+
+        # RFM features are computed after scaling in the original chain
+        if source == 'rfm':
+            scaled = False
+        elif source == 'customer' and self.preprocessor is None and self.feature_store is not None:
+            scaled = False
+        elif self.preprocessor is not None:
+            scaled = name in self.preprocessor.numeric_cols_
+        else:
+            scaled = name not in self.UNSCALED_COLS
+        return name, source, scaled
+
+    def transform(self, df: pd.DataFrame, end_date: pd.Timestamp = None, timings: dict = None) -> np.ndarray:
+        """
+        Computes the model input matrix for a batch of raw transactions.
+
+        Features that cannot be computed from ``df`` are filled with 0, like the original
+        ``reindex(columns=required_features, fill_value=0)``; use ``can_compute`` to check
+        a feature list before serving it.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Raw transactions with the API ``InputData`` columns.
+        end_date : pd.Timestamp, optional
+            Reference time for Recency. Defaults to the current UTC time.
+        timings : dict, optional
+            When given, receives the seconds spent in the 'customer' stage (per-customer
+            aggregates and RFM, or the feature store) and the 'columns' stage (time,
+            categorical and raw features, and scaling).
+
+        Returns
+        -------
+        np.ndarray
+            C-contiguous float64 array of shape ``(len(df), len(required_features))``.
+        """
+        n_rows = len(df)
+        out = np.empty((n_rows, len(self.required_features)), dtype=np.float64)
+        if n_rows == 0:
+            return out
+        if end_date is None:
+            end_date = pd.Timestamp.utcnow()
+
+        start = time.perf_counter()
+        customer = self._customer_features(df, end_date)
+        customer_done = time.perf_counter()
+        timestamps = None
+        for j, (name, source, scaled) in enumerate(self.plan):
+            if source in ('customer', 'rfm'):
+                values = customer[name]
+            elif source == 'time':
+                if timestamps is None:
+                    timestamps = pd.to_datetime(df['TransactionStartTime'])
+                values = getattr(timestamps.dt, self.TIME_FEATURES[name]).to_numpy()
+            elif name not in df.columns:
+                out[:, j] = 0.0
+                continue
+            elif source == 'categorical':
+                values = self._encode(name, df[name])
+            else:
+                values = df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+
+            out[:, j] = values
+            if scaled:
+                self._scale(name, out[:, j])
+
+        if timings is not None:
+            timings['customer'] = customer_done - start
+            timings['columns'] = time.perf_counter() - customer_done
+        return out
+
+    def transform_frame(self, df: pd.DataFrame, end_date: pd.Timestamp = None,
+                        timings: dict = None) -> pd.DataFrame:
+        """
+        Same as ``transform``, wrapped (without copying) in a DataFrame with the required columns.
+        """
+        return pd.DataFrame(self.transform(df, end_date, timings), columns=self.required_features, copy=False)
+
+    def _customer_features(self, df: pd.DataFrame, end_date: pd.Timestamp) -> dict:
+        names = [name for name, source, _ in self.plan if source in ('customer', 'rfm')]
+        if not names:
+            return {}
+
+        if self.feature_store is not None:
+            self.feature_store.update(df)
+            looked_up = self.feature_store.lookup(df['CustomerId'].tolist(), end_date=end_date)
+            return {name: looked_up[name].to_numpy(dtype=np.float64, na_value=np.nan) for name in names}
+
+        aggregates = self.customer_aggregates + ['Last_Access_Date'] * self.needs_recency
+        codes, _, stats = FeatureEngineering.customer_aggregates(df, aggregates)
+        missing = codes < 0
+        take = np.where(missing, 0, codes)
+
+        def broadcast(values):
+            column = values[take].astype(np.float64) if len(values) else np.full(len(codes), np.nan)
+            return np.where(missing, np.nan, column) if missing.any() else column
+
+        features = {}
+        for name in names:
+            if name != 'Recency':
+                features[name] = broadcast(stats[self.RFM_FEATURES.get(name, name)])
+
+        if self.needs_recency:
+            end_date = pd.Timestamp(end_date)
+            if end_date.tzinfo is None:
+                end_date = end_date.tz_localize('UTC')
+            last_access = pd.to_datetime(stats['Last_Access_Date'], utc=True)
+            features['Recency'] = broadcast((end_date - last_access).days.to_numpy(dtype=np.float64))
+        return features
+
+    def _encode(self, name: str, values: pd.Series) -> np.ndarray:
+        if self.preprocessor is not None and name in self.preprocessor.categories_:
+            return self.preprocessor.encode(name, values)
+        # Same codes as LabelEncoder fitted on the batch
+        _, codes = np.unique(values.astype(str).to_numpy(), return_inverse=True)
+        return codes
+
+    def _scale(self, name: str, column: np.ndarray) -> None:
+        if self.preprocessor is not None:
+            j = self.preprocessor.numeric_cols_.index(name)
+            column -= self.preprocessor.offset_[j]
+            column /= self.preprocessor.scale_[j]
+            return
+        # Standardize over the batch, like StandardScaler.fit_transform
+        if np.isnan(column).all():
+            return
+        mean = np.nanmean(column)
+        std = np.nanstd(column)
+        column -= mean
+        if std > 0:
+            column /= std
@@ -0,0 +1,330 @@
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from scripts.cache import read_table
+from scripts.credit_scoring_model import WoEBinner
+from scripts.feature_pipeline import FeaturePipeline
+from scripts.train_model import BAD_LABEL, build_training_frame
+
+# Identifier columns that are never candidate features
+ID_COLUMNS = ['CustomerId', 'TransactionId']
+
+# Per-customer RFM values joined to the transaction features as candidates
+RFM_FEATURES = ['Recency', 'Frequency', 'Monetary']
+
+
+class TargetCorrelation:
+    """
+    Streaming Pearson correlation of every feature with one target column.
+
+    Only the p feature-target pairs are accumulated, instead of the p x p matrix of
+    ``DataFrame.corr()``: per column the count, the two means, the two sums of squared
+    deviations and the co-moment. Each chunk costs one vectorized O(n·p) pass, and
+    chunks (or accumulators of disjoint partitions) are combined with the pairwise update
+    of Chan et al., so the result does not lose precision on large or shifted data.
+
+    Like ``DataFrame.corr()``, a row only counts for a feature when both the feature
+    and the target are present, and constant columns have a NaN correlation.
+    """
+
+    def __init__(self):
+        self.columns = None
+
+    def update(self, X: pd.DataFrame, y) -> "TargetCorrelation":
+        """
+        Adds a chunk of rows.
+
+        Parameters
+        ----------
+        X : pd.DataFrame
+            Numeric feature columns, the same in every chunk.
+        y : array-like
+            Numeric target of the same rows.
+
+        Returns
+        -------
+        TargetCorrelation
+            The updated accumulator.
+        """
+        values = X.to_numpy(dtype=np.float64, na_value=np.nan)
+        target = np.asarray(y, dtype=np.float64)[:, None]
+        valid = ~np.isnan(values) & ~np.isnan(target)
+        count = valid.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_x = np.where(valid, values, 0.0).sum(axis=0) / count
+            mean_y = np.where(valid, target, 0.0).sum(axis=0) / count
+        dx = np.where(valid, values - mean_x, 0.0)
+        dy = np.where(valid, target - mean_y, 0.0)
+        moments = np.array([count, np.nan_to_num(mean_x), np.nan_to_num(mean_y),
+                             (dx * dx).sum(axis=0), (dy * dy).sum(axis=0), (dx * dy).sum(axis=0)])
+        self._combine(list(X.columns), moments)
+        return self
+
+    def merge(self, other: "TargetCorrelation") -> "TargetCorrelation":
+        """Combines the accumulated rows of another accumulator over the same columns."""
+        if other.columns is not None:
+            self._combine(other.columns, other.moments)
+        return self
+
+    def correlations(self) -> pd.Series:
+        """
+        Returns
+        -------
+        pd.Series
+            Correlation of each feature with the target, in column order.
+        """
+        if self.columns is None:
+            return pd.Series(dtype=np.float64)
+        _, _, _, m2_x, m2_y, co_moment = self.moments
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = co_moment / np.sqrt(m2_x * m2_y)
+        corr[~((m2_x > 0) & (m2_y > 0))] = np.nan
+        return pd.Series(np.clip(corr, -1.0, 1.0), index=self.columns)
+
+    def _combine(self, columns: list, moments: np.ndarray) -> None:
+        if self.columns is None:
+            self.columns, self.moments = columns, moments
+            return
+        if columns != self.columns:
+            raise ValueError(f"Chunks have different columns: {self.columns} and {columns}")
+        count_a, mean_xa, mean_ya, m2_xa, m2_ya, co_a = self.moments
+        count_b, mean_xb, mean_yb, m2_xb, m2_yb, co_b = moments
+        count = count_a + count_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(count > 0, count_a * count_b / count, 0.0)
+            share = np.where(count > 0, count_b / count, 0.0)
+        delta_x, delta_y = mean_xb - mean_xa, mean_yb - mean_ya
+        self.moments = np.array([
+            count, mean_xa + delta_x * share, mean_ya + delta_y * share,
+            m2_xa + m2_xb + delta_x * delta_x * weight,
+            m2_ya + m2_yb + delta_y * delta_y * weight,
+            co_a + co_b + delta_x * delta_y * weight,
+        ])
+
+
+class FeatureSelector:
+    """
+    Selects the model features by their correlation with the risk label.
+
+    This is the selection of the model preparation notebook, ``abs(corr) > threshold``
+    against ``Risk_Label``, without computing the full correlation matrix: only target
+    correlations are accumulated, with ``TargetCorrelation``, so data can also be passed
+    in chunks. Optionally, the Information Value of every feature is computed from its
+    WoE bins (``WoEBinner``) and features must also reach ``min_iv``.
+
+    Selected features keep the order of the input columns.
+
+    Attributes
+    ----------
+    correlations_ : pd.Series
+        Correlation of each candidate feature with the target.
+    information_value_ : pd.Series or None
+        IV of each candidate feature, when computed.
+    selected_features_ : list
+        The selected features.
+    """
+
+    def __init__(self, target: str = 'Risk_Label', threshold: float = 0.1, min_iv: float = None,
+                 compute_iv: bool = False, exclude_cols: list = None):
+        """
+        Parameters
+        ----------
+        target : str, optional
+            Label column: 'Good'/'Bad' strings or a numeric 0/1 target.
+        threshold : float, optional
+            Features are kept when their absolute correlation exceeds it.
+        min_iv : float, optional
+            If given, features must also have at least this Information Value.
+        compute_iv : bool, optional
+            Compute the IV even without ``min_iv``, to report it.
+        exclude_cols : list, optional
+            Numeric columns that are not candidates. Defaults to ``ID_COLUMNS``.
+        """
+        self.target = target
+        self.threshold = threshold
+        self.min_iv = min_iv
+        self.compute_iv = compute_iv
+        self.exclude_cols = list(ID_COLUMNS if exclude_cols is None else exclude_cols)
+
+    def fit(self, df: pd.DataFrame) -> "FeatureSelector":
+        """
+        Selects features from an in-memory frame of candidates and the target.
+
+        Returns
+        -------
+        FeatureSelector
+            The fitted selector.
+        """
+        return self.fit_chunks([df])
+
+    def fit_chunks(self, chunks) -> "FeatureSelector":
+        """
+        Selects features from an iterable of frames, accumulating correlations chunk by chunk.
+
+        The Information Value needs quantile bins over all rows, so with ``min_iv`` or
+        ``compute_iv`` the chunks are also kept in memory.
+
+        Returns
+        -------
+        FeatureSelector
+            The fitted selector.
+        """
+        accumulator = TargetCorrelation()
+        kept = []
+        for chunk in chunks:
+            columns = self.candidate_columns(chunk)
+            accumulator.update(chunk[columns], self.encode_target(chunk[self.target]))
+            if self._needs_iv():
+                kept.append(chunk[columns + [self.target]])
+        self.correlations_ = accumulator.correlations()
+        self.information_value_ = None
+        if self._needs_iv() and kept:
+            self.information_value_ = self.information_value(pd.concat(kept, ignore_index=True))
+
+        selected = self.correlations_.abs() > self.threshold
+        if self.min_iv is not None:
+            selected &= self.information_value_.reindex(self.correlations_.index) >= self.min_iv
+        self.selected_features_ = self.correlations_.index[selected.to_numpy()].tolist()
+        return self
+
+    def candidate_columns(self, df: pd.DataFrame) -> list:
+        """Numeric columns of ``df`` other than the target and the excluded columns."""
+        numeric = df.select_dtypes(include='number').columns
+        return [col for col in numeric if col != self.target and col not in self.exclude_cols]
+
+    def encode_target(self, target: pd.Series) -> np.ndarray:
+        """Maps the label to 1 for bad and 0 for good; numeric targets are used as they are."""
+        if pd.api.types.is_numeric_dtype(target):
+            return target.to_numpy(dtype=np.float64, na_value=np.nan)
+        return np.where(target.isna(), np.nan, (target == BAD_LABEL).astype(np.float64))
+
+    def information_value(self, df: pd.DataFrame) -> pd.Series:
+        """IV of every candidate column, from the WoE of its quantile bins."""
+        columns = self.candidate_columns(df)
+        encoded = self.encode_target(df[self.target])
+        labels = np.where(np.isnan(encoded), None, np.where(encoded == 1, 'Bad', 'Good'))
+        binner = WoEBinner(columns).fit(df[columns].assign(Risk_Label=labels))
+        return binner.information_value().reindex(columns)
+
+    def to_dict(self) -> dict:
+        """The selection and the statistics it was based on, as stored by ``save``."""
+        def finite(series):
+            return {name: (float(value) if np.isfinite(value) else None) for name, value in series.items()}
+
+        return {
+            'features': self.selected_features_,
+            'target': self.target,
+            'threshold': self.threshold,
+            'min_iv': self.min_iv,
+            'correlations': finite(self.correlations_),
+            'information_value': None if self.information_value_ is None else finite(self.information_value_),
+        }
+
+    def save(self, path: str, **extra) -> None:
+        """
+        Writes the selected features and their statistics to a JSON file.
+
+        Parameters
+        ----------
+        path : str
+            Output file, e.g. ``api/model/selected_features.json``.
+        **extra
+            Additional fields to store, e.g. a digest of the input data.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({**self.to_dict(), **extra}, f, indent=2)
+            f.write('\n')
+
+    def _needs_iv(self) -> bool:
+        return self.compute_iv or self.min_iv is not None
+
+
+def load_selected_features(path: str) -> list:
+    """
+    Reads the feature list written by ``FeatureSelector.save``.
+
+    Raises
+    ------
+    ValueError
+        If the file does not list any feature.
+    """
+    with open(path) as f:
+        features = json.load(f).get('features')
+    if not features:
+        raise ValueError(f"No selected features in '{path}'.")
+    return list(features)
+
+
+def serving_candidates(features_df: pd.DataFrame, rfm_data: pd.DataFrame, selector: FeatureSelector) -> list:
+    """
+    Candidate features that the API can compute for a single transaction.
+
+    These are the numeric transaction features and the customer's RFM values, as in the
+    notebook, limited to the features ``FeaturePipeline`` derives from the serving input.
+    Columns such as FraudResult or Value are not part of a scoring request, so a model
+    trained on them could not be served.
+    """
+    candidates = selector.candidate_columns(features_df)
+    candidates += [col for col in RFM_FEATURES if col in rfm_data.columns and col not in candidates]
+    return [col for col in candidates if FeaturePipeline.can_compute(col)]
+
+
+def data_digest(df: pd.DataFrame) -> str:
+    """SHA-256 of the values and index of a frame, to tell whether a selection is up to date."""
+    return hashlib.sha256(pd.util.hash_pandas_object(df).to_numpy().tobytes()).hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Select the model features by their correlation with Risk_Label (and optionally "
+                    "their Information Value) and save the list used by the API.")
+    parser.add_argument('features_path', help="Transaction-level features (extracted_features.csv or .parquet).")
+    parser.add_argument('rfm_path', help="Per-customer RFM scores with Risk_Label (.csv or .parquet).")
+    parser.add_argument('--output', default='api/model/selected_features.json',
+                        help="Where to save the selected features.")
+    parser.add_argument('--threshold', type=float, default=0.1, help="Minimum absolute correlation.")
+    parser.add_argument('--min-iv', type=float, help="Also require this Information Value.")
+    parser.add_argument('--iv', action='store_true', help="Report the Information Value of every feature.")
+    parser.add_argument('--data-cache-dir',
+                        help="Columnar cache of the CSV inputs, e.g. data/cache (default: no cache).")
+    parser.add_argument('--force', action='store_true',
+                        help="Recompute even if the output was computed from the same data and settings.")
+    args = parser.parse_args()
+
+    def read(path):
+        return read_table(path, cache_dir=args.data_cache_dir)
+
+    features_df, rfm_data = read(args.features_path), read(args.rfm_path)
+    selector = FeatureSelector(threshold=args.threshold, min_iv=args.min_iv, compute_iv=args.iv)
+    # The quartiles and RFM_Score define the label and are left out
+    candidates = serving_candidates(features_df, rfm_data, selector)
+    X, y = build_training_frame(features_df, rfm_data, features=candidates)
+    data = X.assign(Risk_Label=y)
+
+    digest = data_digest(data)
+    settings = {'threshold': args.threshold, 'min_iv': args.min_iv}
+    if not args.force and os.path.exists(args.output):
+        with open(args.output) as f:
+            previous = json.load(f)
+        if previous.get('data_sha256') == digest and all(previous.get(k) == v for k, v in settings.items()) \
+                and (previous.get('information_value') is not None or not args.iv):
+            print(f"Selection in '{args.output}' is up to date: {previous['features']}")
+            return
+
+    selector.fit(data)
+    selector.save(args.output, data_sha256=digest)
+    for name, corr in selector.correlations_.abs().sort_values(ascending=False).items():
+        marker = '*' if name in selector.selected_features_ else ' '
+        iv = '' if selector.information_value_ is None else f"  IV={selector.information_value_[name]:.4f}"
+        print(f"{marker} {name:<28} |corr|={corr:.4f}{iv}")
+    print(f"{len(selector.selected_features_)} features saved to '{args.output}'.")
+
+
+if __name__ == '__main__':
+    main()
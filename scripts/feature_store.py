@@ -0,0 +1,295 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from scripts.feature_engineering import CustomerSlots, FeatureEngineering
+
+
+class CustomerFeatureStore:
+    """
+    An in-process store of running per-customer transaction aggregates.
+
+    Each customer owns one slot in a set of NumPy arrays; a dict maps ``CustomerId`` to its
+    slot, so reading a customer's features is an O(1) lookup instead of a ``groupby`` over
+    their history. ``update`` reduces new transactions with
+    ``FeatureEngineering.customer_aggregates`` and folds them into the running totals
+    (counts, sums, mean and sum of squared deviations of ``Amount``, debit/credit counts
+    and last-seen time), and ``lookup`` returns the same columns produced by
+    ``FeatureEngineering.create_aggregate_features``, ``create_transaction_features`` and
+    ``CreditScoreRFM.calculate_rfm`` over the full history.
+
+    Updates are idempotent within a window: the ids of the last ``dedup_window`` folded
+    transactions are remembered, and a transaction whose ``TransactionId`` is among them
+    (client retries, or requests replayed after a failure) is skipped instead of being
+    counted again. Older ids are forgotten, in memory and in the backing file, so memory
+    and startup time stay bounded; a replay older than the window is counted again.
+
+    The store can optionally be backed by a SQLite file so aggregates survive restarts;
+    modified customers and new transaction ids are written back by ``flush``.
+
+    Methods
+    -------
+    update(df: pd.DataFrame) -> None
+        Folds a batch of transactions into the running aggregates.
+
+    lookup(customer_ids, end_date=None) -> pd.DataFrame
+        Returns the current features for each customer id, in input order.
+
+    flush() -> None
+        Writes modified customers to the SQLite backing file, if any.
+    """
+
+    FEATURE_COLUMNS = [
+        'Total_Transaction_Amount',
+        'Average_Transaction_Amount',
+        'Transaction_Count',
+        'Std_Transaction_Amount',
+        'Net_Transaction_Amount',
+        'Debit_Count',
+        'Credit_Count',
+        'Debit_Credit_Ratio',
+        'Last_Access_Date',
+        'Recency',
+        'Frequency',
+        'Monetary',
+    ]
+
+    _INT_FIELDS = ['transaction_count', 'amount_count', 'debit_count', 'credit_count', 'last_seen']
+    _FLOAT_FIELDS = ['amount_sum', 'amount_mean', 'amount_m2']
+    _NO_TIMESTAMP = np.iinfo(np.int64).min
+    # Per-batch reductions folded into the running totals
+    _AGGREGATES = ['Transaction_Count', 'Total_Transaction_Amount', 'Average_Transaction_Amount',
+                   'Debit_Count', 'Credit_Count', 'Amount_Count', 'Amount_M2', 'Last_Access_Date']
+
+    def __init__(self, path: str = None, initial_capacity: int = 1024, dedup_window: int = 100_000):
+        """
+        Parameters
+        ----------
+        path : str, optional
+            SQLite file backing the store. Existing aggregates are loaded from it. When
+            omitted (or ``':memory:'``), the store lives in memory only.
+        initial_capacity : int, optional
+            Number of customer slots allocated up front; the arrays grow geometrically.
+        dedup_window : int, optional
+            Number of most recent TransactionIds remembered to skip replayed transactions.
+        """
+        self._lock = threading.RLock()
+        fields = {field: (np.int64, 0) for field in self._INT_FIELDS}
+        fields.update({field: (np.float64, 0.0) for field in self._FLOAT_FIELDS})
+        fields['last_seen'] = (np.int64, self._NO_TIMESTAMP)
+        # Customers modified since the last flush
+        fields['dirty'] = (bool, False)
+        self._slots = CustomerSlots(fields, initial_capacity)
+        self.dedup_window = max(int(dedup_window), 1)
+        # Recently folded TransactionIds, oldest first
+        self._seen_transactions = OrderedDict()
+        self._unflushed_transactions = []
+
+        self._connection = None
+        if path is not None and path != ':memory:':
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._create_table()
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, customer_id) -> bool:
+        return customer_id in self._slots
+
+    def update(self, df: pd.DataFrame) -> None:
+        """
+        Folds a batch of transactions into the running aggregates.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Transactions with ``CustomerId``, ``TransactionId``, ``Amount`` and
+            ``TransactionStartTime`` columns. Rows without a ``CustomerId`` are ignored,
+            and so are transactions whose ``TransactionId`` was already folded in.
+        """
+        # Deduplication, folding and recording the new ids form one step, so a concurrent
+        # duplicate cannot read the aggregates before they include its transactions, and a
+        # batch that fails to fold is not recorded as seen
+        with self._lock:
+            df, added = self._unseen(df)
+            self._fold(df)
+            self._remember(added)
+
+    def _fold(self, df: pd.DataFrame) -> None:
+        _, uniques, stats = FeatureEngineering.customer_aggregates(df, self._AGGREGATES)
+        if len(uniques) == 0:
+            return
+        amount_count = stats['Amount_Count']
+        amount_mean = np.where(amount_count > 0, stats['Average_Transaction_Amount'], 0.0)
+        amount_m2 = stats['Amount_M2']
+        last_seen = stats['Last_Access_Date'].view(np.int64)
+
+        with self._lock:
+            slots = self._slots.slots_for(uniques)
+            a = self._slots.arrays
+            a['transaction_count'][slots] += stats['Transaction_Count']
+            a['debit_count'][slots] += stats['Debit_Count']
+            a['credit_count'][slots] += stats['Credit_Count']
+            a['last_seen'][slots] = np.maximum(a['last_seen'][slots], last_seen)
+
+            # Chan et al. pairwise combination of (count, mean, M2)
+            old_count = a['amount_count'][slots]
+            old_mean = a['amount_mean'][slots]
+            total = old_count + amount_count
+            with np.errstate(invalid='ignore', divide='ignore'):
+                delta = amount_mean - old_mean
+                new_mean = np.where(total > 0, old_mean + delta * amount_count / total, 0.0)
+                new_m2 = a['amount_m2'][slots] + amount_m2 + np.where(
+                    total > 0, delta * delta * old_count * amount_count / total, 0.0)
+            a['amount_count'][slots] = total
+            a['amount_sum'][slots] += stats['Total_Transaction_Amount']
+            a['amount_mean'][slots] = new_mean
+            a['amount_m2'][slots] = new_m2
+            a['dirty'][slots] = True
+
+    def lookup(self, customer_ids, end_date: pd.Timestamp = None) -> pd.DataFrame:
+        """
+        Returns the current features for each customer id, in input order.
+
+        Customers that have never been seen get zero counts and sums, and NaN for mean,
+        standard deviation, last access date and recency.
+
+        Parameters
+        ----------
+        customer_ids : array-like
+            Customer ids to look up; duplicates are allowed.
+        end_date : pd.Timestamp, optional
+            Reference time for ``Recency``. Defaults to the current UTC time.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per input id with the columns in ``FEATURE_COLUMNS``.
+        """
+        if end_date is None:
+            end_date = pd.Timestamp.utcnow()
+        end_date = pd.Timestamp(end_date)
+        if end_date.tzinfo is None:
+            end_date = end_date.tz_localize('UTC')
+
+        with self._lock:
+            slots = self._slots.find(customer_ids)
+            known = slots >= 0
+            slots = np.where(known, slots, 0)
+            values = {field: self._slots.arrays[field][slots]
+                      for field in self._INT_FIELDS + self._FLOAT_FIELDS}
+
+        transaction_count = np.where(known, values['transaction_count'], 0)
+        amount_count = np.where(known, values['amount_count'], 0)
+        amount_sum = np.where(known, values['amount_sum'], 0.0)
+        debit_count = np.where(known, values['debit_count'], 0)
+        credit_count = np.where(known, values['credit_count'], 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(amount_count > 0, values['amount_mean'], np.nan)
+            std = np.where(amount_count > 1, np.sqrt(values['amount_m2'] / (amount_count - 1)), np.nan)
+
+        last_seen = values['last_seen']
+        has_timestamp = known & (last_seen != self._NO_TIMESTAMP)
+        last_access = pd.to_datetime(
+            np.where(has_timestamp, last_seen, np.iinfo(np.int64).min).view('datetime64[ns]'), utc=True)
+        recency = (end_date - last_access).days
+
+        return pd.DataFrame({
+            'Total_Transaction_Amount': amount_sum,
+            'Average_Transaction_Amount': mean,
+            'Transaction_Count': transaction_count,
+            'Std_Transaction_Amount': std,
+            'Net_Transaction_Amount': amount_sum,
+            'Debit_Count': debit_count,
+            'Credit_Count': credit_count,
+            'Debit_Credit_Ratio': debit_count / (credit_count + 1),
+            'Last_Access_Date': last_access,
+            'Recency': recency,
+            'Frequency': transaction_count,
+            'Monetary': amount_sum,
+        }, columns=self.FEATURE_COLUMNS)
+
+    def flush(self) -> None:
+        """Writes customers and transaction ids recorded since the last flush to the SQLite backing file."""
+        if self._connection is None:
+            return
+        with self._lock:
+            slots = np.flatnonzero(self._slots.view('dirty'))
+            if len(slots) == 0 and not self._unflushed_transactions:
+                return
+            fields = self._INT_FIELDS + self._FLOAT_FIELDS
+            columns = [self._slots.arrays[field][slots].tolist() for field in fields]
+            rows = zip([self._slots.customer_ids[slot] for slot in slots], *columns)
+            placeholders = ', '.join('?' * (len(fields) + 1))
+            # Aggregates and the transactions they include are committed together
+            with self._connection:
+                self._connection.executemany(
+                    f"INSERT OR REPLACE INTO customer_features (customer_id, {', '.join(fields)}) "
+                    f"VALUES ({placeholders})", rows)
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO seen_transactions (transaction_id) VALUES (?)",
+                    ((transaction_id,) for transaction_id in self._unflushed_transactions))
+                # Ids are inserted in order, so the rowid keeps the window's order on disk
+                self._connection.execute(
+                    "DELETE FROM seen_transactions "
+                    "WHERE rowid <= (SELECT MAX(rowid) FROM seen_transactions) - ?", (self.dedup_window,))
+            self._slots.arrays['dirty'][slots] = False
+            self._unflushed_transactions = []
+
+    def close(self) -> None:
+        """Flushes pending changes and closes the SQLite backing file."""
+        if self._connection is not None:
+            self.flush()
+            self._connection.close()
+            self._connection = None
+
+    def _unseen(self, df: pd.DataFrame) -> tuple:
+        """Drops already seen and repeated transactions; returns the rows and their new ids."""
+        # Rows without a TransactionId cannot be recognized and are always kept
+        transaction_ids = df['TransactionId']
+        present = transaction_ids.notna().to_numpy()
+        ids = transaction_ids.tolist()
+        seen = self._seen_transactions
+        new = present & ~transaction_ids.duplicated().to_numpy()
+        new &= np.fromiter((i not in seen for i in ids), dtype=bool, count=len(ids))
+        added = [i for i, keep in zip(ids, new) if keep]
+        keep = new | ~present
+        return (df if keep.all() else df[keep]), added
+
+    def _remember(self, transaction_ids: list) -> None:
+        """Adds folded TransactionIds to the window, forgetting the oldest beyond it."""
+        seen = self._seen_transactions
+        seen.update(dict.fromkeys(transaction_ids))
+        while len(seen) > self.dedup_window:
+            seen.popitem(last=False)
+        self._unflushed_transactions.extend(transaction_ids)
+        # Ids that left the window before a flush need not be written
+        del self._unflushed_transactions[:-self.dedup_window]
+
+    def _create_table(self) -> None:
+        int_columns = ', '.join(f"{field} INTEGER NOT NULL" for field in self._INT_FIELDS)
+        float_columns = ', '.join(f"{field} REAL NOT NULL" for field in self._FLOAT_FIELDS)
+        with self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS customer_features "
+                f"(customer_id PRIMARY KEY, {int_columns}, {float_columns})")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS seen_transactions (transaction_id PRIMARY KEY)")
+
+    def _load(self) -> None:
+        self._seen_transactions.update(dict.fromkeys(row[0] for row in self._connection.execute(
+            "SELECT transaction_id FROM (SELECT rowid, transaction_id FROM seen_transactions "
+            "ORDER BY rowid DESC LIMIT ?) ORDER BY rowid", (self.dedup_window,))))
+        fields = self._INT_FIELDS + self._FLOAT_FIELDS
+        rows = self._connection.execute(
+            f"SELECT customer_id, {', '.join(fields)} FROM customer_features").fetchall()
+        if not rows:
+            return
+        customer_ids = [row[0] for row in rows]
+        slots = self._slots.slots_for(customer_ids)
+        for j, field in enumerate(fields, start=1):
+            self._slots.arrays[field][slots] = [row[j] for row in rows]
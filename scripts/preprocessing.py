@@ -0,0 +1,330 @@
+import argparse
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from scripts.data_loader import load_data
+from scripts.feature_engineering import FeatureEngineering
+
+
+class FeaturePreprocessor:
+    """
+    A fit-once, transform-many replacement for ``FeatureEngineering.encode_categorical_features``
+    and ``FeatureEngineering.normalize_numerical_features``.
+
+    Category mappings and scaling parameters are learned once on training data and stored as
+    NumPy arrays, so ``transform`` never fits an sklearn estimator and costs the same for one
+    row as for the training set.
+
+    Training data that does not fit in memory, or that is processed by several workers, can be
+    fitted piecewise: ``partial_fit`` accumulates category counts and per-column moments from
+    one partition at a time, and ``merge`` combines preprocessors fitted on disjoint partitions.
+    The result matches ``fit`` on the concatenated data.
+
+    Attributes
+    ----------
+    categories_ : dict
+        Sorted category values (as strings) per categorical column, matching ``LabelEncoder``.
+    numeric_cols_ : list
+        Columns that are scaled, in the order of ``offset_`` and ``scale_``.
+    offset_ : np.ndarray
+        Per-column value subtracted before scaling (mean or minimum).
+    scale_ : np.ndarray
+        Per-column divisor (standard deviation or range), with zeros replaced by 1.
+    mean_ : np.ndarray
+        Per-column mean of the encoded training values, ignoring NaN.
+    """
+
+    def __init__(self, categorical_cols: list = None, exclude_cols: list = None,
+                 method: str = 'standardize'):
+        """
+        Parameters
+        ----------
+        categorical_cols : list, optional
+            Columns to label-encode. Defaults to ``['ProductCategory', 'ChannelId']``.
+        exclude_cols : list, optional
+            Numeric columns left unscaled. Defaults to ``['Amount', 'TransactionId', 'CustomerId']``.
+        method : str, optional
+            The method for scaling ('standardize' or 'normalize').
+        """
+        if method not in ('standardize', 'normalize'):
+            raise ValueError(f"Unknown scaling method: {method}")
+        self.categorical_cols = list(categorical_cols or ['ProductCategory', 'ChannelId'])
+        self.exclude_cols = list(exclude_cols or ['Amount', 'TransactionId', 'CustomerId'])
+        self.method = method
+
+    def fit(self, df: pd.DataFrame) -> "FeaturePreprocessor":
+        """
+        Learns category mappings and scaling parameters from training data.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Training data after aggregate, transaction and time features have been created.
+
+        Returns
+        -------
+        FeaturePreprocessor
+            The fitted preprocessor.
+        """
+        self.categories_ = {
+            col: np.unique(df[col].astype(str).to_numpy()) for col in self.categorical_cols
+        }
+        encoded = df.copy()
+        for col in self.categorical_cols:
+            encoded[col] = self.encode(col, encoded[col])
+
+        numeric_cols = encoded.select_dtypes(include='number').columns
+        self.numeric_cols_ = [col for col in numeric_cols if col not in self.exclude_cols]
+        self.mean_ = np.nanmean(encoded[self.numeric_cols_].to_numpy(dtype=np.float64), axis=0) \
+            if len(encoded) else np.full(len(self.numeric_cols_), np.nan)
+
+        if self.method == 'standardize':
+            scaler = StandardScaler().fit(encoded[self.numeric_cols_])
+            self.offset_ = scaler.mean_.astype(np.float64)
+            self.scale_ = scaler.scale_.astype(np.float64)
+        else:
+            scaler = MinMaxScaler().fit(encoded[self.numeric_cols_])
+            self.offset_ = scaler.data_min_.astype(np.float64)
+            data_range = scaler.data_range_.astype(np.float64)
+            self.scale_ = np.where(data_range == 0, 1.0, data_range)
+        return self
+
+    def partial_fit(self, df: pd.DataFrame) -> "FeaturePreprocessor":
+        """
+        Updates the fitted parameters with one more partition of the training data.
+
+        Category counts and, per numeric column, the count, mean, sum of squared deviations,
+        minimum and maximum are accumulated, and the fitted attributes are recomputed from
+        them, so the preprocessor can be used after every call.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            A partition of the training data, with the same columns as the other partitions.
+
+        Returns
+        -------
+        FeaturePreprocessor
+            The updated preprocessor.
+        """
+        numeric = set(df.select_dtypes(include='number').columns)
+        columns = [col for col in df.columns
+                   if (col in self.categorical_cols or col in numeric) and col not in self.exclude_cols]
+        moments = {}
+        for col in columns:
+            if col in self.categorical_cols:
+                continue
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            count = len(values)
+            mean = values.mean() if count else 0.0
+            moments[col] = np.array([
+                count, mean, ((values - mean) ** 2).sum(),
+                values.min() if count else np.inf, values.max() if count else -np.inf,
+            ])
+        partial = {
+            'columns': columns,
+            'category_counts': {col: df[col].astype(str).value_counts() for col in self.categorical_cols},
+            'moments': moments,
+        }
+        if hasattr(self, '_partial'):
+            self._combine(partial)
+        else:
+            self._partial = partial
+        self._finish_partial_fit()
+        return self
+
+    def merge(self, other: "FeaturePreprocessor") -> "FeaturePreprocessor":
+        """
+        Combines the accumulated state of a preprocessor fitted on another partition.
+
+        Parameters
+        ----------
+        other : FeaturePreprocessor
+            A preprocessor with the same settings, fitted with ``partial_fit``.
+
+        Returns
+        -------
+        FeaturePreprocessor
+            The updated preprocessor.
+        """
+        if not hasattr(other, '_partial'):
+            raise ValueError("Only preprocessors fitted with 'partial_fit' can be merged.")
+        if (other.method, other.categorical_cols, other.exclude_cols) != \
+                (self.method, self.categorical_cols, self.exclude_cols):
+            raise ValueError("Cannot merge preprocessors with different settings.")
+        if hasattr(self, '_partial'):
+            self._combine(other._partial)
+        else:
+            self._partial = other._partial
+        self._finish_partial_fit()
+        return self
+
+    def _combine(self, partial: dict) -> None:
+        state = self._partial
+        if partial['columns'] != state['columns']:
+            raise ValueError(f"Partitions have different columns: {state['columns']} and {partial['columns']}")
+        for col, counts in partial['category_counts'].items():
+            state['category_counts'][col] = state['category_counts'][col].add(counts, fill_value=0)
+        for col, (count_b, mean_b, m2_b, min_b, max_b) in partial['moments'].items():
+            count_a, mean_a, m2_a, min_a, max_a = state['moments'][col]
+            count = count_a + count_b
+            # Chan et al. pairwise update of the mean and the sum of squared deviations
+            delta = mean_b - mean_a
+            mean = mean_a + delta * count_b / count if count else 0.0
+            m2 = m2_a + m2_b + delta * delta * count_a * count_b / count if count else 0.0
+            state['moments'][col] = np.array([count, mean, m2, min(min_a, min_b), max(max_a, max_b)])
+
+    def _finish_partial_fit(self) -> None:
+        state = self._partial
+        self.categories_ = {
+            col: np.unique(counts.index.to_numpy().astype(str))
+            for col, counts in state['category_counts'].items()
+        }
+        self.numeric_cols_ = list(state['columns'])
+        stats = np.empty((len(self.numeric_cols_), 5), dtype=np.float64)
+        for j, col in enumerate(self.numeric_cols_):
+            if col in self.categories_:
+                # Moments of the label codes, from the category counts
+                counts = state['category_counts'][col].reindex(self.categories_[col]).to_numpy(dtype=np.float64)
+                codes = np.arange(len(counts), dtype=np.float64)
+                count = counts.sum()
+                mean = (counts * codes).sum() / count if count else 0.0
+                stats[j] = [count, mean, (counts * (codes - mean) ** 2).sum(),
+                            0 if count else np.inf, len(counts) - 1 if count else -np.inf]
+            else:
+                stats[j] = state['moments'][col]
+        count, mean, m2, minimum, maximum = stats.T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.mean_ = np.where(count > 0, mean, np.nan)
+            constant = ~(maximum > minimum)
+            if self.method == 'standardize':
+                self.offset_ = self.mean_
+                self.scale_ = np.where(constant, 1.0, np.sqrt(m2 / count))
+            else:
+                self.offset_ = np.where(count > 0, minimum, np.nan)
+                self.scale_ = np.where(constant, 1.0, maximum - minimum)
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Encodes and scales a DataFrame using the fitted parameters only.
+
+        Categories not seen during ``fit`` are encoded as -1 before scaling. Scaled columns
+        missing from ``df`` are created as NaN.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Data with the same columns used in ``fit``.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with encoded categorical and scaled numerical features.
+        """
+        self._check_is_fitted()
+        n_rows = len(df)
+        values = np.empty((n_rows, len(self.numeric_cols_)), dtype=np.float64)
+        for j, col in enumerate(self.numeric_cols_):
+            if col in self.categories_:
+                values[:, j] = self.encode(col, df[col])
+            elif col in df.columns:
+                values[:, j] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                values[:, j] = np.nan
+        values -= self.offset_
+        values /= self.scale_
+
+        df = df.copy()
+        for col in self.categorical_cols:
+            if col not in self.numeric_cols_:
+                df[col] = self.encode(col, df[col])
+        for j, col in enumerate(self.numeric_cols_):
+            df[col] = values[:, j]
+        return df
+
+    def encode(self, col: str, values) -> np.ndarray:
+        """
+        Label-encodes a categorical column with the fitted classes; unseen values become -1.
+
+        Parameters
+        ----------
+        col : str
+            One of ``categorical_cols``.
+        values : array-like
+            The column values.
+
+        Returns
+        -------
+        np.ndarray
+            Integer codes, one per value.
+        """
+        classes = self.categories_[col]
+        values = np.asarray(values).astype(str)
+        if len(classes) == 0:
+            return np.full(len(values), -1, dtype=np.int64)
+        idx = np.searchsorted(classes, values)
+        clipped = np.minimum(idx, len(classes) - 1)
+        return np.where(classes[clipped] == values, clipped, -1)
+
+    def save(self, path: str) -> None:
+        """Serializes the fitted preprocessor with joblib."""
+        self._check_is_fitted()
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path: str) -> "FeaturePreprocessor":
+        """Loads a preprocessor saved with ``save``."""
+        preprocessor = joblib.load(path)
+        if not isinstance(preprocessor, FeaturePreprocessor):
+            raise TypeError(f"Expected a FeaturePreprocessor in '{path}', found {type(preprocessor)}")
+        return preprocessor
+
+    def _check_is_fitted(self) -> None:
+        if not hasattr(self, 'numeric_cols_'):
+            raise RuntimeError("FeaturePreprocessor is not fitted yet; call 'fit' first.")
+
+
+def fit_preprocessor(df: pd.DataFrame, method: str = 'standardize') -> FeaturePreprocessor:
+    """
+    Runs the serving feature chain on raw transactions and fits a preprocessor on the result.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Raw transactions with the columns of the API ``InputData`` schema.
+    method : str, optional
+        The method for scaling ('standardize' or 'normalize').
+
+    Returns
+    -------
+    FeaturePreprocessor
+        A preprocessor fitted on the engineered training features.
+    """
+    fe = FeatureEngineering()
+    df = fe.create_customer_features(df)
+    df = fe.extract_time_features(df)
+    return FeaturePreprocessor(method=method).fit(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fit the serving preprocessor on raw transactions and save it next to the model.")
+    parser.add_argument('data_path', help="CSV of raw transactions with the API InputData columns.")
+    parser.add_argument('--output', default='api/model/preprocessor.pkl',
+                        help="Where to write the fitted preprocessor.")
+    parser.add_argument('--method', default='standardize', choices=['standardize', 'normalize'])
+    args = parser.parse_args()
+
+    df = load_data(args.data_path)
+    if df.empty:
+        raise SystemExit(f"No data loaded from '{args.data_path}'.")
+    fit_preprocessor(df.reset_index(), method=args.method).save(args.output)
+    print(f"Preprocessor saved to '{args.output}'.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,439 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from scripts.data_loader import ID_COLUMNS, csv_byte_ranges, iter_data_chunks, read_csv_range
+
+# Columns of CreditRiskAnalysis.summary_statistics, in order
+SUMMARY_COLUMNS = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max',
+                   'median', 'mode', 'skewness', 'kurtosis', 'range', 'variance', 'IQR']
+# Added after SUMMARY_COLUMNS: whether 'mode' is exact or an estimate
+MODE_EXACT_COLUMN = 'mode_exact'
+
+
+class StreamingMoments:
+    """
+    Count, mean, central moments up to the fourth, minimum and maximum of many columns.
+
+    Each chunk is reduced in one vectorized pass over all columns (its own mean, then the
+    sums of the 2nd, 3rd and 4th powers of the deviations), and summaries are combined
+    with the pairwise formulas of Pébay (2008), which extend Welford's update to higher
+    moments. Chunks and partitions can therefore be added in any grouping, without the
+    precision loss of accumulating raw power sums. Missing values are ignored per column.
+    """
+
+    def __init__(self, n_columns: int):
+        self.count = np.zeros(n_columns)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.m3 = np.zeros(n_columns)
+        self.m4 = np.zeros(n_columns)
+        self.min = np.full(n_columns, np.inf)
+        self.max = np.full(n_columns, -np.inf)
+
+    def update(self, values: np.ndarray) -> "StreamingMoments":
+        """Adds a 2-D float array of rows, with NaN for missing values."""
+        valid = ~np.isnan(values)
+        chunk = StreamingMoments(values.shape[1])
+        chunk.count = valid.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            chunk.mean = np.nan_to_num(np.where(valid, values, 0.0).sum(axis=0) / chunk.count)
+        deviation = np.where(valid, values - chunk.mean, 0.0)
+        squared = deviation * deviation
+        chunk.m2 = squared.sum(axis=0)
+        chunk.m3 = (squared * deviation).sum(axis=0)
+        chunk.m4 = (squared * squared).sum(axis=0)
+        chunk.min = np.where(valid, values, np.inf).min(axis=0, initial=np.inf)
+        chunk.max = np.where(valid, values, -np.inf).max(axis=0, initial=-np.inf)
+        return self.merge(chunk)
+
+    def merge(self, other: "StreamingMoments") -> "StreamingMoments":
+        """Combines the moments of another summary of the same columns."""
+        n_a, n_b = self.count, other.count
+        n = n_a + n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            share_a = np.where(n > 0, n_a / n, 0.0)
+            share_b = np.where(n > 0, n_b / n, 0.0)
+        delta = other.mean - self.mean
+        delta2 = delta * delta
+        m2 = self.m2 + other.m2 + delta2 * n_a * share_b
+        m3 = (self.m3 + other.m3 + delta2 * delta * n_a * share_b * (share_a - share_b)
+              + 3.0 * delta * (share_a * other.m2 - share_b * self.m2))
+        m4 = (self.m4 + other.m4
+              + delta2 * delta2 * n_a * share_b * (share_a * share_a - share_a * share_b + share_b * share_b)
+              + 6.0 * delta2 * (share_a * share_a * other.m2 + share_b * share_b * self.m2)
+              + 4.0 * delta * (share_a * other.m3 - share_b * self.m3))
+        self.mean = self.mean + delta * share_b
+        self.count, self.m2, self.m3, self.m4 = n, m2, m3, m4
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        return self
+
+    def variance(self) -> np.ndarray:
+        """Sample variance (ddof=1), as ``DataFrame.var``."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > 1, self.m2 / (self.count - 1), np.nan)
+
+    def skewness(self) -> np.ndarray:
+        """Adjusted Fisher-Pearson skewness, as ``DataFrame.skew``."""
+        n, m2, m3 = self.count, self.m2, self.m3
+        with np.errstate(invalid='ignore', divide='ignore'):
+            skew = n * np.sqrt(n - 1) / (n - 2) * m3 / m2 ** 1.5
+        skew = np.where(self._is_constant(), 0.0, skew)
+        return np.where(n > 2, skew, np.nan)
+
+    def kurtosis(self) -> np.ndarray:
+        """Unbiased excess kurtosis, as ``DataFrame.kurtosis``."""
+        n, m2, m4 = self.count, self.m2, self.m4
+        with np.errstate(invalid='ignore', divide='ignore'):
+            kurt = (n * (n + 1) * (n - 1) * m4 / ((n - 2) * (n - 3) * m2 * m2)
+                    - 3.0 * (n - 1) ** 2 / ((n - 2) * (n - 3)))
+        kurt = np.where(self._is_constant(), 0.0, kurt)
+        return np.where(n > 3, kurt, np.nan)
+
+    def _is_constant(self) -> np.ndarray:
+        # Rounding leaves tiny deviations in constant columns, so test the range instead
+        return ~(self.max > self.min)
+
+
+class KLLSketch:
+    """
+    Mergeable quantile sketch of one column (Karnin, Lang and Liberty, 2016).
+
+    Values enter level 0 of a stack of compactors. When a level holds more than ``k``
+    items it is sorted and every other item, starting at a random offset, is promoted to
+    the next level with twice the weight; an odd leftover stays behind. Total weight is
+    preserved, memory stays around ``k`` items per level, and the rank error of a query
+    is a small multiple of ``n / k`` for ``n`` values. Until ``k`` values have been
+    added, nothing is compacted and quantiles are exact.
+
+    Sketches merge by concatenating their levels and compacting again.
+    """
+
+    def __init__(self, k: int = 2048, seed: int = 0):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray) -> "KLLSketch":
+        """Adds an array of values; NaN values are ignored."""
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.count += len(values)
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Adds the values summarized by another sketch."""
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantile(self, q) -> np.ndarray:
+        """
+        Estimates quantiles with linear interpolation between ranks, like ``Series.quantile``.
+
+        Parameters
+        ----------
+        q : float or array-like
+            Quantiles between 0 and 1.
+
+        Returns
+        -------
+        np.ndarray
+            One estimate per quantile, NaN if no value has been added.
+        """
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if self.count == 0:
+            return np.full(len(q), np.nan)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        values, ends = values[order], np.cumsum(weights[order])
+        # Item i covers the ranks [ends[i-1], ends[i]) of the weighted sorted sample
+        position = q * (ends[-1] - 1)
+        lower = np.floor(position)
+        below = values[np.searchsorted(ends, lower, side='right')]
+        above = values[np.searchsorted(ends, np.minimum(lower + 1, ends[-1] - 1), side='right')]
+        fraction = position - lower
+        # The two forms of the interpolation NumPy uses, for its rounding behaviour
+        return np.where(fraction < 0.5, below + (above - below) * fraction,
+                        above - (above - below) * (1.0 - fraction))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.k:
+                items = np.sort(items)
+                leftover = items[-1:] if len(items) % 2 else items[:0]
+                paired = items[:len(items) - len(leftover)]
+                promoted = paired[self._rng.integers(2)::2]
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level] = leftover
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+
+class MisraGries:
+    """
+    Mergeable heavy-hitter summary of one column, used to estimate its mode.
+
+    At most ``k`` counters are kept. When a chunk's value counts push the number of
+    counters above ``k``, the (k+1)-th largest count is subtracted from every counter
+    and non-positive ones are dropped (the mergeable form of Misra-Gries of Agarwal et
+    al., 2012). Counts are then underestimated by at most ``n / (k + 1)``, so any value
+    more frequent than that is kept. While no counter has been dropped the counts are
+    exact (``exact`` is True) and ``mode`` equals ``Series.mode().iloc[0]``: the smallest
+    most frequent value.
+
+    On high-cardinality columns every count can tie with the subtracted one; the top
+    candidate is then kept with a zero count instead of dropping every counter, so
+    ``mode`` still returns a value, flagged as approximate by ``exact``.
+    """
+
+    def __init__(self, k: int = 1024):
+        self.k = k
+        self.values = np.empty(0)
+        self.counts = np.empty(0)
+        self.exact = True
+
+    def update(self, values: np.ndarray) -> "MisraGries":
+        """Adds an array of values; NaN values are ignored."""
+        values, counts = np.unique(values[~np.isnan(values)], return_counts=True)
+        return self._combine(values, counts.astype(np.float64))
+
+    def merge(self, other: "MisraGries") -> "MisraGries":
+        """Adds the counters of another summary."""
+        self.exact &= other.exact
+        return self._combine(other.values, other.counts)
+
+    def mode(self) -> float:
+        """The most frequent value, the smallest one on ties; NaN if no value has been added."""
+        if len(self.counts) == 0:
+            return np.nan
+        return float(self.values[np.argmax(self.counts)])
+
+    def _combine(self, values: np.ndarray, counts: np.ndarray) -> "MisraGries":
+        values, inverse = np.unique(np.concatenate([self.values, values]), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate([self.counts, counts]))
+        if len(counts) > self.k:
+            threshold = np.partition(counts, len(counts) - self.k - 1)[len(counts) - self.k - 1]
+            counts = counts - threshold
+            keep = counts > 0
+            if not keep.any():
+                keep[np.argmax(counts)] = True
+            values, counts = values[keep], counts[keep]
+            self.exact = False
+        # Values stay sorted, so argmax picks the smallest of tied values
+        self.values, self.counts = values, counts
+        return self
+
+
+class StreamingSummary:
+    """
+    The summary statistics of ``CreditRiskAnalysis.summary_statistics`` in one pass over chunks.
+
+    The in-memory version scans the numeric frame once per statistic (``describe``,
+    ``median``, ``mode``, ``skew``, ``kurtosis``, ``var``, ``max``, ``min`` and two
+    ``quantile`` calls) and needs the whole dataset at once. Here every chunk is read once:
+    ``StreamingMoments`` accumulates count, mean, variance, skewness, kurtosis, minimum and
+    maximum for all columns, a ``KLLSketch`` per column estimates the quartiles and the
+    median, and a ``MisraGries`` summary per column estimates the mode. Every part is
+    mergeable, so partitions can be summarized in parallel and combined with ``merge``.
+
+    Moments, minimum and maximum are exact. Quantiles and the mode are exact while a column
+    has fewer than ``quantile_k`` values (quantiles) and ``mode_k`` distinct values (mode),
+    and approximate beyond; the ``mode_exact`` column tells which modes are exact.
+    """
+
+    def __init__(self, columns: list = None, exclude_cols: list = None, quantile_k: int = 2048,
+                 mode_k: int = 1024, seed: int = 0):
+        """
+        Parameters
+        ----------
+        columns : list, optional
+            Columns to summarize. Defaults to the numeric columns of the first chunk.
+        exclude_cols : list, optional
+            Numeric columns to leave out, e.g. identifiers.
+        quantile_k : int, optional
+            Items kept per level of the quantile sketches.
+        mode_k : int, optional
+            Counters kept by the mode estimators.
+        seed : int, optional
+            Seed of the quantile sketches' compaction offsets.
+        """
+        self.columns = None if columns is None else list(columns)
+        self.exclude_cols = list(exclude_cols or [])
+        self.quantile_k = quantile_k
+        self.mode_k = mode_k
+        self.seed = seed
+
+    def update(self, chunk: pd.DataFrame) -> "StreamingSummary":
+        """Adds a chunk of rows."""
+        if self.columns is None:
+            self.columns = [col for col in chunk.select_dtypes(include='number').columns
+                            if col not in self.exclude_cols]
+        if not hasattr(self, 'moments_'):
+            self._start()
+        values = chunk[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.moments_.update(values)
+        for j in range(len(self.columns)):
+            self.quantiles_[j].update(values[:, j])
+            self.modes_[j].update(values[:, j])
+        return self
+
+    def merge(self, other: "StreamingSummary") -> "StreamingSummary":
+        """Combines the summary of another partition of the same columns."""
+        if not hasattr(other, 'moments_'):
+            return self
+        if not hasattr(self, 'moments_'):
+            self.columns = other.columns
+            self._start()
+        if other.columns != self.columns:
+            raise ValueError(f"Cannot merge summaries of {self.columns} and {other.columns}.")
+        self.moments_.merge(other.moments_)
+        for mine, theirs in zip(self.quantiles_ + self.modes_, other.quantiles_ + other.modes_):
+            mine.merge(theirs)
+        return self
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Returns
+        -------
+        pd.DataFrame
+            One row per column with the statistics of ``SUMMARY_COLUMNS``, followed by
+            ``mode_exact``.
+        """
+        if not hasattr(self, 'moments_'):
+            return pd.DataFrame(columns=SUMMARY_COLUMNS + [MODE_EXACT_COLUMN]).rename_axis('Statistic')
+        moments = self.moments_
+        empty = moments.count == 0
+        quartiles = np.array([sketch.quantile([0.25, 0.5, 0.75]) for sketch in self.quantiles_]).reshape(-1, 3)
+        variance = moments.variance()
+        minimum = np.where(empty, np.nan, moments.min)
+        maximum = np.where(empty, np.nan, moments.max)
+        summary = pd.DataFrame({
+            'count': moments.count,
+            'mean': np.where(empty, np.nan, moments.mean),
+            'std': np.sqrt(variance),
+            'min': minimum,
+            '25%': quartiles[:, 0],
+            '50%': quartiles[:, 1],
+            '75%': quartiles[:, 2],
+            'max': maximum,
+            'median': quartiles[:, 1],
+            'mode': [mode.mode() for mode in self.modes_],
+            'skewness': moments.skewness(),
+            'kurtosis': moments.kurtosis(),
+            'range': maximum - minimum,
+            'variance': variance,
+            'IQR': quartiles[:, 2] - quartiles[:, 0],
+            MODE_EXACT_COLUMN: [mode.exact for mode in self.modes_],
+        }, index=pd.Index(self.columns, name='Statistic'))
+        return summary
+
+    def _start(self) -> None:
+        self.moments_ = StreamingMoments(len(self.columns))
+        self.quantiles_ = [KLLSketch(self.quantile_k, seed=self.seed + j) for j in range(len(self.columns))]
+        self.modes_ = [MisraGries(self.mode_k) for _ in self.columns]
+
+
+def summarize_chunks(chunks, **kwargs) -> pd.DataFrame:
+    """
+    Computes the summary statistics of an iterable of DataFrame chunks in one pass.
+
+    Parameters
+    ----------
+    chunks : iterable of pd.DataFrame
+        E.g. ``iter_data_chunks(path)``.
+    **kwargs
+        Options of ``StreamingSummary``.
+
+    Returns
+    -------
+    pd.DataFrame
+        The summary, with the columns of ``CreditRiskAnalysis.summary_statistics``
+        and ``mode_exact``.
+    """
+    summary = StreamingSummary(**kwargs)
+    for chunk in chunks:
+        summary.update(chunk)
+    return summary.to_frame()
+
+
+def _summarize_range(task: tuple) -> StreamingSummary:
+    """Pool task: summarizes one byte range of a CSV file."""
+    index, path, start, end, names, kwargs = task
+    # Every range gets its own sketch seeds, so the merged result is reproducible
+    kwargs = {**kwargs, 'seed': kwargs.get('seed', 0) + 1_000_003 * index}
+    return StreamingSummary(**kwargs).update(read_csv_range(path, start, end, names))
+
+
+def summarize_csv(path: str, n_workers: int = None, chunk_mb: float = 64, **kwargs) -> pd.DataFrame:
+    """
+    Computes the summary statistics of a Xente-format CSV file with parallel workers.
+
+    The file is cut into byte ranges, each summarized in a worker process, and the
+    partial summaries are merged in file order.
+
+    Parameters
+    ----------
+    path : str
+        The CSV file.
+    n_workers : int, optional
+        Worker processes. Defaults to the number of CPUs; 1 reads the file in process.
+    chunk_mb : float, optional
+        Size of the byte range read by one task.
+    **kwargs
+        Options of ``StreamingSummary``; identifier columns are excluded by default.
+
+    Returns
+    -------
+    pd.DataFrame
+        The summary, with the columns of ``CreditRiskAnalysis.summary_statistics``
+        and ``mode_exact``.
+    """
+    kwargs.setdefault('exclude_cols', ID_COLUMNS)
+    n_workers = max(int(n_workers or os.cpu_count() or 1), 1)
+    if n_workers == 1:
+        return summarize_chunks(iter_data_chunks(path), **kwargs)
+    names, ranges = csv_byte_ranges(path, int(chunk_mb * 2**20))
+    tasks = [(index, path, start, end, names, kwargs) for index, (start, end) in enumerate(ranges)]
+    summary = StreamingSummary(**kwargs)
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        for partial in executor.map(_summarize_range, tasks):
+            summary.merge(partial)
+    return summary.to_frame()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Summary statistics of a transactions CSV (count, mean, std, quartiles, mode, "
+                    "skewness, kurtosis, ...) in one streaming pass with bounded memory.")
+    parser.add_argument('data_path', help="Xente-format CSV of transactions.")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: number of CPUs).")
+    parser.add_argument('--quantile-k', type=int, default=2048,
+                        help="Quantile sketch size; larger is more accurate.")
+    parser.add_argument('--output', help="Also write the summary to this CSV file.")
+    args = parser.parse_args()
+
+    summary = summarize_csv(args.data_path, n_workers=args.workers, quantile_k=args.quantile_k)
+    with pd.option_context('display.max_columns', None, 'display.width', 200):
+        print("Summary Statistics:\n", summary)
+    if args.output:
+        summary.to_csv(args.output)
+
+
+if __name__ == '__main__':
+    main()
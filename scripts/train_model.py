@@ -0,0 +1,355 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from joblib import Memory
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+from sklearn.model_selection import HalvingGridSearchCV, StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from scripts.cache import read_table
+
+# Features the served model is trained on, in the order the API sends them
+FEATURES = [
+    'ProductCategory',
+    'PricingStrategy',
+    'Transaction_Count',
+    'Transaction_Month',
+    'Transaction_Year',
+    'Recency',
+    'Frequency',
+]
+
+# Positive class of the model: customers labelled 'Bad' by the RFM scoring
+BAD_LABEL = 'Bad'
+
+
+def candidate_models(early_stopping: bool = True, random_state: int = 42) -> dict:
+    """
+    The candidate classifiers and hyperparameter grids of the model preparation notebook.
+
+    Parameters
+    ----------
+    early_stopping : bool, optional
+        Stop adding gradient boosting stages once the score on a 10% validation split has
+        not improved for 10 stages, so ``n_estimators`` is an upper bound.
+    random_state : int, optional
+        Seed of every randomized estimator.
+
+    Returns
+    -------
+    dict
+        ``(estimator, param_grid)`` per candidate name; grid keys address the
+        'classifier' step of the training pipeline.
+    """
+    boosting = GradientBoostingClassifier(random_state=random_state)
+    if early_stopping:
+        boosting.set_params(n_iter_no_change=10, validation_fraction=0.1)
+    return {
+        'logistic_regression': (
+            LogisticRegression(max_iter=1000),
+            {'classifier__C': [0.01, 0.1, 1, 10, 100]}),
+        'decision_tree': (
+            DecisionTreeClassifier(random_state=random_state),
+            {'classifier__max_depth': [3, 5, 7, None]}),
+        'random_forest': (
+            RandomForestClassifier(random_state=random_state),
+            {'classifier__n_estimators': [50, 100, 200], 'classifier__max_depth': [None, 5, 10]}),
+        'gradient_boosting': (
+            boosting,
+            {'classifier__learning_rate': [0.01, 0.1, 0.2], 'classifier__n_estimators': [50, 100, 200]}),
+    }
+
+
+def build_training_frame(features_df: pd.DataFrame, rfm_data: pd.DataFrame,
+                         features: list = None) -> tuple:
+    """
+    Builds the customer-level training set: the first transaction of each customer, joined
+    with the customer's Recency, Frequency and Risk_Label.
+
+    Parameters
+    ----------
+    features_df : pd.DataFrame
+        Transaction-level engineered features, e.g. ``extracted_features.csv``.
+    rfm_data : pd.DataFrame
+        Per-customer RFM values and Risk_Label, e.g. the RFM output of ``training_data``.
+    features : list, optional
+        Feature columns. Defaults to ``FEATURES``.
+
+    Returns
+    -------
+    tuple
+        The features ``X`` indexed by CustomerId and the target ``y`` (1 for 'Bad').
+    """
+    features = list(features or FEATURES)
+    customers = features_df.drop_duplicates(subset='CustomerId', keep='first')
+    rfm_columns = [col for col in ['Recency', 'Frequency', 'Monetary', 'Risk_Label']
+                   if col in rfm_data.columns and (col == 'Risk_Label' or col not in customers.columns)]
+    data = customers.merge(rfm_data[['CustomerId'] + rfm_columns], on='CustomerId', how='inner')
+    data = data.dropna(subset=['Risk_Label']).set_index('CustomerId')
+    y = (data['Risk_Label'] == BAD_LABEL).astype(np.int64)
+    return data[features], y
+
+
+def evaluate(model, X: pd.DataFrame, y: pd.Series) -> dict:
+    """Accuracy, precision, recall, F1 and ROC AUC of a fitted classifier on held-out data."""
+    y_pred = model.predict(X)
+    y_prob = model.predict_proba(X)[:, list(model.classes_).index(1)]
+    return {
+        'accuracy': float(accuracy_score(y, y_pred)),
+        'precision': float(precision_score(y, y_pred, zero_division=0)),
+        'recall': float(recall_score(y, y_pred, zero_division=0)),
+        'f1': float(f1_score(y, y_pred, zero_division=0)),
+        'roc_auc': float(roc_auc_score(y, y_prob)) if y.nunique() > 1 else float('nan'),
+    }
+
+
+class ModelTrainer:
+    """
+    Selects and trains the credit risk model with a parallel, cached hyperparameter search.
+
+    The data is split once into a stratified training and test set, and the training set
+    into stratified cross-validation folds. The fold indices are computed once and shared
+    by every candidate, so all models are compared on the same folds and a rerun with the
+    same seed reproduces them.
+
+    Each candidate is a ``Pipeline`` of a ``StandardScaler`` and the classifier, searched
+    with ``HalvingGridSearchCV``: all parameter combinations are first scored on a small
+    subsample of every fold and only the best third move on to three times more data, so
+    most of the grid never trains on the full folds. Fits run in ``n_jobs`` worker
+    processes, and the pipeline caches its fitted scaler per fold with ``joblib.Memory``,
+    so the transformed folds are computed once and reused by every combination.
+
+    The candidate with the best cross-validated score is refitted on the whole training
+    set and evaluated on the test set.
+
+    Attributes
+    ----------
+    splits_ : list
+        ``(train, validation)`` indices of the cross-validation folds.
+    results_ : dict
+        Best parameters, cross-validation score, test metrics and search time per candidate.
+    best_name_ : str
+        Name of the selected candidate.
+    best_estimator_ : Pipeline
+        The selected pipeline, refitted on the training set.
+    """
+
+    def __init__(self, candidates: dict = None, scoring: str = 'roc_auc', cv: int = 5,
+                 test_size: float = 0.2, n_jobs: int = None, cache_dir: str = None,
+                 factor: int = 3, random_state: int = 42):
+        """
+        Parameters
+        ----------
+        candidates : dict, optional
+            ``(estimator, param_grid)`` per name. Defaults to ``candidate_models()``.
+        scoring : str, optional
+            sklearn scorer used to select parameters and models.
+        cv : int, optional
+            Number of stratified cross-validation folds.
+        test_size : float, optional
+            Fraction of the data held out for the final evaluation.
+        n_jobs : int, optional
+            Worker processes for the search; -1 uses every CPU.
+        cache_dir : str, optional
+            Directory of the fitted-transformer cache. Defaults to a temporary directory
+            removed after ``fit``; a fixed directory also serves later runs on the same data.
+        factor : int, optional
+            Halving factor: the share of candidates kept and the growth of the sample
+            size at each iteration.
+        random_state : int, optional
+            Seed of the splits, the subsampling and the estimators.
+        """
+        self.candidates = candidates if candidates is not None else candidate_models(random_state=random_state)
+        self.scoring = scoring
+        self.cv = cv
+        self.test_size = test_size
+        self.n_jobs = n_jobs
+        self.cache_dir = cache_dir
+        self.factor = factor
+        self.random_state = random_state
+
+    def fit(self, X: pd.DataFrame, y: pd.Series) -> "ModelTrainer":
+        """
+        Searches every candidate and selects the best model.
+
+        Parameters
+        ----------
+        X : pd.DataFrame
+            Customer-level features, e.g. from ``build_training_frame``.
+        y : pd.Series
+            Binary target, 1 for bad customers.
+
+        Returns
+        -------
+        ModelTrainer
+            The fitted trainer.
+        """
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=self.test_size, stratify=y, random_state=self.random_state)
+        folds = StratifiedKFold(n_splits=self.cv, shuffle=True, random_state=self.random_state)
+        self.splits_ = list(folds.split(X_train, y_train))
+        self.features_ = list(X.columns)
+        self.n_train_, self.n_test_ = len(X_train), len(X_test)
+        self.data_digest_ = hashlib.sha256(
+            pd.util.hash_pandas_object(pd.concat([X, y.rename('_target')], axis=1)).to_numpy().tobytes()
+        ).hexdigest()
+
+        cache_dir = self.cache_dir or tempfile.mkdtemp(prefix='train-model-')
+        try:
+            memory = Memory(cache_dir, verbose=0)
+            self.results_ = {}
+            searches = {}
+            for name, (estimator, param_grid) in self.candidates.items():
+                pipeline = Pipeline([('scaler', StandardScaler()), ('classifier', sklearn.clone(estimator))],
+                                    memory=memory)
+                search = HalvingGridSearchCV(
+                    pipeline, param_grid, factor=self.factor, cv=self.splits_, scoring=self.scoring,
+                    n_jobs=self.n_jobs, random_state=self.random_state, refit=True)
+                start = time.perf_counter()
+                search.fit(X_train, y_train)
+                # The refitted model must not write to the cache once it is served
+                search.best_estimator_.set_params(memory=None)
+                searches[name] = search
+                self.results_[name] = {
+                    'best_params': {key.split('__', 1)[1]: value for key, value in search.best_params_.items()},
+                    'cv_score': float(search.best_score_),
+                    'n_candidates': len(search.cv_results_['params']),
+                    'n_iterations': int(search.n_iterations_),
+                    'search_seconds': time.perf_counter() - start,
+                    'test_metrics': evaluate(search.best_estimator_, X_test, y_test),
+                }
+        finally:
+            if self.cache_dir is None:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+
+        # Candidates are compared in their listed order, so ties keep the first one
+        self.best_name_ = max(self.results_, key=lambda name: self.results_[name]['cv_score'])
+        self.best_estimator_ = searches[self.best_name_].best_estimator_
+        return self
+
+    def metadata(self) -> dict:
+        """
+        Describes the selected model and how it was trained, for the JSON stored next to it.
+
+        Returns
+        -------
+        dict
+            Model name, parameters, features, scores of every candidate, data sizes and
+            digest, seed and library versions.
+        """
+        best = self.results_[self.best_name_]
+        return {
+            'model': self.best_name_,
+            'params': best['best_params'],
+            'features': self.features_,
+            'classes': [int(label) for label in self.best_estimator_.classes_],
+            'positive_class': BAD_LABEL,
+            'scoring': self.scoring,
+            'cv_score': best['cv_score'],
+            'test_metrics': best['test_metrics'],
+            'candidates': self.results_,
+            'cv_folds': self.cv,
+            'n_train': self.n_train_,
+            'n_test': self.n_test_,
+            'data_sha256': self.data_digest_,
+            'random_state': self.random_state,
+            'sklearn_version': sklearn.__version__,
+            'trained_at': pd.Timestamp.now(tz='UTC').isoformat(),
+        }
+
+    def save(self, model_path: str, metadata_path: str = None) -> str:
+        """
+        Saves the selected model with joblib and its metadata as JSON.
+
+        Parameters
+        ----------
+        model_path : str
+            Model file, e.g. ``api/model/best_model.pkl``.
+        metadata_path : str, optional
+            Defaults to the model path with a '.json' extension.
+
+        Returns
+        -------
+        str
+            The metadata path.
+        """
+        metadata_path = metadata_path or os.path.splitext(model_path)[0] + '.json'
+        os.makedirs(os.path.dirname(os.path.abspath(model_path)), exist_ok=True)
+        joblib.dump(self.best_estimator_, model_path)
+        with open(metadata_path, 'w') as f:
+            json.dump(self.metadata(), f, indent=2, default=_json_default)
+            f.write('\n')
+        return metadata_path
+
+
+def _json_default(value):
+    # Grid values such as max_depth=None serialize natively; NumPy scalars do not
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Select, train and export the credit risk model with a parallel, successive-halving "
+                    "hyperparameter search.")
+    parser.add_argument('features_path', help="Transaction-level features (extracted_features.csv or .parquet).")
+    parser.add_argument('rfm_path', help="Per-customer RFM scores with Risk_Label (.csv or .parquet).")
+    parser.add_argument('--model-output', default='api/model/best_model.pkl', help="Where to save the model.")
+    parser.add_argument('--metadata-output', help="Where to save the metadata (default: next to the model).")
+    parser.add_argument('--selected-features',
+                        help="Train on the features saved by scripts.feature_selection, e.g. "
+                             "api/model/selected_features.json (default: the served feature set).")
+    parser.add_argument('--models', nargs='+', choices=list(candidate_models()),
+                        help="Candidates to search (default: all).")
+    parser.add_argument('--scoring', default='roc_auc', help="sklearn scorer used for selection.")
+    parser.add_argument('--cv', type=int, default=5, help="Cross-validation folds.")
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Worker processes (-1 uses every CPU).")
+    parser.add_argument('--cache-dir', help="Persistent cache of fitted scalers (default: temporary).")
+    parser.add_argument('--data-cache-dir',
+                        help="Columnar cache of the CSV inputs, e.g. data/cache (default: no cache).")
+    parser.add_argument('--no-early-stopping', action='store_true',
+                        help="Always fit every gradient boosting stage.")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed.")
+    args = parser.parse_args()
+
+    def read(path):
+        return read_table(path, cache_dir=args.data_cache_dir)
+
+    features = None
+    if args.selected_features:
+        # Imported here, as feature_selection itself builds on this module
+        from scripts.feature_selection import load_selected_features
+        features = load_selected_features(args.selected_features)
+    X, y = build_training_frame(read(args.features_path), read(args.rfm_path), features)
+    candidates = candidate_models(early_stopping=not args.no_early_stopping, random_state=args.seed)
+    if args.models:
+        candidates = {name: candidates[name] for name in args.models}
+    trainer = ModelTrainer(candidates, scoring=args.scoring, cv=args.cv, n_jobs=args.n_jobs,
+                           cache_dir=args.cache_dir, random_state=args.seed).fit(X, y)
+    metadata_path = trainer.save(args.model_output, args.metadata_output)
+
+    for name, result in trainer.results_.items():
+        marker = '*' if name == trainer.best_name_ else ' '
+        print(f"{marker} {name:<20} cv {args.scoring}={result['cv_score']:.4f}  "
+              f"test roc_auc={result['test_metrics']['roc_auc']:.4f}  "
+              f"{result['search_seconds']:.1f}s  {result['best_params']}")
+    print(f"Model saved to '{args.model_output}', metadata to '{metadata_path}'.")
+
+
+if __name__ == '__main__':
+    main()
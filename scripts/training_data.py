@@ -0,0 +1,400 @@
+import argparse
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from scripts.cache import FeatureCache
+from scripts.credit_scoring_model import RFMAccumulator, RFMScorer
+from scripts.data_loader import csv_byte_ranges, read_csv_range
+from scripts.feature_engineering import FeatureEngineering
+from scripts.preprocessing import FeaturePreprocessor
+
+# Xente columns not used as features, as in the feature engineering notebook
+DROP_COLUMNS = ['ProductId', 'BatchId', 'AccountId', 'ProviderId', 'SubscriptionId',
+                'Value', 'CountryCode', 'CurrencyCode']
+
+# Input position, used to restore the input order after partitioning: the index of the
+# input range in the high 32 bits and the row within the range in the low 32 bits
+ROW_COLUMN = '_row'
+RANGE_SHIFT = 32
+
+# Default number of customer partitions, independent of the machine so outputs are too
+DEFAULT_PARTITIONS = 64
+
+
+def partition_of(customer_ids, n_partitions: int) -> np.ndarray:
+    """
+    Assigns transactions to partitions by a hash of their CustomerId.
+
+    The hash is stable across processes and runs, so every transaction of a customer lands
+    in the same partition and all customer-level features can be computed per partition.
+
+    Returns
+    -------
+    np.ndarray
+        Partition number of each transaction, between 0 and ``n_partitions - 1``.
+    """
+    hashes = pd.util.hash_array(np.asarray(customer_ids))
+    return (hashes % np.uint64(n_partitions)).astype(np.int64)
+
+
+def engineer_partition(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Computes the engineered features of one partition of transactions, before encoding and
+    scaling: the customer aggregate and transaction features and the time features.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        All transactions of the customers in the partition.
+
+    Returns
+    -------
+    pd.DataFrame
+        The transactions without ``DROP_COLUMNS``, with the engineered features added.
+    """
+    df = df.drop(columns=[col for col in DROP_COLUMNS if col in df.columns])
+    fe = FeatureEngineering()
+    df = fe.create_customer_features(df)
+    return fe.extract_time_features(df)
+
+
+def _write_arrow(df: pd.DataFrame, path: str) -> str:
+    # Uncompressed Arrow IPC files can be memory-mapped when they are read back
+    df.reset_index(drop=True).to_feather(path, compression='uncompressed')
+    return path
+
+
+def _read_partition(frames: list, paths: list) -> pd.DataFrame:
+    parts = list(frames) + [pd.read_feather(path) for path in paths]
+    df = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+    return df.sort_values(ROW_COLUMN, kind='stable', ignore_index=True)
+
+
+def _split_task(task: tuple) -> tuple:
+    """Pool task: reads one input range and splits it by customer partition."""
+    index, source, n_partitions, spill_bytes, work_dir = task
+    if isinstance(source, pd.DataFrame):
+        chunk = source.reset_index(drop=True)
+    else:
+        chunk = read_csv_range(*source)
+    chunk[ROW_COLUMN] = (np.int64(index) << RANGE_SHIFT) + np.arange(len(chunk), dtype=np.int64)
+    partitions = partition_of(chunk['CustomerId'], n_partitions)
+    order = np.argsort(partitions, kind='stable')
+    bounds = np.searchsorted(partitions[order], np.arange(n_partitions + 1))
+    spill = int(chunk.memory_usage(deep=True).sum()) > spill_bytes
+    parts = {}
+    for p in range(n_partitions):
+        if bounds[p] < bounds[p + 1]:
+            part = chunk.iloc[order[bounds[p]:bounds[p + 1]]]
+            if spill:
+                part = _write_arrow(part, os.path.join(work_dir, f'raw-{p:05d}-{index:05d}.arrow'))
+            parts[p] = part
+    return parts, len(chunk)
+
+
+def _engineer_task(task: tuple) -> tuple:
+    """Pool task: engineers one partition and fits partial encoding, scaling and RFM state."""
+    partition, parts, work_dir, method, cache_dir = task
+    frames = [part for part in parts if isinstance(part, pd.DataFrame)]
+    paths = [part for part in parts if not isinstance(part, pd.DataFrame)]
+    df = _read_partition(frames, paths)
+    if cache_dir is None:
+        engineered = engineer_partition(df)
+    else:
+        # Keyed on the partition content and the feature engineering source
+        engineered, _ = FeatureCache(cache_dir).apply(engineer_partition, df)
+    path = _write_arrow(engineered, os.path.join(work_dir, f'features-{partition:05d}.arrow'))
+    for spilled in paths:
+        os.remove(spilled)
+    preprocessor = FeaturePreprocessor(
+        method=method, exclude_cols=['Amount', 'TransactionId', 'CustomerId', ROW_COLUMN])
+    preprocessor.partial_fit(engineered)
+    return partition, path, preprocessor, RFMAccumulator().update(df), len(df)
+
+
+def _transform_task(task: tuple) -> str:
+    """Pool task: encodes, scales and imputes one engineered partition with the global parameters."""
+    partition, path, preprocessor, impute, work_dir = task
+    df = preprocessor.transform(pd.read_feather(path))
+    if impute:
+        # Missing values get the training mean, on the scaled axis
+        fill = (preprocessor.mean_ - preprocessor.offset_) / preprocessor.scale_
+        df[preprocessor.numeric_cols_] = df[preprocessor.numeric_cols_].fillna(
+            dict(zip(preprocessor.numeric_cols_, fill)))
+    os.remove(path)
+    return _write_arrow(df, os.path.join(work_dir, f'final-{partition:05d}.arrow'))
+
+
+def _write_task(task: tuple) -> str:
+    """Pool task: writes the output rows of one input range, in input order, to a part file."""
+    index, paths, part_path = task
+    lo_row, hi_row = index << RANGE_SHIFT, (index + 1) << RANGE_SHIFT
+    slices = []
+    for path in paths:
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        # Each partition is sorted by input position, so a range is one slice per partition
+        lo, hi = np.searchsorted(table.column(ROW_COLUMN).to_numpy(), [lo_row, hi_row])
+        if hi > lo:
+            slices.append(table.slice(lo, hi - lo).to_pandas())
+    block = pd.concat(slices, ignore_index=True)
+    block = block.sort_values(ROW_COLUMN, kind='stable').drop(columns=ROW_COLUMN)
+    if part_path.endswith('.parquet'):
+        block.to_parquet(part_path, index=False)
+    else:
+        block.to_csv(part_path, header=index == 0, index=False)
+    return part_path
+
+
+class TrainingSetBuilder:
+    """
+    Builds the training feature table in parallel and out of core.
+
+    The input CSV is cut into byte ranges of whole lines, which worker processes of a
+    ``ProcessPoolExecutor`` parse and hash-partition by CustomerId. Partitions stay in memory
+    while the input fits in ``memory_limit_mb`` and are spilled to Arrow files in a work
+    directory otherwise. Every customer-level feature only depends on the customer's own
+    transactions, so partitions are then engineered independently.
+
+    Parameters that need the whole table are combined from per-partition state: the label
+    encoding and scaling with ``FeaturePreprocessor.partial_fit``/``merge``, and the RFM
+    values with ``RFMAccumulator.merge`` before fitting the RFM quartiles with
+    ``RFMScorer`` on all customers. A second parallel pass encodes and scales the partitions,
+    and each worker writes the rows of one input range back in input order from memory-mapped
+    files. The parts are concatenated in range order, so the output does not depend on the
+    number of partitions or workers and matches a single-process build.
+
+    Outputs
+    -------
+    - The transaction-level features (``extracted_features.csv``): the input columns without
+      ``DROP_COLUMNS``, the customer and time features, categorical columns label-encoded
+      and numeric columns scaled (except Amount and the ids), missing values imputed with
+      the column mean.
+    - Optionally, per-customer Recency, Frequency, Monetary, quartiles, RFM_Score and
+      Risk_Label, sorted by CustomerId.
+    - Optionally, the fitted ``FeaturePreprocessor``.
+    """
+
+    def __init__(self, n_workers: int = None, n_partitions: int = None, memory_limit_mb: float = 512,
+                 chunk_mb: float = 32, chunksize: int = 100_000, work_dir: str = None,
+                 method: str = 'standardize', impute: bool = True, cache_dir: str = None):
+        """
+        Parameters
+        ----------
+        n_workers : int, optional
+            Worker processes. Defaults to the number of CPUs; 1 runs everything in process.
+        n_partitions : int, optional
+            Number of customer partitions. Many more partitions than workers keep the work
+            balanced when customers have very different numbers of transactions. The output
+            is identical for any number of workers and memory limit; with a different number
+            of partitions the scaled features can differ by floating-point rounding, as the
+            column moments are summed in a different order.
+        memory_limit_mb : float, optional
+            In-memory size of the input above which partitions are spilled to disk.
+        chunk_mb : float, optional
+            Largest CSV byte range parsed by one task; smaller files are split evenly
+            between the workers.
+        chunksize : int, optional
+            Rows per task when the source is a DataFrame.
+        work_dir : str, optional
+            Directory for spilled and intermediate partitions. Defaults to the system
+            temporary directory; it is cleaned up after the build.
+        method : str, optional
+            The method for scaling ('standardize' or 'normalize').
+        impute : bool, optional
+            Fill remaining missing values (e.g. Std_Transaction_Amount of single-transaction
+            customers) with the column mean.
+        cache_dir : str, optional
+            ``FeatureCache`` directory for the engineered partitions, so rebuilding from an
+            unchanged input with unchanged feature code skips feature engineering.
+        """
+        self.n_workers = max(int(n_workers or os.cpu_count() or 1), 1)
+        self.n_partitions = max(int(n_partitions or DEFAULT_PARTITIONS), 1)
+        self.memory_limit_bytes = memory_limit_mb * 2**20
+        self.chunk_bytes = int(chunk_mb * 2**20)
+        self.chunksize = chunksize
+        self.work_dir = work_dir
+        self.method = method
+        self.impute = impute
+        self.cache_dir = cache_dir
+
+    def build(self, source, output_path: str, rfm_output_path: str = None,
+              preprocessor_path: str = None, end_date: pd.Timestamp = None) -> dict:
+        """
+        Builds the training tables.
+
+        Parameters
+        ----------
+        source : str or pd.DataFrame
+            A Xente-format CSV file, read in byte ranges with ``read_csv_range``, or a
+            DataFrame of transactions.
+        output_path : str
+            Transaction-level features; '.parquet' files are written as Parquet, anything
+            else as CSV.
+        rfm_output_path : str, optional
+            Per-customer RFM scores and labels, in the same formats.
+        preprocessor_path : str, optional
+            Where to save the fitted ``FeaturePreprocessor``.
+        end_date : pd.Timestamp, optional
+            Reference time for Recency. Defaults to the current UTC time.
+
+        Returns
+        -------
+        dict
+            Number of rows, customers, partitions and spilled files.
+        """
+        end_date = pd.Timestamp.utcnow() if end_date is None else end_date
+        work_dir = tempfile.mkdtemp(prefix='training-data-', dir=self.work_dir)
+        try:
+            sources = self._sources(source)
+            # Each task keeps its partitions in memory if all tasks together fit the limit
+            spill_bytes = self.memory_limit_bytes / max(len(sources), 1)
+            with self._executor() as executor:
+                partitions = [[] for _ in range(self.n_partitions)]
+                n_rows = 0
+                n_spilled = 0
+                for parts, n in executor.map(_split_task, [
+                        (index, part, self.n_partitions, spill_bytes, work_dir)
+                        for index, part in enumerate(sources)]):
+                    n_rows += n
+                    for p, part in parts.items():
+                        partitions[p].append(part)
+                        n_spilled += not isinstance(part, pd.DataFrame)
+                tasks = [(p, parts, work_dir, self.method, self.cache_dir)
+                         for p, parts in enumerate(partitions) if parts]
+                del partitions
+
+                results = list(executor.map(_engineer_task, tasks))
+                preprocessor = None
+                rfm = RFMAccumulator()
+                # Merge in partition order, so the fitted parameters are deterministic
+                for _, _, partial, accumulator, _ in results:
+                    preprocessor = partial if preprocessor is None else preprocessor.merge(partial)
+                    rfm.merge(accumulator)
+                final_paths = list(executor.map(_transform_task, [
+                    (partition, path, preprocessor, self.impute, work_dir)
+                    for partition, path, _, _, _ in results]))
+
+                extension = '.parquet' if output_path.endswith('.parquet') else '.csv'
+                part_paths = list(executor.map(_write_task, [
+                    (index, final_paths, os.path.join(work_dir, f'part-{index:05d}{extension}'))
+                    for index in range(len(sources))])) if final_paths else []
+
+            self._concat_parts(part_paths, output_path)
+            rfm_data = self.score_rfm(rfm, end_date)
+            if rfm_output_path:
+                self._write_frame(rfm_data, rfm_output_path)
+            if preprocessor_path and preprocessor is not None:
+                preprocessor.save(preprocessor_path)
+            return {
+                'rows': n_rows,
+                'customers': len(rfm_data),
+                'partitions': len(tasks),
+                'spilled_files': n_spilled,
+            }
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    @staticmethod
+    def score_rfm(rfm: RFMAccumulator, end_date: pd.Timestamp) -> pd.DataFrame:
+        """
+        Scores the merged RFM values of all customers.
+
+        Returns
+        -------
+        pd.DataFrame
+            CustomerId, Recency, Frequency, Monetary, quartiles, RFM_Score and Risk_Label,
+            sorted by CustomerId.
+        """
+        rfm_data = rfm.to_frame(end_date).sort_values('CustomerId', ignore_index=True)
+        if len(rfm_data) == 0:
+            return rfm_data
+        scores = RFMScorer().fit(rfm_data).transform(rfm_data)
+        return pd.concat([rfm_data, scores], axis=1)
+
+    def _sources(self, source) -> list:
+        """Cuts the input into tasks: CSV byte ranges or DataFrame slices, in input order."""
+        if isinstance(source, pd.DataFrame):
+            return [source.iloc[start:start + self.chunksize]
+                    for start in range(0, len(source), self.chunksize)]
+        size = os.path.getsize(source)
+        target = min(self.chunk_bytes, max(-(-size // self.n_workers), 1))
+        names, ranges = csv_byte_ranges(source, target)
+        return [(source, start, end, names) for start, end in ranges]
+
+    def _executor(self):
+        if self.n_workers == 1:
+            return _InProcessExecutor()
+        return ProcessPoolExecutor(max_workers=self.n_workers)
+
+    @classmethod
+    def _concat_parts(cls, paths: list, output_path: str) -> None:
+        if not paths:
+            cls._write_frame(pd.DataFrame(), output_path)
+        elif output_path.endswith('.parquet'):
+            with pq.ParquetWriter(output_path, pq.read_schema(paths[0])) as writer:
+                for path in paths:
+                    writer.write_table(pq.read_table(path))
+        else:
+            with open(output_path, 'wb') as output:
+                for path in paths:
+                    with open(path, 'rb') as part:
+                        shutil.copyfileobj(part, output, 2**20)
+
+    @staticmethod
+    def _write_frame(df: pd.DataFrame, path: str) -> None:
+        if path.endswith('.parquet'):
+            df.to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False)
+
+
+class _InProcessExecutor:
+    """Runs ``map`` sequentially in the current process; used when there is a single worker."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def map(self, func, tasks):
+        return map(func, tasks)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the training feature table (extracted_features.csv) and RFM labels in "
+                    "parallel, partitioned by customer, with bounded memory.")
+    parser.add_argument('data_path', help="Xente-format CSV of raw transactions.")
+    parser.add_argument('--output', default='data/extracted_features.csv',
+                        help="Transaction-level features (.csv or .parquet).")
+    parser.add_argument('--rfm-output', default='data/rfm_scores.csv',
+                        help="Per-customer RFM scores and Risk_Label (.csv or .parquet).")
+    parser.add_argument('--preprocessor-output', help="Also save the fitted FeaturePreprocessor here.")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: number of CPUs).")
+    parser.add_argument('--partitions', type=int, help=f"Customer partitions (default: {DEFAULT_PARTITIONS}).")
+    parser.add_argument('--memory-limit-mb', type=float, default=512,
+                        help="In-memory input size above which partitions are spilled to disk.")
+    parser.add_argument('--work-dir', help="Directory for spilled partitions (default: system temp dir).")
+    parser.add_argument('--method', default='standardize', choices=['standardize', 'normalize'])
+    parser.add_argument('--cache-dir', help="Columnar cache of engineered partitions, e.g. data/cache.")
+    args = parser.parse_args()
+
+    builder = TrainingSetBuilder(n_workers=args.workers, n_partitions=args.partitions,
+                                 memory_limit_mb=args.memory_limit_mb, work_dir=args.work_dir,
+                                 method=args.method, cache_dir=args.cache_dir)
+    summary = builder.build(args.data_path, args.output, args.rfm_output, args.preprocessor_output)
+    print(f"Built {summary['rows']} rows for {summary['customers']} customers in "
+          f"{summary['partitions']} partitions ({summary['spilled_files']} spilled files); "
+          f"features saved to '{args.output}', RFM scores to '{args.rfm_output}'.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+import argparse
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.special import expit
+from sklearn.ensemble import (ExtraTreesClassifier, GradientBoostingClassifier,
+                              RandomForestClassifier)
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier, ExtraTreeClassifier
+
+
+class CompiledTreeEnsemble:
+    """
+    A trained tree ensemble flattened into contiguous NumPy node arrays.
+
+    ``from_sklearn`` exports a fitted ``GradientBoostingClassifier`` (binary), random
+    forest, extra trees or decision tree classifier, optionally behind a ``Pipeline`` of
+    ``StandardScaler`` steps. The nodes of all trees are concatenated into one set of
+    arrays (split feature, threshold, children, leaf values) and ``predict_proba``
+    walks every tree for every row at once, one vectorized step per tree level, instead
+    of going through sklearn's per-call validation and per-estimator dispatch.
+
+    Predictions and probabilities are identical to sklearn's: inputs are scaled in
+    float64, cast to float32 before the threshold comparisons like sklearn trees do,
+    and tree outputs are accumulated in the same order.
+
+    Attributes
+    ----------
+    kind : str
+        'gradient_boosting' or 'forest'.
+    classes_ : np.ndarray
+        Class labels, as in the exported estimator.
+    feature_names_in_ : np.ndarray or None
+        Input column names used to reorder DataFrame inputs.
+    roots : np.ndarray
+        Index of each tree's root node.
+    max_depth : int
+        Number of levels walked per prediction.
+    link_scale : float
+        Gradient boosting only: the probability is ``expit(link_scale * raw)``; 1 for
+        'log_loss' and 2 for 'exponential' loss, like sklearn's inverse link functions.
+    """
+
+    # Inverse link of each supported GradientBoostingClassifier loss, as a factor on the raw score
+    LINK_SCALES = {'log_loss': 1.0, 'exponential': 2.0}
+    link_scale = 1.0
+
+    SUPPORTED_ESTIMATORS = (GradientBoostingClassifier, RandomForestClassifier,
+                            ExtraTreesClassifier, DecisionTreeClassifier, ExtraTreeClassifier)
+
+    @classmethod
+    def from_sklearn(cls, model) -> "CompiledTreeEnsemble":
+        """
+        Flattens a fitted sklearn tree classifier (or pipeline ending in one).
+
+        Parameters
+        ----------
+        model : Pipeline or estimator
+            A fitted classifier from ``SUPPORTED_ESTIMATORS``, optionally preceded by
+            ``StandardScaler`` or 'passthrough' pipeline steps.
+
+        Returns
+        -------
+        CompiledTreeEnsemble
+            The compiled model.
+        """
+        compiled = cls()
+        compiled.offset_ = None
+        compiled.scale_ = None
+        estimator = model
+        if isinstance(model, Pipeline):
+            for _, step in model.steps[:-1]:
+                compiled._add_scaler(step)
+            estimator = model.steps[-1][1]
+        if not isinstance(estimator, cls.SUPPORTED_ESTIMATORS):
+            raise TypeError(f"Cannot compile {type(estimator).__name__}; supported estimators are "
+                            f"{[est.__name__ for est in cls.SUPPORTED_ESTIMATORS]}.")
+
+        compiled.classes_ = np.asarray(estimator.classes_)
+        compiled.n_features_in_ = model.n_features_in_
+        compiled.feature_names_in_ = getattr(model, 'feature_names_in_', None)
+
+        if isinstance(estimator, GradientBoostingClassifier):
+            if estimator.n_trees_per_iteration_ != 1:
+                raise NotImplementedError("Only binary GradientBoostingClassifier models can be compiled.")
+            if estimator.init_ != 'zero' and not hasattr(estimator.init_, 'class_prior_'):
+                raise NotImplementedError("Only the default (prior) or 'zero' init estimator is supported.")
+            if estimator.loss not in cls.LINK_SCALES:
+                raise NotImplementedError(f"Cannot compile loss {estimator.loss!r}; supported losses are "
+                                          f"{list(cls.LINK_SCALES)}.")
+            compiled.link_scale = cls.LINK_SCALES[estimator.loss]
+            compiled.kind = 'gradient_boosting'
+            trees = [tree.tree_ for tree in estimator.estimators_[:, 0]]
+            compiled.learning_rate = float(estimator.learning_rate)
+            # The init estimator predicts the same raw score for every row
+            init_input = np.zeros((1, compiled.n_features_in_), dtype=np.float32)
+            compiled.init_raw = float(estimator._raw_predict_init(init_input)[0, 0])
+            compiled.allow_nan = False
+            leaf_values = [tree.value[:, 0, 0][:, np.newaxis] for tree in trees]
+        else:
+            compiled.kind = 'forest'
+            estimators = getattr(estimator, 'estimators_', [estimator])
+            trees = [tree.tree_ for tree in estimators]
+            if any(tree.n_outputs != 1 for tree in trees):
+                raise NotImplementedError("Multi-output trees cannot be compiled.")
+            compiled.allow_nan = True
+            leaf_values = []
+            for tree in trees:
+                # Same normalization as DecisionTreeClassifier.predict_proba
+                proba = tree.value[:, 0, :len(compiled.classes_)].astype(np.float64)
+                normalizer = proba.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                leaf_values.append(proba / normalizer)
+
+        compiled._flatten(trees, leaf_values)
+        return compiled
+
+    def _add_scaler(self, step) -> None:
+        if step is None or step == 'passthrough':
+            return
+        if not isinstance(step, StandardScaler):
+            raise TypeError(f"Cannot compile pipeline step {type(step).__name__}; "
+                            f"only StandardScaler steps are supported.")
+        if self.offset_ is not None or self.scale_ is not None:
+            raise NotImplementedError("Only one StandardScaler step is supported.")
+        self.offset_ = None if step.mean_ is None else np.asarray(step.mean_, dtype=np.float64)
+        self.scale_ = None if step.scale_ is None else np.asarray(step.scale_, dtype=np.float64)
+
+    def _flatten(self, trees: list, leaf_values: list) -> None:
+        sizes = np.array([tree.node_count for tree in trees])
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        n_nodes = int(sizes.sum())
+
+        self.feature = np.zeros(n_nodes, dtype=np.intp)
+        self.threshold = np.zeros(n_nodes, dtype=np.float64)
+        self.left = np.empty(n_nodes, dtype=np.intp)
+        self.right = np.empty(n_nodes, dtype=np.intp)
+        self.missing_left = np.zeros(n_nodes, dtype=bool)
+        for tree, start, size in zip(trees, starts, sizes):
+            nodes = slice(start, start + size)
+            is_leaf = tree.children_left < 0
+            # Leaves point to themselves, so rows that reached a leaf stay there
+            own_index = np.arange(start, start + size)
+            self.left[nodes] = np.where(is_leaf, own_index, tree.children_left + start)
+            self.right[nodes] = np.where(is_leaf, own_index, tree.children_right + start)
+            self.feature[nodes] = np.where(is_leaf, 0, tree.feature)
+            self.threshold[nodes] = tree.threshold
+            missing_left = getattr(tree, 'missing_go_to_left', None)
+            if missing_left is not None:
+                self.missing_left[nodes] = missing_left.astype(bool)
+
+        self.value = np.ascontiguousarray(np.concatenate(leaf_values), dtype=np.float64)
+        self.roots = starts.astype(np.intp)
+        self.max_depth = int(max(tree.max_depth for tree in trees))
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def apply(self, X) -> np.ndarray:
+        """
+        Returns the leaf reached in every tree for every row.
+
+        Parameters
+        ----------
+        X : pd.DataFrame or array-like
+            Model inputs, before scaling.
+
+        Returns
+        -------
+        np.ndarray
+            Global node indices of shape ``(n_rows, n_trees)``.
+        """
+        return self._apply(self._prepare(X))
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Predicts class probabilities, identical to the exported estimator's ``predict_proba``.
+
+        Parameters
+        ----------
+        X : pd.DataFrame or array-like
+            Model inputs, before scaling.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape ``(n_rows, n_classes)``.
+        """
+        X = self._prepare(X)
+        if self.kind == 'gradient_boosting':
+            raw = self._raw_predict(X)
+            proba = np.empty((len(raw), 2), dtype=np.float64)
+            proba[:, 1] = expit(self.link_scale * raw)
+            proba[:, 0] = 1 - proba[:, 1]
+            return proba
+        return self._forest_proba(X)
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Predicts class labels, identical to the exported estimator's ``predict``.
+
+        Parameters
+        ----------
+        X : pd.DataFrame or array-like
+            Model inputs, before scaling.
+
+        Returns
+        -------
+        np.ndarray
+            One label from ``classes_`` per row.
+        """
+        X = self._prepare(X)
+        if self.kind == 'gradient_boosting':
+            encoded = (self._raw_predict(X) >= 0).astype(np.intp)
+        else:
+            encoded = np.argmax(self._forest_proba(X), axis=1)
+        return self.classes_.take(encoded, axis=0)
+
+    def save(self, path: str) -> None:
+        """Saves the compiled model uncompressed, so it can be loaded with ``mmap_mode='r'``."""
+        joblib.dump(self, path, compress=0)
+
+    @staticmethod
+    def load(path: str, mmap_mode: str = None) -> "CompiledTreeEnsemble":
+        """Loads a model saved with ``save``, optionally memory-mapping its node arrays."""
+        compiled = joblib.load(path, mmap_mode=mmap_mode)
+        if not isinstance(compiled, CompiledTreeEnsemble):
+            raise TypeError(f"Expected a CompiledTreeEnsemble in '{path}', found {type(compiled)}")
+        return compiled
+
+    def _prepare(self, X) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            # Column selection is slow on small frames; skip it when the order already matches
+            if self.feature_names_in_ is not None and not np.array_equal(X.columns, self.feature_names_in_):
+                X = X[list(self.feature_names_in_)]
+            X = X.to_numpy(dtype=np.float64, copy=True)
+        else:
+            X = np.array(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected input of shape (n_rows, {self.n_features_in_}), got {X.shape}.")
+        # Same operations as StandardScaler.transform, then the float32 cast of sklearn trees
+        if self.offset_ is not None:
+            X -= self.offset_
+        if self.scale_ is not None:
+            X /= self.scale_
+        X = X.astype(np.float32)
+        if not self.allow_nan and not np.isfinite(X).all():
+            raise ValueError("Input X contains NaN or infinity.")
+        return X
+
+    def _apply(self, X: np.ndarray) -> np.ndarray:
+        node = np.tile(self.roots, (len(X), 1))
+        rows = np.arange(len(X))[:, np.newaxis]
+        has_nan = self.allow_nan and np.isnan(X).any()
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            go_left = x <= self.threshold[node]
+            if has_nan:
+                go_left |= np.isnan(x) & self.missing_left[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def _raw_predict(self, X: np.ndarray) -> np.ndarray:
+        terms = np.empty((len(X), self.n_trees + 1), dtype=np.float64)
+        terms[:, 0] = self.init_raw
+        terms[:, 1:] = self.learning_rate * self.value[self._apply(X), 0]
+        # Sequential accumulation, in the same order as sklearn's predict_stages
+        return np.add.accumulate(terms, axis=1)[:, -1]
+
+    def _forest_proba(self, X: np.ndarray) -> np.ndarray:
+        # (n_trees, n_rows, n_classes), summed tree by tree like RandomForestClassifier
+        leaf_proba = self.value[self._apply(X).T]
+        proba = np.add.accumulate(leaf_proba, axis=0)[-1]
+        proba /= self.n_trees
+        return proba
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Flatten a trained tree model into a CompiledTreeEnsemble for fast serving.")
+    parser.add_argument('model_path', nargs='?', default='api/model/best_model.pkl',
+                        help="Trained sklearn model saved with joblib.")
+    parser.add_argument('--output', default='api/model/compiled_model.pkl',
+                        help="Where to write the compiled model.")
+    args = parser.parse_args()
+
+    CompiledTreeEnsemble.from_sklearn(joblib.load(args.model_path)).save(args.output)
+    print(f"Compiled model saved to '{args.output}'.")
+
+
+if __name__ == '__main__':
+    main()
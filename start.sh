@@ -1,2 +1,2 @@
 #!/bin/bash
-uvicorn api:app --host 0.0.0.0 --port ${PORT}
\ No newline at end of file
+python -m api.serve --host 0.0.0.0 --port ${PORT}
\ No newline at end of file
@@ -0,0 +1,278 @@
+import unittest
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+import httpx
+from fastapi.testclient import TestClient
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import api.api
+from api.api import app, engineer_features, records_to_frame, InputData, REQUIRED_FEATURES
+from api.batcher import MicroBatcher
+from api.executor import InferenceExecutor
+from api.result_cache import PredictionCache
+from scripts.feature_pipeline import FeaturePipeline
+from scripts.feature_store import CustomerFeatureStore
+from scripts.preprocessing import fit_preprocessor
+
+
+def make_payload(transaction_id, customer_id, amount=1000.0):
+    return {
+        "TransactionId": transaction_id,
+        "CustomerId": customer_id,
+        "ProductCategory": 2,
+        "ChannelId": "ChannelId_3",
+        "Amount": amount,
+        "TransactionStartTime": "2018-11-15T02:18:49Z",
+        "PricingStrategy": 2,
+    }
+
+
+class TestPredictAPI(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(app)
+        # A fresh result cache per test, so earlier tests cannot answer for later ones
+        self.cache = PredictionCache(namespace="test")
+        cache_patcher = patch("api.api.prediction_cache", self.cache)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+        self.payloads = [
+            make_payload(1, 10),
+            make_payload(2, 11, amount=-50.0),
+            make_payload(3, 10, amount=20.0),
+        ]
+
+    def test_predict_single(self):
+        response = self.client.post("/predict", json=self.payloads[0])
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["customer_id"], 10)
+        self.assertIn(body["predicted_risk"], ["Good", "Bad"])
+
+    def test_predict_returns_probability_score_and_loan_terms(self):
+        body = self.client.post("/predict", json=self.payloads[0]).json()
+        probability = body["risk_probability"]
+        self.assertTrue(0.0 <= probability <= 1.0)
+        self.assertEqual(body["predicted_risk"], "Bad" if probability >= 0.5 else "Good")
+        self.assertEqual(body["credit_score"], int(api.api.get_scorecard().score([probability])[0]))
+        amount, term = api.api.get_scorecard().loan_terms([body["credit_score"]])
+        self.assertEqual((body["loan_amount"], body["loan_term_months"]), (amount[0], term[0]))
+
+    def test_batch_labels_match_model_predict(self):
+        records = [InputData(**make_payload(i, i % 4, amount=25.0 * i - 100)) for i in range(12)]
+        results = api.api.predict_records(records)
+        final_df = engineer_features(records_to_frame(records))
+        expected = api.api.label_predictions(api.api.get_model().predict(final_df))
+        self.assertEqual([result["predicted_risk"] for result in results], expected)
+
+    def test_predict_batch_json_preserves_order(self):
+        response = self.client.post("/predict/batch", json=self.payloads)
+        self.assertEqual(response.status_code, 200)
+        predictions = response.json()["predictions"]
+        self.assertEqual([p["transaction_id"] for p in predictions], [1, 2, 3])
+        self.assertEqual([p["customer_id"] for p in predictions], [10, 11, 10])
+        for p in predictions:
+            self.assertIn(p["predicted_risk"], ["Good", "Bad"])
+
+    def test_predict_batch_ndjson(self):
+        body = "\n".join(json.dumps(p) for p in self.payloads)
+        response = self.client.post(
+            "/predict/batch",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        self.assertEqual(response.status_code, 200)
+        predictions = response.json()["predictions"]
+        self.assertEqual([p["transaction_id"] for p in predictions], [1, 2, 3])
+
+    def test_predict_batch_with_fitted_preprocessor(self):
+        training = pd.DataFrame(self.payloads)
+        training["TransactionStartTime"] = pd.to_datetime(training["TransactionStartTime"])
+        pipeline = FeaturePipeline(REQUIRED_FEATURES, preprocessor=fit_preprocessor(training))
+        with patch("api.api.feature_pipeline", pipeline):
+            response = self.client.post("/predict/batch", json=self.payloads)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["predictions"]), 3)
+
+    def test_feature_store_accumulates_history(self):
+        records = [InputData(**payload) for payload in self.payloads]
+        pipeline = FeaturePipeline(REQUIRED_FEATURES, feature_store=CustomerFeatureStore())
+        with patch("api.api.feature_pipeline", pipeline):
+            first = engineer_features(records_to_frame(records[:1]))
+            second = engineer_features(records_to_frame(records[1:]))
+        self.assertEqual(first["Frequency"].tolist(), [1])
+        # Customer 10 now has two transactions across both requests
+        self.assertEqual(second["Frequency"].tolist(), [1, 2])
+
+    def test_predict_batch_empty(self):
+        response = self.client.post("/predict/batch", json=[])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"predictions": []})
+
+    def test_predict_batch_invalid_record(self):
+        payload = dict(self.payloads[0])
+        del payload["Amount"]
+        response = self.client.post("/predict/batch", json=[payload])
+        self.assertEqual(response.status_code, 400)
+
+    def test_overloaded_executor_returns_503(self):
+        executor = InferenceExecutor(max_workers=1, max_pending=1)
+        executor.pending = executor.max_pending
+        with patch("api.api.executor", executor):
+            single = self.client.post("/predict", json=self.payloads[0])
+            batch = self.client.post("/predict/batch", json=self.payloads)
+        executor.shutdown()
+        for response in (single, batch):
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response.headers["retry-after"], "1")
+
+    def test_micro_batching_coalesces_concurrent_predicts(self):
+        batch_sizes = []
+
+        def score_and_record(rows):
+            batch_sizes.append(len(rows))
+            return api.api.score_feature_rows(rows)
+
+        batcher = MicroBatcher(score_and_record, run=api.api.run_in_executor, max_wait_ms=200)
+
+        async def main():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(
+                    *(client.post("/predict", json=payload) for payload in self.payloads)
+                )
+
+        with patch("api.api.batcher", batcher):
+            responses = asyncio.run(main())
+        self.assertEqual([r.json()["customer_id"] for r in responses], [10, 11, 10])
+        self.assertEqual(batch_sizes, [3])
+        # Each request is scored as if it had been sent alone
+        for payload, response in zip(self.payloads, responses):
+            alone = api.api.predict_records([InputData(**payload)])[0]
+            self.assertEqual(response.json(), {"customer_id": payload["CustomerId"], **alone})
+
+    def test_repeated_payload_is_served_from_cache(self):
+        with patch("api.api.predict_records", wraps=api.api.predict_records) as predict_records:
+            first = self.client.post("/predict", json=self.payloads[0])
+            # Same fields in a different order and with an equivalent timestamp
+            retry = dict(reversed(list(self.payloads[0].items())))
+            retry["TransactionStartTime"] = "2018-11-15T05:18:49+03:00"
+            second = self.client.post("/predict", json=retry)
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(predict_records.call_count, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_metrics_expose_request_and_stage_latency(self):
+        before = api.api.STAGE_LATENCY.count(stage="model")
+        self.client.post("/predict/batch", json=self.payloads)
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        text = response.text
+        self.assertIn('credit_api_requests_total{path="/predict/batch",status="200"}', text)
+        for stage in ("parse", "frame", "features_customer", "features_columns", "model", "scoring"):
+            self.assertIn(f'credit_api_stage_duration_seconds_count{{stage="{stage}"}}', text)
+        self.assertEqual(api.api.STAGE_LATENCY.count(stage="model"), before + 1)
+        self.assertIn("credit_api_prediction_cache_misses_total", text)
+
+    def test_request_logging_can_be_sampled_out(self):
+        with patch("api.api.REQUEST_LOG_SAMPLE_RATE", 0.0), \
+                patch("api.api.logging.log") as log:
+            response = self.client.post("/predict", json=self.payloads[0])
+        self.assertEqual(response.status_code, 200)
+        log.assert_not_called()
+
+    def test_sampled_request_logs_go_to_debug(self):
+        with patch("api.api.REQUEST_LOG_SAMPLE_RATE", 0.5), patch("api.api.random.random", return_value=0.1):
+            self.assertEqual(api.api.sample_request_log(), logging.DEBUG)
+        with patch("api.api.REQUEST_LOG_SAMPLE_RATE", 0.5), patch("api.api.random.random", return_value=0.9):
+            self.assertEqual(api.api.sample_request_log(), 0)
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_compiled_backend_matches_sklearn(self):
+        records = [InputData(**make_payload(i, i % 3, amount=10.0 * i)) for i in range(20)]
+        expected = api.api.predict_records(records)
+        with patch("api.api.model", None), patch("api.api.prediction_cache", None), \
+                patch("api.api.MODEL_BACKEND", "compiled"):
+            api.api.load_artifacts()
+            self.assertEqual(type(api.api.model).__name__, "CompiledTreeEnsemble")
+            self.assertEqual(api.api.predict_records(records), expected)
+
+    def test_lifespan_loads_model_and_warms_up(self):
+        with patch("api.api.model", None), patch("api.api.feature_pipeline", None), \
+                patch("api.api.prediction_cache", None), patch("api.api.FEATURE_STORE_PATH", ":memory:"):
+            with patch("api.api.score_features", wraps=api.api.score_features) as score_features, \
+                    TestClient(app) as client:
+                self.assertIsNotNone(api.api.model)
+                # The warm-up runs the same scoring path as requests
+                score_features.assert_called_once()
+                # The warm-up prediction must not leave history in the feature store
+                self.assertEqual(len(api.api.feature_pipeline.feature_store), 0)
+                response = client.post("/predict", json=make_payload(1, 10))
+                self.assertEqual(response.status_code, 200)
+
+    def test_model_loads_lazily_without_lifespan(self):
+        with patch("api.api.model", None), patch("api.api.feature_pipeline", None), \
+                patch("api.api.prediction_cache", None):
+            response = TestClient(app).post("/predict", json=make_payload(1, 10))
+            self.assertEqual(response.status_code, 200)
+            self.assertIsNotNone(api.api.model)
+
+    def test_selected_features_file_sets_the_model_features(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "selected_features.json")
+            with open(path, "w") as f:
+                json.dump({"features": REQUIRED_FEATURES}, f)
+            with patch("api.api.feature_pipeline", None), patch("api.api.SELECTED_FEATURES_PATH", path):
+                api.api.load_artifacts()
+                self.assertEqual(api.api.feature_pipeline.required_features, REQUIRED_FEATURES)
+
+            # A selection the model was not trained on is refused at startup
+            with open(path, "w") as f:
+                json.dump({"features": REQUIRED_FEATURES[:-1]}, f)
+            with patch("api.api.feature_pipeline", None), patch("api.api.SELECTED_FEATURES_PATH", path):
+                with self.assertRaises(ValueError):
+                    api.api.load_artifacts()
+
+    def test_selection_with_feature_missing_from_input_is_refused(self):
+        # FraudResult is a training column that /predict requests do not carry
+        features = REQUIRED_FEATURES + ["FraudResult"]
+        model = SimpleNamespace(feature_names_in_=features)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "selected_features.json")
+            with open(path, "w") as f:
+                json.dump({"features": features}, f)
+            with patch("api.api.feature_pipeline", None), patch("api.api.SELECTED_FEATURES_PATH", path), \
+                    patch("api.api.model", model):
+                with self.assertRaisesRegex(ValueError, "FraudResult"):
+                    api.api.load_artifacts()
+
+    def test_load_model_memory_mapped(self):
+        model = api.api.load_model(mmap_mode="r")
+        self.assertEqual(list(model.classes_), [0, 1])
+
+    def test_import_does_not_load_model_or_plotting(self):
+        code = (
+            "import sys; import api.api as a; "
+            "assert a.model is None; "
+            "assert not any(m.split('.')[0] in ('matplotlib', 'seaborn') for m in sys.modules)"
+        )
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+        subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
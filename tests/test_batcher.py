@@ -0,0 +1,80 @@
+import unittest
+import asyncio
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.batcher import MicroBatcher
+
+
+class TestMicroBatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+
+    def double(self, items):
+        self.calls.append(list(items))
+        return [item * 2 for item in items]
+
+    def test_concurrent_submissions_share_one_call(self):
+        batcher = MicroBatcher(self.double, max_wait_ms=50, max_batch_size=100)
+
+        async def main():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+        self.assertEqual(asyncio.run(main()), [0, 2, 4, 6, 8])
+        self.assertEqual(self.calls, [[0, 1, 2, 3, 4]])
+
+    def test_full_batch_is_processed_without_waiting(self):
+        # A window far longer than the test: only the size trigger can complete it
+        batcher = MicroBatcher(self.double, max_wait_ms=60_000, max_batch_size=2)
+
+        async def main():
+            return await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(4))), 5)
+
+        self.assertEqual(asyncio.run(main()), [0, 2, 4, 6])
+        self.assertEqual(self.calls, [[0, 1], [2, 3]])
+
+    def test_window_flushes_a_lone_request(self):
+        batcher = MicroBatcher(self.double, max_wait_ms=1, max_batch_size=100)
+        self.assertEqual(asyncio.run(batcher.submit(21)), 42)
+        self.assertEqual(self.calls, [[21]])
+
+    def test_runs_batches_through_run_callable(self):
+        ran = []
+
+        async def run(func, items):
+            ran.append(len(items))
+            return await asyncio.to_thread(func, items)
+
+        batcher = MicroBatcher(self.double, run=run, max_wait_ms=10)
+
+        async def main():
+            return await asyncio.gather(batcher.submit(1), batcher.submit(2))
+
+        self.assertEqual(asyncio.run(main()), [2, 4])
+        self.assertEqual(ran, [2])
+
+    def test_errors_reach_every_caller(self):
+        def fail(items):
+            raise ValueError("boom")
+
+        batcher = MicroBatcher(fail, max_wait_ms=10)
+
+        async def main():
+            return await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+        results = asyncio.run(main())
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            MicroBatcher(self.double, max_batch_size=0)
+        with self.assertRaises(ValueError):
+            MicroBatcher(self.double, max_wait_ms=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.api import InputData
+from benchmarks.harness import compare, measure, measure_latency
+from benchmarks.run import run_benchmarks
+from benchmarks.synthetic import XENTE_COLUMNS, api_records, generate_transactions, write_csv
+from scripts.data_loader import load_data
+
+
+class TestSyntheticTransactions(unittest.TestCase):
+
+    def test_shape_and_determinism(self):
+        df = generate_transactions(2_000, n_customers=50, seed=3)
+        self.assertEqual(list(df.columns), XENTE_COLUMNS)
+        self.assertEqual(len(df), 2_000)
+        self.assertLessEqual(df['CustomerId'].nunique(), 50)
+        self.assertTrue(df['TransactionId'].is_unique)
+        self.assertTrue((df['Amount'] < 0).any())
+        self.assertTrue(df.equals(generate_transactions(2_000, n_customers=50, seed=3)))
+
+    def test_csv_loads_like_the_xente_export(self):
+        df = generate_transactions(500, n_customers=20)
+        with tempfile.TemporaryDirectory() as tmp_dir, contextlib.redirect_stdout(io.StringIO()):
+            loaded = load_data(write_csv(df, os.path.join(tmp_dir, 'data.csv')))
+        self.assertEqual(loaded.shape, (500, len(XENTE_COLUMNS) - 1))
+        self.assertEqual(loaded.index.name, 'TransactionId')
+
+    def test_api_records_validate(self):
+        records = api_records(generate_transactions(20, n_customers=5, missing_rate=0.5))
+        self.assertEqual(len(records), 20)
+        for record in records:
+            InputData(**record)
+
+
+class TestHarness(unittest.TestCase):
+
+    def test_measure_reports_throughput_and_memory(self):
+        result = measure(lambda values: sorted(values), lambda: (list(range(1000, 0, -1)),),
+                         rows=1000, repeat=3)
+        self.assertEqual(result['repeat'], 3)
+        self.assertGreater(result['rows_per_sec'], 0)
+        self.assertGreater(result['peak_memory_mb'], 0)
+
+    def test_measure_latency_percentiles(self):
+        result = measure_latency(lambda n: sum(range(n)), [1000] * 50, warmup=5)
+        self.assertEqual(result['calls'], 45)
+        self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+
+    def test_compare_flags_slowdowns_beyond_tolerance(self):
+        parameters = {'transactions': 10}
+        baseline = {'parameters': parameters, 'benchmarks': {
+            'a': {'seconds': 1.0}, 'b': {'p50_ms': 2.0, 'p99_ms': 4.0}}}
+        results = {'parameters': parameters, 'benchmarks': {
+            'a': {'seconds': 1.2}, 'b': {'p50_ms': 2.0, 'p99_ms': 6.0}, 'new': {'seconds': 9.0}}}
+        regressions = compare(results, baseline, tolerance=0.25)
+        self.assertEqual([(r['benchmark'], r['metric']) for r in regressions], [('b', 'p99_ms')])
+        with self.assertRaises(ValueError):
+            compare({**results, 'parameters': {'transactions': 20}}, baseline)
+
+    def test_run_selected_benchmarks(self):
+        results = run_benchmarks(1_000, 50, repeat=1, only=['rfm.*'])
+        self.assertEqual(sorted(results['benchmarks']), ['rfm.calculate_rfm', 'rfm.calculate_rfm_scores'])
+        self.assertEqual(results['parameters']['transactions'], 1_000)
+
+
+if __name__ == '__main__':
+    unittest.main()
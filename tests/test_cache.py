@@ -0,0 +1,138 @@
+import unittest
+import json
+import pandas as pd
+import numpy as np
+import os
+import sys
+import tempfile
+from unittest.mock import patch, MagicMock
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.cache import FeatureCache, cached_load_data, function_digest
+from scripts.data_loader import load_data
+from scripts.feature_engineering import FeatureEngineering
+
+
+class TestFeatureCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, 'cache')
+        self.file_path = os.path.join(self.tmp_dir.name, 'data.csv')
+        pd.DataFrame({
+            'TransactionId': ['T1', 'T2', 'T3'],
+            'CustomerId': [101, 101, 102],
+            'Amount': [100.0, -20.0, 50.0],
+            'TransactionStartTime': ['2023-01-01 10:00:00', '2023-01-02 12:00:00', '2023-01-03 15:00:00'],
+        }).to_csv(self.file_path, index=False)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_load_csv_round_trip(self):
+        with patch('builtins.print'):
+            expected = load_data(self.file_path)
+            cache = FeatureCache(self.cache_dir)
+            first, key = cache.load_csv(self.file_path)
+            with patch('pandas.read_csv') as mock_read_csv:
+                second, second_key = cache.load_csv(self.file_path)
+                mock_read_csv.assert_not_called()
+        self.assertEqual(key, second_key)
+        pd.testing.assert_frame_equal(first, expected)
+        pd.testing.assert_frame_equal(second, expected)
+
+    def test_key_changes_with_content(self):
+        with patch('builtins.print'):
+            cache = FeatureCache(self.cache_dir)
+            _, key = cache.load_csv(self.file_path)
+            with open(self.file_path, 'a') as f:
+                f.write('T4,103,5.0,2023-01-04 18:00:00\n')
+            df, new_key = cache.load_csv(self.file_path)
+        self.assertNotEqual(key, new_key)
+        self.assertEqual(len(df), 4)
+
+    def test_apply_caches_stage_output(self):
+        with patch('builtins.print'):
+            cache = FeatureCache(self.cache_dir)
+            df, key = cache.load_csv(self.file_path)
+        stage = MagicMock(side_effect=FeatureEngineering.create_aggregate_features)
+        stage.__module__, stage.__qualname__ = 'tests', 'stage'
+        first, stage_key = cache.apply(stage, df.reset_index(), key=key)
+        second, second_key = cache.apply(stage, df.reset_index(), key=key)
+        self.assertEqual(stage.call_count, 1)
+        self.assertEqual(stage_key, second_key)
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_apply_does_not_modify_input(self):
+        cache = FeatureCache(self.cache_dir)
+        df = pd.DataFrame({'TransactionStartTime': pd.to_datetime(['2023-01-01 10:00:00', '2023-01-02 12:00:00'])})
+        for _ in range(2):
+            # Cold and warm runs leave the input alike
+            result, _ = cache.apply(FeatureEngineering.extract_time_features, df)
+            self.assertEqual(list(df.columns), ['TransactionStartTime'])
+            self.assertIn('Transaction_Hour', result.columns)
+
+    def test_digest_index_keeps_one_entry_per_file(self):
+        with patch('builtins.print'):
+            cache = FeatureCache(self.cache_dir)
+            cache.load_csv(self.file_path)
+            for row in ['T4,103,5.0,2023-01-04 18:00:00\n', 'T5,103,6.0,2023-01-05 18:00:00\n']:
+                with open(self.file_path, 'a') as f:
+                    f.write(row)
+                cache.load_csv(self.file_path)
+        with open(os.path.join(self.cache_dir, 'file_digests.json')) as f:
+            index = json.load(f)
+        self.assertEqual(len(index), 1)
+        self.assertFalse([name for name in os.listdir(self.cache_dir) if name.endswith('.tmp')])
+
+    def test_apply_key_depends_on_arguments(self):
+        cache = FeatureCache(self.cache_dir)
+        df = pd.DataFrame({'Category': ['A', 'B', 'A'], 'Value': [1.0, 2.0, np.nan]})
+        _, key_a = cache.apply(FeatureEngineering.encode_categorical_features, df.copy(), ['Category'])
+        _, key_b = cache.apply(FeatureEngineering.encode_categorical_features, df.copy(), [])
+        self.assertNotEqual(key_a, key_b)
+
+    def test_read_table_caches_csv(self):
+        cache = FeatureCache(self.cache_dir)
+        expected = pd.read_csv(self.file_path)
+        pd.testing.assert_frame_equal(cache.read_table(self.file_path), expected)
+        with patch('pandas.read_csv') as mock_read_csv:
+            pd.testing.assert_frame_equal(cache.read_table(self.file_path), expected)
+            mock_read_csv.assert_not_called()
+
+    def test_function_digest_covers_callees(self):
+        """Editing a module a stage depends on changes the stage's digest."""
+        package_dir = os.path.join(self.tmp_dir.name, 'stagepkg')
+        os.makedirs(package_dir)
+        sources = {
+            '__init__.py': '',
+            'helpers.py': 'def double(x):\n    return 2 * x\n',
+            'stages.py': 'from stagepkg.helpers import double\n\n\ndef stage(df):\n    return double(df)\n',
+        }
+        for name, source in sources.items():
+            with open(os.path.join(package_dir, name), 'w') as f:
+                f.write(source)
+        sys.path.insert(0, self.tmp_dir.name)
+        try:
+            from stagepkg.stages import stage
+            digest = function_digest(stage)
+            self.assertEqual(function_digest(stage), digest)
+            with open(os.path.join(package_dir, 'helpers.py'), 'w') as f:
+                f.write('def double(x):\n    return x + x\n')
+            self.assertNotEqual(function_digest(stage), digest)
+        finally:
+            sys.path.remove(self.tmp_dir.name)
+            for name in ['stagepkg', 'stagepkg.helpers', 'stagepkg.stages']:
+                sys.modules.pop(name, None)
+
+    def test_cached_load_data_missing_file(self):
+        with patch('builtins.print') as mocked_print:
+            result = cached_load_data(os.path.join(self.tmp_dir.name, 'missing.csv'), self.cache_dir)
+        self.assertTrue(result.empty)
+        self.assertTrue(mocked_print.called)
+
+
+if __name__ == '__main__':
+    unittest.main()
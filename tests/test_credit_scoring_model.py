@@ -0,0 +1,206 @@
+import unittest
+import pandas as pd
+import numpy as np
+import os
+import sys
+import tempfile
+
+# Add the scripts directory to the path
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "scripts"))
+)
+
+from credit_scoring_model import CreditScoreRFM, RFMAccumulator, RFMScorer, WoEBinner
+
+
+class TestRFMAccumulator(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a sample transaction history."""
+        self.df = pd.DataFrame({
+            'TransactionId': [1, 2, 3, 4, 5, 6],
+            'CustomerId': [101, 101, 102, 103, 101, 102],
+            'Amount': [100.0, 200.0, 150.0, np.nan, -30.0, -10.0],
+            'TransactionStartTime': pd.to_datetime([
+                '2023-01-01 10:00:00', '2023-01-02 12:00:00', '2023-01-03 15:00:00',
+                '2023-01-04 18:00:00', '2023-01-05 09:00:00', '2023-01-06 11:00:00'], utc=True),
+        })
+        self.end_date = pd.Timestamp('2023-02-01', tz='UTC')
+
+    def expected_rfm(self):
+        expected = CreditScoreRFM(self.df.copy()).calculate_rfm().reset_index(drop=True)
+        # Recency is relative to "now" in calculate_rfm; compare against the fixed end date
+        last_access = self.df.groupby('CustomerId', sort=False)['TransactionStartTime'].max()
+        expected['Recency'] = (self.end_date - last_access).dt.days.to_numpy()
+        return expected
+
+    def test_chunked_matches_calculate_rfm(self):
+        chunks = (self.df.iloc[i:i + 2] for i in range(0, len(self.df), 2))
+        result = CreditScoreRFM.calculate_rfm_streaming(chunks, end_date=self.end_date)
+        pd.testing.assert_frame_equal(result, self.expected_rfm(), check_dtype=False)
+
+    def test_merge_partial_states(self):
+        left = RFMAccumulator().update(self.df.iloc[:3])
+        right = RFMAccumulator().update(self.df.iloc[3:])
+        result = left.merge(right).to_frame(self.end_date)
+        pd.testing.assert_frame_equal(result, self.expected_rfm(), check_dtype=False)
+        self.assertEqual(len(left), 3)
+
+    def test_monetary_defaults_to_one_without_amount(self):
+        result = RFMAccumulator().update(self.df.drop(columns='Amount')).to_frame(self.end_date)
+        self.assertTrue((result['Monetary'] == 1).all())
+
+    def test_state_grows_past_initial_capacity(self):
+        accumulator = RFMAccumulator(initial_capacity=1)
+        for i in range(len(self.df)):
+            accumulator.update(self.df.iloc[i:i + 1])
+        pd.testing.assert_frame_equal(accumulator.to_frame(self.end_date), self.expected_rfm(),
+                                      check_dtype=False)
+
+    def test_compact_state(self):
+        accumulator = RFMAccumulator().update(self.df)
+        self.assertEqual(accumulator.last_seen.dtype, np.int64)
+        self.assertEqual(accumulator.frequency.tolist(), [3, 2, 1])
+        np.testing.assert_allclose(accumulator.monetary, [270.0, 140.0, 0.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
+
+
+def qcut_rfm_scores(rfm_data):
+    """The original pd.qcut based scoring, used as the reference."""
+    rfm_data = rfm_data.copy()
+    rfm_data["r_quartile"] = pd.qcut(rfm_data["Recency"], 4, labels=["4", "3", "2", "1"])
+    rfm_data["f_quartile"] = pd.qcut(rfm_data["Frequency"], 4, labels=["1", "2", "3", "4"])
+    rfm_data["m_quartile"] = pd.qcut(rfm_data["Monetary"], 4, labels=["1", "2", "3", "4"])
+    rfm_data["RFM_Score"] = (
+        rfm_data["r_quartile"].astype(int) * 0.1
+        + rfm_data["f_quartile"].astype(int) * 0.45
+        + rfm_data["m_quartile"].astype(int) * 0.45
+    )
+    low_threshold = rfm_data["RFM_Score"].quantile(0.5)
+    rfm_data["Risk_Label"] = rfm_data["RFM_Score"].apply(
+        lambda x: "Good" if x >= low_threshold else "Bad"
+    )
+    return rfm_data
+
+
+class TestRFMScorer(unittest.TestCase):
+
+    def setUp(self):
+        """Set up RFM values with ties on the quartile edges."""
+        rng = np.random.default_rng(0)
+        self.rfm = pd.DataFrame({
+            'CustomerId': np.arange(200),
+            'Recency': rng.integers(0, 60, 200),
+            'Frequency': rng.integers(1, 30, 200),
+            'Monetary': rng.normal(1000, 500, 200).round(-1),
+        })
+
+    def test_matches_qcut_scoring(self):
+        expected = qcut_rfm_scores(self.rfm)
+        result = CreditScoreRFM(None).calculate_rfm_scores(self.rfm.copy())
+        for col in ['r_quartile', 'f_quartile', 'm_quartile']:
+            np.testing.assert_array_equal(result[col].to_numpy(), expected[col].astype(int).to_numpy())
+        np.testing.assert_allclose(result['RFM_Score'], expected['RFM_Score'])
+        np.testing.assert_array_equal(result['Risk_Label'], expected['Risk_Label'])
+
+    def test_fitted_edges_score_new_customers(self):
+        scorer = RFMScorer().fit(self.rfm)
+        new = pd.DataFrame({'Recency': [-5, 1000], 'Frequency': [0, 1000], 'Monetary': [-1e6, 1e6]})
+        scores = scorer.transform(new)
+        self.assertEqual(scores[['r_quartile', 'f_quartile', 'm_quartile']].values.tolist(),
+                         [[4, 1, 1], [1, 4, 4]])
+        np.testing.assert_array_equal(scores['Risk_Label'], ['Bad', 'Good'])
+
+    def test_missing_values_do_not_score_as_top_quartile(self):
+        scorer = RFMScorer().fit(self.rfm)
+        new = pd.DataFrame({'Recency': [np.nan, 0, 0], 'Frequency': [1000, np.nan, 1000],
+                            'Monetary': [1e6, 1e6, np.nan]})
+        scores = scorer.transform(new)
+        self.assertEqual(scores[['r_quartile', 'f_quartile', 'm_quartile']].values.tolist(),
+                         [[0, 4, 4], [4, 0, 4], [4, 4, 0]])
+        self.assertTrue(scores['RFM_Score'].isna().all())
+        np.testing.assert_array_equal(scores['Risk_Label'], ['Bad', 'Bad', 'Bad'])
+
+    def test_save_and_load(self):
+        scorer = RFMScorer().fit(self.rfm)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'rfm_scorer.pkl')
+            scorer.save(path)
+            loaded = RFMScorer.load(path)
+        pd.testing.assert_frame_equal(loaded.transform(self.rfm), scorer.transform(self.rfm))
+
+    def test_duplicate_edges_raise(self):
+        rfm = self.rfm.assign(Frequency=1)
+        with self.assertRaises(ValueError):
+            RFMScorer().fit(rfm)
+
+    def test_unfitted_raises(self):
+        with self.assertRaises(RuntimeError):
+            RFMScorer().transform(self.rfm)
+
+    def test_counts_match_groupby(self):
+        data = CreditScoreRFM(None).calculate_rfm_scores(self.rfm.copy())
+        data['RFM_bin'] = pd.qcut(data['RFM_Score'], 3, duplicates='drop').astype(str)
+        good_count, bad_count = CreditScoreRFM(None).calculate_counts(data)
+        grouped = data.groupby('RFM_bin')['Risk_Label']
+        pd.testing.assert_series_equal(good_count, grouped.apply(lambda x: (x == 'Good').sum()))
+        pd.testing.assert_series_equal(bad_count, grouped.apply(lambda x: (x == 'Bad').sum()))
+
+
+class TestWoEBinner(unittest.TestCase):
+
+    def setUp(self):
+        """Set up labelled data where 'signal' predicts the label and 'noise' does not."""
+        rng = np.random.default_rng(1)
+        n = 2000
+        signal = rng.normal(size=n)
+        self.df = pd.DataFrame({
+            'signal': signal,
+            'noise': rng.normal(size=n),
+            'channel': rng.choice(['web', 'android', 'ios'], n),
+            'Risk_Label': np.where(signal + rng.normal(scale=0.5, size=n) > 0, 'Good', 'Bad'),
+        })
+        self.df.loc[::40, 'noise'] = np.nan
+
+    def test_woe_matches_calculate_woe_per_bin(self):
+        binner = WoEBinner(['signal'], n_bins=4).fit(self.df)
+        data = pd.DataFrame({
+            'RFM_bin': pd.qcut(self.df['signal'], 4, labels=False),
+            'Risk_Label': self.df['Risk_Label'],
+        })
+        rfm = CreditScoreRFM(None)
+        expected = rfm.calculate_woe(*rfm.calculate_counts(data)).to_numpy()
+        np.testing.assert_allclose(binner.woe_['signal'][:4], expected)
+        # No missing values in training: the missing bin carries no evidence
+        self.assertEqual(binner.woe_['signal'][4], 0.0)
+
+    def test_transform_and_transform_array_agree(self):
+        binner = WoEBinner(['signal', 'noise']).fit(self.df)
+        from_frame = binner.transform(self.df).to_numpy()
+        from_array = binner.transform_array(self.df[['signal', 'noise']].to_numpy())
+        np.testing.assert_array_equal(from_frame, from_array)
+
+    def test_information_value_ranks_features(self):
+        binner = WoEBinner(['noise', 'channel', 'signal']).fit(self.df)
+        iv = binner.information_value()
+        self.assertEqual(iv.index[0], 'signal')
+        self.assertGreater(iv['signal'], 0.5)
+        self.assertLess(iv['noise'], 0.1)
+
+    def test_unseen_and_missing_values_use_missing_bin(self):
+        binner = WoEBinner(['channel', 'noise']).fit(self.df)
+        result = binner.transform(pd.DataFrame({'channel': ['ussd', None], 'noise': [np.nan, 1e9]}))
+        self.assertEqual(result['channel'].tolist(), [0.0, 0.0])
+        self.assertEqual(result['noise'].iloc[0], binner.woe_['noise'][-1])
+        self.assertEqual(result['noise'].iloc[1], binner.woe_['noise'][-2])
+
+    def test_save_and_load(self):
+        binner = WoEBinner(['signal', 'channel']).fit(self.df)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'woe.pkl')
+            binner.save(path)
+            loaded = WoEBinner.load(path)
+        pd.testing.assert_frame_equal(loaded.transform(self.df), binner.transform(self.df))
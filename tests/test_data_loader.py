@@ -3,6 +3,7 @@ import pandas as pd
 from unittest.mock import patch, mock_open
 import os
 import sys
+import tempfile
 
 # Add the scripts directory to the path
 sys.path.insert(
@@ -10,7 +11,79 @@ sys.path.insert(
 )
 
 
-from data_loader import load_data
+from data_loader import load_data, iter_data_chunks, csv_byte_ranges, parse_id_column, read_csv_range
+
+XENTE_SAMPLE = """TransactionId,BatchId,AccountId,SubscriptionId,CustomerId,CurrencyCode,CountryCode,ProviderId,ProductId,ProductCategory,ChannelId,Amount,Value,TransactionStartTime,PricingStrategy,FraudResult
+TransactionId_76871,BatchId_36123,AccountId_3957,SubscriptionId_887,CustomerId_4406,UGX,256,ProviderId_6,ProductId_10,airtime,ChannelId_3,1000.0,1000,2018-11-15T02:18:49Z,2,0
+TransactionId_73770,BatchId_15642,AccountId_4841,SubscriptionId_3829,CustomerId_4406,UGX,256,ProviderId_4,ProductId_6,financial_services,ChannelId_2,-20.0,20,2018-11-15T02:19:08Z,2,0
+TransactionId_26203,BatchId_53941,AccountId_4229,SubscriptionId_222,CustomerId_4683,UGX,256,ProviderId_6,ProductId_1,airtime,ChannelId_3,500.0,500,2018-11-15T02:44:21Z,2,0
+"""
+
+
+class TestIterDataChunks(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, 'data.csv')
+        with open(self.file_path, 'w') as f:
+            f.write(XENTE_SAMPLE)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_chunks_are_bounded_and_typed(self):
+        with patch('builtins.print'):
+            chunks = list(iter_data_chunks(self.file_path, chunksize=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        chunk = chunks[0]
+        self.assertEqual(chunk['TransactionId'].dtype, 'int32')
+        self.assertEqual(chunk['CustomerId'].tolist(), [4406, 4406])
+        self.assertIsInstance(chunk['ChannelId'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(chunk['ProviderId'].dtype, pd.CategoricalDtype)
+        self.assertEqual(chunk['PricingStrategy'].dtype, 'int8')
+        self.assertTrue(isinstance(chunk['TransactionStartTime'].dtype, pd.DatetimeTZDtype))
+
+    def test_column_projection(self):
+        columns = ['CustomerId', 'Amount', 'TransactionStartTime']
+        with patch('builtins.print'):
+            chunks = list(iter_data_chunks(self.file_path, columns=columns))
+        self.assertEqual(sorted(chunks[0].columns), sorted(columns))
+
+    def test_fixed_categories(self):
+        categories = {'ChannelId': ['ChannelId_1', 'ChannelId_2', 'ChannelId_3']}
+        with patch('builtins.print'):
+            chunks = list(iter_data_chunks(self.file_path, chunksize=1, categories=categories))
+        for chunk in chunks:
+            self.assertEqual(list(chunk['ChannelId'].cat.categories), categories['ChannelId'])
+
+    def test_byte_ranges_match_chunks(self):
+        """Parsing the byte ranges separately gives the rows and types of iter_data_chunks."""
+        names, ranges = csv_byte_ranges(self.file_path, target_bytes=100)
+        self.assertEqual(len(ranges), 3)
+        self.assertEqual(names[0], 'TransactionId')
+        with patch('builtins.print'):
+            chunks = list(iter_data_chunks(self.file_path, chunksize=1))
+        for (start, end), chunk in zip(ranges, chunks):
+            part = read_csv_range(self.file_path, start, end, names)
+            pd.testing.assert_frame_equal(part.set_axis(chunk.index), chunk)
+
+    def test_parse_id_column(self):
+        series = pd.Series(['CustomerId_4406', 'CustomerId_7', 'CustomerId_4406', '12'], index=[5, 6, 7, 8],
+                           name='CustomerId')
+        result = parse_id_column(series)
+        self.assertEqual(result.tolist(), [4406, 7, 4406, 12])
+        self.assertEqual(result.dtype, 'int32')
+        self.assertEqual(result.index.tolist(), [5, 6, 7, 8])
+        with self.assertRaises(ValueError):
+            parse_id_column(pd.Series(['CustomerId_1', None]))
+
+    def test_missing_file(self):
+        with patch('builtins.print') as mocked_print:
+            chunks = list(iter_data_chunks(os.path.join(self.tmp_dir.name, 'missing.csv')))
+        self.assertEqual(chunks, [])
+        self.assertTrue(mocked_print.called)
+
+
 class TestLoadData(unittest.TestCase):
 
     @patch('pandas.read_csv')
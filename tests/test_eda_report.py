@@ -0,0 +1,116 @@
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from scripts.eda_report import EDAReport, boxplot_spec, downsample, histogram_spec, render_figures
+
+
+class TestFigureSpecs(unittest.TestCase):
+
+    def setUp(self):
+        self.values = np.random.default_rng(0).lognormal(0, 1, 50_000)
+
+    def test_downsample_is_seeded_and_keeps_order(self):
+        values = np.arange(1_000)
+        sample = downsample(values, 100, seed=3)
+        self.assertEqual(len(sample), 100)
+        self.assertTrue(np.all(np.diff(sample) > 0))
+        np.testing.assert_array_equal(sample, downsample(values, 100, seed=3))
+        self.assertIs(downsample(values, 1_000), values)
+
+    def test_histogram_counts_all_rows_and_kde_uses_sample(self):
+        values = np.random.default_rng(2).normal(0, 1, 50_000)
+        values[::10] = np.nan
+        spec = histogram_spec(values, bins=15, max_rows=2_000)
+        present = values[~np.isnan(values)]
+        counts, edges = np.histogram(present, bins=15)
+        np.testing.assert_array_equal(spec['counts'], counts)
+        np.testing.assert_array_equal(spec['edges'], edges)
+        self.assertAlmostEqual(spec['mean'], present.mean())
+        self.assertAlmostEqual(spec['median'], np.median(present))
+        # The KDE is scaled to the counts, so its area is close to the histogram's
+        grid, curve = spec['kde']
+        area = np.sum((curve[1:] + curve[:-1]) / 2 * np.diff(grid))
+        self.assertAlmostEqual(area / (counts.sum() * (edges[1] - edges[0])), 1.0, delta=0.05)
+
+    def test_constant_and_empty_columns(self):
+        self.assertIsNone(histogram_spec(np.full(100, 256.0))['kde'])
+        self.assertEqual(len(histogram_spec(np.array([np.nan]))['counts']), 0)
+
+    def test_boxplot_matches_matplotlib(self):
+        from matplotlib.cbook import boxplot_stats
+
+        spec = boxplot_spec(self.values, max_fliers=50)
+        expected = boxplot_stats(self.values, whis=1.5)[0]
+        for key in ['med', 'q1', 'q3', 'whislo', 'whishi']:
+            self.assertAlmostEqual(spec['stats'][key], expected[key])
+        self.assertEqual(len(spec['stats']['fliers']), 50)
+        self.assertIn(f"({len(expected['fliers'])} outliers)", spec['title'])
+
+
+class TestEDAReport(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        n = 3_000
+        self.df = pd.DataFrame({
+            'CustomerId': np.arange(n) % 200,
+            'Amount': rng.normal(1_000, 300, n),
+            'Value': rng.exponential(500, n),
+            'CountryCode': np.full(n, 256),
+            'ProductCategory': pd.Categorical(rng.choice(['airtime', 'financial_services'], n)),
+            'TransactionStartTime': pd.date_range('2019-01-01', periods=n, freq='h', tz='UTC'),
+        })
+        self.rfm = pd.DataFrame({'Recency': rng.integers(0, 90, 200), 'Frequency': rng.integers(1, 30, 200),
+                                 'Monetary': rng.exponential(1e4, 200)})
+
+    def test_figure_specs(self):
+        report = EDAReport(self.df, rfm_data=self.rfm, max_rows=500)
+        self.assertEqual(report.numeric_columns(), ['Amount', 'Value', 'CountryCode'])
+        self.assertEqual(report.categorical_columns(), ['ProductCategory'])
+        sections = [section for section, _ in report.figure_specs()]
+        self.assertEqual(sections.count('Distribution of Numeric Variables'), 3)
+        self.assertEqual(sections.count('Outliers'), 3)
+        self.assertEqual(sections.count('RFM'), 5)
+        self.assertEqual(sections.count('Categorical Feature Distributions'), 1)
+
+    def test_parallel_rendering_matches_serial(self):
+        specs = [spec for _, spec in EDAReport(self.df, max_rows=500).figure_specs()]
+        serial = render_figures(specs, n_workers=1)
+        parallel = render_figures(specs, n_workers=2)
+        self.assertEqual(serial, parallel)
+        self.assertTrue(all(image.startswith(b'\x89PNG') for image in serial))
+
+    def test_write_html_report_and_figures(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'reports', 'eda.html')
+            figures_dir = os.path.join(tmp_dir, 'figures')
+            report = EDAReport(self.df, rfm_data=self.rfm, max_rows=500)
+            report.write(path, n_workers=1, figures_dir=figures_dir)
+            with open(path, encoding='utf-8') as f:
+                content = f.read()
+            n_figures = len(os.listdir(figures_dir))
+        self.assertEqual(content.count('data:image/png;base64,'), n_figures)
+        self.assertEqual(n_figures, len(report.figure_specs()))
+        for heading in ['Summary Statistics', 'Skewness', 'Correlation', 'Outliers', 'RFM']:
+            self.assertIn(f'<h2>{heading}</h2>', content)
+        self.assertNotIn('>CustomerId<', content)
+
+    def test_rendering_does_not_load_pyplot(self):
+        code = ("import sys; import numpy as np; from scripts.eda_report import histogram_spec, render_figure; "
+                "render_figure(histogram_spec(np.arange(10.0))); print('matplotlib.pyplot' in sys.modules)")
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+        self.assertEqual(result.stdout.strip(), 'False', result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
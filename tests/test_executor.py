@@ -0,0 +1,80 @@
+import unittest
+import asyncio
+import os
+import sys
+import threading
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.executor import ExecutorOverloaded, InferenceExecutor
+
+
+class TestInferenceExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = InferenceExecutor(max_workers=1, max_pending=2)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_runs_function_in_pool_thread(self):
+        async def main():
+            return await self.executor.run(lambda x, y=0: (x + y, threading.current_thread().name), 1, y=2)
+
+        total, thread_name = asyncio.run(main())
+        self.assertEqual(total, 3)
+        self.assertTrue(thread_name.startswith("inference"))
+
+    def test_event_loop_stays_responsive(self):
+        release = threading.Event()
+
+        async def main():
+            task = asyncio.ensure_future(self.executor.run(release.wait, 5))
+            # The loop keeps running other coroutines while the pool thread is busy
+            await asyncio.sleep(0.01)
+            self.assertFalse(task.done())
+            release.set()
+            return await task
+
+        self.assertTrue(asyncio.run(main()))
+
+    def test_rejects_calls_beyond_max_pending(self):
+        release = threading.Event()
+
+        async def main():
+            running = [asyncio.ensure_future(self.executor.run(release.wait, 5)) for _ in range(2)]
+            await asyncio.sleep(0)
+            self.assertEqual(self.executor.pending, 2)
+            with self.assertRaises(ExecutorOverloaded):
+                await self.executor.run(release.wait, 5)
+            release.set()
+            await asyncio.gather(*running)
+            # Slots are released once the work has finished
+            await asyncio.sleep(0)
+            return self.executor.pending
+
+        self.assertEqual(asyncio.run(main()), 0)
+
+    def test_slot_released_after_loop_closes(self):
+        """A call whose loop is closed before the work finishes still frees its slot."""
+        release = threading.Event()
+        loop = asyncio.new_event_loop()
+        task = loop.create_task(self.executor.run(release.wait, 5))
+        loop.run_until_complete(asyncio.sleep(0.01))
+        task.cancel()
+        loop.run_until_complete(asyncio.gather(task, return_exceptions=True))
+        loop.close()
+        self.assertEqual(self.executor.pending, 1)
+        release.set()
+        self.executor.shutdown()
+        self.assertEqual(self.executor.pending, 0)
+
+    def test_exceptions_propagate(self):
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            asyncio.run(self.executor.run(fail))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,7 +8,7 @@ import sys
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "scripts"))
 )
-from feature_engineering import FeatureEngineering  # Replace with the actual file name if needed
+from feature_engineering import CustomerSlots, FeatureEngineering  # Replace with the actual file name if needed
 
 
 class TestFeatureEngineering(unittest.TestCase):
@@ -33,6 +33,48 @@ class TestFeatureEngineering(unittest.TestCase):
         self.assertIn('Average_Transaction_Amount', df_result.columns)
         self.assertEqual(df_result.loc[df_result['CustomerId'] == 101, 'Transaction_Count'].iloc[0], 2)
     
+    def test_customer_features_match_groupby(self):
+        """Vectorized customer features equal the groupby/merge reference."""
+        df = pd.DataFrame({
+            'TransactionId': [1, 2, 3, 4, 5, 6, 7],
+            'CustomerId': [101, 101, 102, 103, 101, 102, np.nan],
+            'Amount': [100.0, -200.0, 150.0, np.nan, -30.0, 0.0, 5.0],
+        })
+        expected = df.merge(df.groupby('CustomerId').agg(
+            Total_Transaction_Amount=('Amount', 'sum'),
+            Average_Transaction_Amount=('Amount', 'mean'),
+            Transaction_Count=('TransactionId', 'count'),
+            Std_Transaction_Amount=('Amount', 'std'),
+            Net_Transaction_Amount=('Amount', 'sum'),
+            Debit_Count=('Amount', lambda x: (x > 0).sum()),
+            Credit_Count=('Amount', lambda x: (x < 0).sum()),
+        ).reset_index(), on='CustomerId', how='left')
+        expected['Debit_Credit_Ratio'] = expected['Debit_Count'] / (expected['Credit_Count'] + 1)
+
+        combined = FeatureEngineering.create_customer_features(df.copy())
+        chained = FeatureEngineering.create_transaction_features(
+            FeatureEngineering.create_aggregate_features(df.copy()))
+        for result in (combined, chained):
+            self.assertEqual(list(result.columns), list(expected.columns))
+            pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_customer_features_keep_integer_counts(self):
+        df_result = FeatureEngineering.create_customer_features(self.df)
+        self.assertTrue(np.issubdtype(df_result['Transaction_Count'].dtype, np.integer))
+        self.assertTrue(np.issubdtype(df_result['Debit_Count'].dtype, np.integer))
+        self.assertEqual(len(df_result), len(self.df))
+
+    def test_partial_aggregates(self):
+        """Partial reductions for incremental callers match their pandas equivalents."""
+        codes, uniques, stats = FeatureEngineering.customer_aggregates(
+            self.df, FeatureEngineering.PARTIAL_AGGREGATES)
+        self.assertEqual(list(uniques), [101, 102, 103])
+        self.assertEqual(codes.tolist(), [0, 0, 1, 2])
+        self.assertEqual(stats['Amount_Count'].tolist(), [2, 1, 0])
+        np.testing.assert_allclose(stats['Amount_M2'], [5000.0, 0.0, 0.0])
+        expected = pd.to_datetime(self.df['TransactionStartTime']).groupby(self.df['CustomerId']).max()
+        np.testing.assert_array_equal(stats['Last_Access_Date'], expected.to_numpy(dtype='datetime64[ns]'))
+
     def test_extract_time_features(self):
         """Test extraction of time-related features."""
         df_result = FeatureEngineering.extract_time_features(self.df)
@@ -58,5 +100,19 @@ class TestFeatureEngineering(unittest.TestCase):
         self.assertAlmostEqual(df_result['Amount'].min(), 0.0)
         self.assertAlmostEqual(df_result['Amount'].max(), 1.0)
 
+class TestCustomerSlots(unittest.TestCase):
+
+    def test_slots_are_stable_and_arrays_grow(self):
+        slots = CustomerSlots({'count': (np.int64, 0), 'last': (np.int64, -1)}, initial_capacity=2)
+        np.testing.assert_array_equal(slots.slots_for([7, 3]), [0, 1])
+        np.testing.assert_array_equal(slots.slots_for([3, 9, 11, 7]), [1, 2, 3, 0])
+        self.assertEqual(slots.customer_ids, [7, 3, 9, 11])
+        self.assertIn(9, slots)
+        np.testing.assert_array_equal(slots.find([11, 5]), [3, -1])
+        # New slots hold the fill value
+        np.testing.assert_array_equal(slots.view('last'), [-1, -1, -1, -1])
+        self.assertGreaterEqual(len(slots.arrays['count']), 4)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import pandas as pd
+import numpy as np
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.credit_scoring_model import CreditScoreRFM
+from scripts.feature_engineering import FeatureEngineering
+from scripts.feature_pipeline import FeaturePipeline
+from scripts.feature_store import CustomerFeatureStore
+from scripts.preprocessing import fit_preprocessor
+
+REQUIRED_FEATURES = [
+    'ProductCategory',
+    'PricingStrategy',
+    'Transaction_Count',
+    'Transaction_Month',
+    'Transaction_Year',
+    'Recency',
+    'Frequency',
+]
+
+
+def chained_features(df, end_date, preprocessor=None):
+    """Reference implementation: the original stage-by-stage chain used by the API."""
+    fe = FeatureEngineering()
+    df = fe.create_aggregate_features(df.copy())
+    df = fe.create_transaction_features(df)
+    df = fe.extract_time_features(df)
+    if preprocessor is not None:
+        df = preprocessor.transform(df)
+    else:
+        df = fe.encode_categorical_features(df, ['ProductCategory', 'ChannelId'])
+        numeric_cols = [col for col in df.select_dtypes(include='number').columns
+                        if col not in ['Amount', 'TransactionId']]
+        df = fe.normalize_numerical_features(df, numeric_cols, method='standardize')
+    rfm = CreditScoreRFM(df.reset_index())
+    rfm_df = rfm.calculate_rfm()
+    last_access = rfm.rfm_data.groupby('CustomerId', sort=False)['Last_Access_Date'].first()
+    rfm_df['Recency'] = (end_date - last_access).dt.days.to_numpy()
+    final_df = pd.merge(df, rfm_df, on='CustomerId', how='left')
+    return final_df.reindex(columns=REQUIRED_FEATURES, fill_value=0)
+
+
+class TestFeaturePipeline(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a sample batch of raw transactions."""
+        self.df = pd.DataFrame({
+            'TransactionId': [1, 2, 3, 4, 5],
+            'CustomerId': [10, 11, 10, 12, 10],
+            'ProductCategory': [2, 10, 2, 3, 1],
+            'ChannelId': ['ChannelId_3', 'ChannelId_2', 'ChannelId_3', 'ChannelId_1', 'ChannelId_3'],
+            'Amount': [1000.0, -50.0, 20.0, 500.0, 5.0],
+            'TransactionStartTime': pd.to_datetime([
+                '2018-11-15 02:18:49', '2018-12-01 10:00:00', '2019-01-03 15:00:00',
+                '2019-02-04 18:00:00', '2019-02-05 09:00:00'], utc=True),
+            'PricingStrategy': [2, 4, 2, 0, 1],
+        })
+        self.end_date = pd.Timestamp('2019-03-01', tz='UTC')
+
+    def test_matches_chained_features(self):
+        pipeline = FeaturePipeline(REQUIRED_FEATURES)
+        result = pipeline.transform_frame(self.df, end_date=self.end_date)
+        expected = chained_features(self.df, self.end_date)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_matches_chained_features_with_preprocessor(self):
+        preprocessor = fit_preprocessor(self.df)
+        pipeline = FeaturePipeline(REQUIRED_FEATURES, preprocessor=preprocessor)
+        batch = self.df.iloc[[1, 4]]
+        result = pipeline.transform_frame(batch, end_date=self.end_date)
+        expected = chained_features(batch, self.end_date, preprocessor)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_output_is_contiguous_float_matrix(self):
+        out = FeaturePipeline(REQUIRED_FEATURES).transform(self.df, end_date=self.end_date)
+        self.assertEqual(out.shape, (5, len(REQUIRED_FEATURES)))
+        self.assertEqual(out.dtype, np.float64)
+        self.assertTrue(out.flags['C_CONTIGUOUS'])
+
+    def test_plan_is_built_once(self):
+        pipeline = FeaturePipeline(REQUIRED_FEATURES + ['Debit_Credit_Ratio', 'Unknown'])
+        sources = {name: source for name, source, _ in pipeline.plan}
+        self.assertEqual(sources['Recency'], 'rfm')
+        self.assertEqual(sources['Transaction_Month'], 'time')
+        self.assertEqual(sources['Debit_Credit_Ratio'], 'customer')
+        self.assertEqual(pipeline.customer_aggregates, ['Transaction_Count', 'Debit_Credit_Ratio'])
+        out = pipeline.transform(self.df, end_date=self.end_date)
+        # Features that cannot be computed are filled with 0
+        np.testing.assert_array_equal(out[:, -1], 0.0)
+
+    def test_can_compute(self):
+        for name in REQUIRED_FEATURES + ['Debit_Credit_Ratio', 'Monetary', 'ChannelId', 'Amount']:
+            self.assertTrue(FeaturePipeline.can_compute(name), name)
+        for name in ['FraudResult', 'Value', 'CountryCode']:
+            self.assertFalse(FeaturePipeline.can_compute(name), name)
+        self.assertTrue(FeaturePipeline.can_compute('Value', input_columns=['Value']))
+
+    def test_feature_store_features(self):
+        store = CustomerFeatureStore()
+        pipeline = FeaturePipeline(['Frequency', 'Recency'], feature_store=store)
+        pipeline.transform(self.df.iloc[:3], end_date=self.end_date)
+        out = pipeline.transform(self.df.iloc[3:], end_date=self.end_date)
+        # Customer 10 has three transactions across both batches
+        np.testing.assert_array_equal(out[:, 0], [1, 3])
+        np.testing.assert_array_equal(out[:, 1], [24, 23])
+
+    def test_stored_count_survives_single_row_request(self):
+        """Without a preprocessor, store features are not standardized over the batch."""
+        store = CustomerFeatureStore()
+        store.update(self.df.iloc[:3])
+        pipeline = FeaturePipeline(['Transaction_Count', 'Amount'], feature_store=store)
+        out = pipeline.transform(self.df.iloc[4:5], end_date=self.end_date)
+        # Customer 10: two stored transactions and the one in the request
+        self.assertEqual(out[0, 0], 3)
+
+    def test_empty_batch(self):
+        out = FeaturePipeline(REQUIRED_FEATURES).transform(self.df.iloc[:0])
+        self.assertEqual(out.shape, (0, len(REQUIRED_FEATURES)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.feature_selection import (FeatureSelector, TargetCorrelation, load_selected_features,
+                                       serving_candidates)
+
+
+class TestTargetCorrelation(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 1_000
+        # A large offset would lose precision with plain sums of squares
+        self.X = pd.DataFrame({
+            'strong': 1e6 + rng.normal(size=n),
+            'weak': rng.normal(size=n),
+            'constant': np.full(n, 3.0),
+            'gappy': rng.normal(size=n),
+        })
+        self.y = pd.Series(self.X['strong'] - 1e6 + rng.normal(scale=0.5, size=n), name='target')
+        self.X['weak'] += 0.05 * self.y
+        self.X.loc[::5, 'gappy'] = np.nan
+        self.y[::11] = np.nan
+
+    def expected(self):
+        return self.X.assign(target=self.y).corr()['target'].drop('target')
+
+    def test_matches_pandas_corr(self):
+        result = TargetCorrelation().update(self.X, self.y).correlations()
+        pd.testing.assert_series_equal(result, self.expected(), check_names=False, rtol=1e-10)
+
+    def test_chunks_and_merge_match_single_pass(self):
+        chunked = TargetCorrelation()
+        for start in range(0, len(self.X), 170):
+            chunked.update(self.X.iloc[start:start + 170], self.y.iloc[start:start + 170])
+        first = TargetCorrelation().update(self.X.iloc[:400], self.y.iloc[:400])
+        merged = first.merge(TargetCorrelation().update(self.X.iloc[400:], self.y.iloc[400:]))
+        for result in (chunked.correlations(), merged.correlations()):
+            pd.testing.assert_series_equal(result, self.expected(), check_names=False, rtol=1e-10)
+
+    def test_different_columns_raise(self):
+        accumulator = TargetCorrelation().update(self.X, self.y)
+        with self.assertRaises(ValueError):
+            accumulator.update(self.X[['strong']], self.y)
+
+
+class TestFeatureSelector(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        n = 2_000
+        bad = rng.random(n) < 0.4
+        self.df = pd.DataFrame({
+            'CustomerId': np.arange(n),
+            'Recency': np.where(bad, 60.0, 10.0) + rng.normal(scale=20, size=n),
+            'Noise': rng.normal(size=n),
+            'Frequency': np.where(bad, 2.0, 5.0) + rng.normal(scale=3, size=n),
+            'Risk_Label': np.where(bad, 'Bad', 'Good'),
+        })
+
+    def test_selects_correlated_features_in_column_order(self):
+        selector = FeatureSelector().fit(self.df)
+        self.assertEqual(selector.selected_features_, ['Recency', 'Frequency'])
+        self.assertNotIn('CustomerId', selector.correlations_.index)
+        self.assertGreater(selector.correlations_['Recency'], 0)
+        self.assertIsNone(selector.information_value_)
+
+    def test_chunked_input_matches_in_memory(self):
+        in_memory = FeatureSelector().fit(self.df)
+        chunked = FeatureSelector().fit_chunks(self.df.iloc[i:i + 300] for i in range(0, len(self.df), 300))
+        self.assertEqual(chunked.selected_features_, in_memory.selected_features_)
+        pd.testing.assert_series_equal(chunked.correlations_, in_memory.correlations_)
+
+    def test_information_value_filter(self):
+        selector = FeatureSelector(threshold=0.0, min_iv=0.5).fit(self.df)
+        self.assertGreater(selector.information_value_['Recency'], 0.5)
+        self.assertLess(selector.information_value_['Noise'], 0.5)
+        self.assertNotIn('Noise', selector.selected_features_)
+        self.assertIn('Recency', selector.selected_features_)
+
+    def test_save_and_load_selected_features(self):
+        selector = FeatureSelector(compute_iv=True).fit(self.df)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'selected_features.json')
+            selector.save(path, data_sha256='abc')
+            self.assertEqual(load_selected_features(path), selector.selected_features_)
+            with open(path) as f:
+                saved = json.load(f)
+        self.assertEqual(saved['data_sha256'], 'abc')
+        self.assertEqual(set(saved['information_value']), {'Recency', 'Noise', 'Frequency'})
+
+    def test_serving_candidates_exclude_columns_missing_from_requests(self):
+        features_df = pd.DataFrame({
+            'CustomerId': [1, 2], 'Amount': [1.0, 2.0], 'Value': [1, 2], 'FraudResult': [0, 1],
+            'PricingStrategy': [2, 4], 'Transaction_Count': [1, 1], 'Transaction_Hour': [3, 4],
+        })
+        rfm_data = pd.DataFrame({'CustomerId': [1, 2], 'Recency': [1, 2], 'Frequency': [1, 1],
+                                 'Monetary': [1.0, 2.0], 'RFM_Score': [1, 2]})
+        self.assertEqual(serving_candidates(features_df, rfm_data, FeatureSelector()),
+                         ['Amount', 'PricingStrategy', 'Transaction_Count', 'Transaction_Hour',
+                          'Recency', 'Frequency', 'Monetary'])
+
+    def test_empty_selection_cannot_be_loaded(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'selected_features.json')
+            FeatureSelector(threshold=0.99).fit(self.df).save(path)
+            with self.assertRaises(ValueError):
+                load_selected_features(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
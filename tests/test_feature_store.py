@@ -0,0 +1,123 @@
+import unittest
+import pandas as pd
+import numpy as np
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.feature_engineering import FeatureEngineering
+from scripts.credit_scoring_model import CreditScoreRFM
+from scripts.feature_store import CustomerFeatureStore
+
+
+class TestCustomerFeatureStore(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a sample transaction history."""
+        self.df = pd.DataFrame({
+            'TransactionId': [1, 2, 3, 4, 5, 6],
+            'CustomerId': [101, 101, 102, 103, 101, 102],
+            'Amount': [100.0, 200.0, 150.0, np.nan, -30.0, -10.0],
+            'TransactionStartTime': pd.to_datetime([
+                '2023-01-01 10:00:00', '2023-01-02 12:00:00', '2023-01-03 15:00:00',
+                '2023-01-04 18:00:00', '2023-01-05 09:00:00', '2023-01-06 11:00:00'], utc=True),
+        })
+        self.end_date = pd.Timestamp('2023-02-01', tz='UTC')
+
+    def test_incremental_updates_match_groupby(self):
+        """Features after several updates equal the groupby over the full history."""
+        store = CustomerFeatureStore(initial_capacity=1)
+        for start in range(0, len(self.df), 2):
+            store.update(self.df.iloc[start:start + 2])
+        result = store.lookup(self.df['CustomerId'].tolist(), end_date=self.end_date)
+
+        expected = FeatureEngineering.create_aggregate_features(self.df.copy())
+        expected = FeatureEngineering.create_transaction_features(expected)
+        for col in CustomerFeatureStore.FEATURE_COLUMNS[:8]:
+            np.testing.assert_allclose(
+                result[col].to_numpy(dtype=float), expected[col].to_numpy(dtype=float), err_msg=col)
+
+        rfm = CreditScoreRFM(self.df.copy()).calculate_rfm().set_index('CustomerId')
+        np.testing.assert_array_equal(
+            result['Frequency'].to_numpy(), rfm.loc[self.df['CustomerId'], 'Frequency'].to_numpy())
+        np.testing.assert_allclose(
+            result['Monetary'].to_numpy(), rfm.loc[self.df['CustomerId'], 'Monetary'].to_numpy())
+
+    def test_replayed_transactions_are_not_counted_twice(self):
+        store = CustomerFeatureStore()
+        store.update(self.df.iloc[:2])
+        # A retry of the same request, then a batch repeating one transaction twice
+        store.update(self.df.iloc[:2])
+        store.update(self.df.iloc[[1, 1, 4]])
+        result = store.lookup([101], end_date=self.end_date)
+        self.assertEqual(result['Transaction_Count'].iloc[0], 3)
+        self.assertEqual(result['Total_Transaction_Amount'].iloc[0], 270.0)
+
+    def test_failed_update_does_not_mark_transactions_seen(self):
+        store = CustomerFeatureStore()
+        with patch.object(FeatureEngineering, 'customer_aggregates', side_effect=MemoryError):
+            with self.assertRaises(MemoryError):
+                store.update(self.df.iloc[:2])
+        store.update(self.df.iloc[:2])
+        # Both transactions of customer 101 are counted once the batch can be folded
+        self.assertEqual(store.lookup([101])['Transaction_Count'].iloc[0], 2)
+
+    def test_recency_uses_last_seen_time(self):
+        store = CustomerFeatureStore()
+        store.update(self.df)
+        result = store.lookup([101, 102], end_date=self.end_date)
+        self.assertEqual(result['Recency'].tolist(), [26, 25])
+
+    def test_unknown_customer(self):
+        store = CustomerFeatureStore()
+        store.update(self.df)
+        result = store.lookup([999], end_date=self.end_date)
+        self.assertEqual(result['Transaction_Count'].iloc[0], 0)
+        self.assertTrue(np.isnan(result['Average_Transaction_Amount'].iloc[0]))
+        self.assertTrue(pd.isna(result['Last_Access_Date'].iloc[0]))
+        self.assertNotIn(999, store)
+
+    def test_sqlite_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'features.db')
+            store = CustomerFeatureStore(path)
+            store.update(self.df.iloc[:3])
+            store.close()
+
+            reopened = CustomerFeatureStore(path)
+            self.assertEqual(len(reopened), 2)
+            # Transactions folded in before the restart are still recognized
+            reopened.update(self.df.iloc[2:])
+            expected = CustomerFeatureStore()
+            expected.update(self.df)
+            pd.testing.assert_frame_equal(
+                reopened.lookup([101, 102, 103], end_date=self.end_date),
+                expected.lookup([101, 102, 103], end_date=self.end_date))
+            reopened.close()
+
+    def test_dedup_window_is_bounded(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'features.db')
+            store = CustomerFeatureStore(path, dedup_window=3)
+            for i in range(len(self.df)):
+                store.update(self.df.iloc[i:i + 1])
+                store.flush()
+            self.assertEqual(list(store._seen_transactions), [4, 5, 6])
+            n_rows = store._connection.execute("SELECT COUNT(*) FROM seen_transactions").fetchone()[0]
+            self.assertEqual(n_rows, 3)
+            store.close()
+
+            reopened = CustomerFeatureStore(path, dedup_window=3)
+            self.assertEqual(list(reopened._seen_transactions), [4, 5, 6])
+            # A replay inside the window is skipped; one older than the window is counted again
+            reopened.update(self.df.iloc[[0, 4]])
+            self.assertEqual(reopened.lookup([101])['Transaction_Count'].iloc[0], 4)
+            reopened.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.api import app
+from benchmarks.loadtest import ProcessSampler, generate_load, load_payloads, run_load_test, summarize
+
+
+class TestLoadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.payloads = load_payloads(n_synthetic=50)
+
+    def test_load_payloads_json_and_ndjson(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_path = os.path.join(tmp_dir, "payloads.json")
+            ndjson_path = os.path.join(tmp_dir, "payloads.ndjson")
+            with open(json_path, "w") as f:
+                json.dump(self.payloads[:3], f)
+            with open(ndjson_path, "w") as f:
+                f.write("\n".join(json.dumps(payload) for payload in self.payloads[:3]) + "\n")
+            self.assertEqual(load_payloads(json_path), self.payloads[:3])
+            self.assertEqual(load_payloads(ndjson_path), self.payloads[:3])
+
+    def test_summarize_counts_errors(self):
+        summary = summarize([0.01, 0.02, 0.03], Counter({200: 3, 503: 1, "ReadTimeout": 1}),
+                            elapsed=1.0, rows_per_request=2)
+        self.assertEqual((summary["requests"], summary["ok"], summary["errors"]), (5, 3, 2))
+        self.assertAlmostEqual(summary["error_rate"], 0.4)
+        self.assertEqual(summary["errors_by_status"], {"503": 1, "ReadTimeout": 1})
+        self.assertEqual(summary["rows_per_sec"], 6.0)
+        self.assertAlmostEqual(summary["p50_ms"], 20.0)
+
+    def test_process_sampler_reads_proc(self):
+        sampler = ProcessSampler(os.getpid(), interval=0.05)
+        self.assertGreater(sampler.rss([os.getpid()]), 0)
+        sampler.start()
+        # Stay busy for a few sampling intervals
+        deadline = time.monotonic() + 0.3
+        while time.monotonic() < deadline:
+            sum(i * i for i in range(1_000))
+        server = sampler.stop()
+        self.assertGreater(server["rss_mb_max"], 0)
+        self.assertGreaterEqual(server["cpu_percent_max"], 0)
+
+    def in_process(self, **load):
+        transport = httpx.ASGITransport(app=app)
+        return asyncio.run(generate_load("http://test", self.payloads, transport=transport, **load))
+
+    def test_closed_loop_in_process(self):
+        summary = self.in_process(duration=0.5, concurrency=2)
+        self.assertGreater(summary["ok"], 0)
+        self.assertEqual(summary["errors"], 0)
+        self.assertLessEqual(summary["p50_ms"], summary["p99_ms"])
+
+    def test_open_loop_batches_in_process(self):
+        summary = self.in_process(duration=0.5, rate=10, batch_size=4)
+        self.assertEqual(summary["errors"], 0)
+        self.assertEqual(summary["rows_per_sec"], summary["requests_per_sec"] * 4)
+
+    def test_load_test_against_local_server(self):
+        report = run_load_test(self.payloads, duration=1.0, concurrency=2, warmup=0.2)
+        client = report["benchmarks"]["loadtest.predict"]
+        self.assertGreater(client["ok"], 0)
+        self.assertEqual(client["errors"], 0)
+        self.assertGreater(report["server"]["rss_mb_max"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
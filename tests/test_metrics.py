@@ -0,0 +1,69 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_renders_labelled_samples(self):
+        counter = self.registry.counter("requests_total", "Requests.", ["path", "status"])
+        counter.inc(path="/predict", status="200")
+        counter.inc(2, path="/predict", status="200")
+        self.assertEqual(counter.value(path="/predict", status="200"), 3)
+        text = self.registry.render()
+        self.assertIn("# TYPE requests_total counter", text)
+        self.assertIn('requests_total{path="/predict",status="200"} 3', text)
+        with self.assertRaises(ValueError):
+            counter.inc(-1, path="/predict", status="200")
+
+    def test_labels_must_match(self):
+        counter = self.registry.counter("requests_total", "Requests.", ["path"])
+        with self.assertRaises(ValueError):
+            counter.inc(route="/predict")
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.registry.histogram("latency_seconds", "Latency.", ["stage"], buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value, stage="model")
+        lines = self.registry.render().splitlines()
+        self.assertIn('latency_seconds_bucket{stage="model",le="0.1"} 2', lines)
+        self.assertIn('latency_seconds_bucket{stage="model",le="1"} 3', lines)
+        self.assertIn('latency_seconds_bucket{stage="model",le="+Inf"} 4', lines)
+        self.assertIn('latency_seconds_sum{stage="model"} 2.65', lines)
+        self.assertIn('latency_seconds_count{stage="model"} 4', lines)
+
+    def test_histogram_time_and_gauge(self):
+        histogram = self.registry.histogram("block_seconds", "Block time.")
+        with histogram.time():
+            pass
+        self.assertEqual(histogram.count(), 1)
+        gauge = self.registry.gauge("in_flight", "In flight.")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        self.assertEqual(gauge.value(), 1)
+
+    def test_callback_metric_skips_missing_values(self):
+        values = {"size": None}
+        self.registry.callback("cache_entries", "Entries.", lambda: values["size"])
+        self.assertEqual(self.registry.render().splitlines(),
+                         ["# HELP cache_entries Entries.", "# TYPE cache_entries gauge"])
+        values["size"] = 5
+        self.assertIn("cache_entries 5", self.registry.render().splitlines())
+
+    def test_duplicate_names_are_rejected(self):
+        self.registry.counter("requests_total", "Requests.")
+        with self.assertRaises(ValueError):
+            self.registry.gauge("requests_total", "Requests.")
+
+
+if __name__ == '__main__':
+    unittest.main()
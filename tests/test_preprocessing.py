@@ -0,0 +1,106 @@
+import unittest
+import pandas as pd
+import numpy as np
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.feature_engineering import FeatureEngineering
+from scripts.preprocessing import FeaturePreprocessor, fit_preprocessor
+
+
+class TestFeaturePreprocessor(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a sample DataFrame of engineered training features."""
+        self.df = pd.DataFrame({
+            'TransactionId': [1, 2, 3, 4],
+            'CustomerId': [101, 101, 102, 103],
+            'ProductCategory': [1, 2, 1, 3],
+            'ChannelId': ['ChannelId_1', 'ChannelId_3', 'ChannelId_3', 'ChannelId_2'],
+            'Amount': [100.0, 200.0, 150.0, -50.0],
+            'PricingStrategy': [2, 2, 4, 0],
+        })
+        self.preprocessor = FeaturePreprocessor().fit(self.df)
+
+    def test_matches_fit_transform_on_training_data(self):
+        """Transforming the training data reproduces encode + normalize."""
+        expected = FeatureEngineering.encode_categorical_features(
+            self.df.copy(), ['ProductCategory', 'ChannelId'])
+        expected = FeatureEngineering.normalize_numerical_features(
+            expected, ['ProductCategory', 'ChannelId', 'PricingStrategy']).reset_index()
+
+        result = self.preprocessor.transform(self.df)
+        for col in ['ProductCategory', 'ChannelId', 'PricingStrategy']:
+            np.testing.assert_allclose(result[col].to_numpy(), expected[col].to_numpy())
+        # Excluded columns are left untouched
+        pd.testing.assert_series_equal(result['Amount'], self.df['Amount'])
+        pd.testing.assert_series_equal(result['CustomerId'], self.df['CustomerId'])
+
+    def test_single_row_uses_training_statistics(self):
+        """A single row is not standardized to zero."""
+        result = self.preprocessor.transform(self.df.iloc[[2]])
+        self.assertNotAlmostEqual(result['PricingStrategy'].iloc[0], 0.0)
+
+    def test_transform_does_not_fit(self):
+        """No sklearn fitting happens on the transform path."""
+        with patch('sklearn.preprocessing.StandardScaler.fit') as mock_fit:
+            self.preprocessor.transform(self.df)
+            mock_fit.assert_not_called()
+
+    def test_unseen_category_is_encoded_as_minus_one(self):
+        row = self.df.iloc[[0]].copy()
+        row['ChannelId'] = 'ChannelId_99'
+        result = self.preprocessor.transform(row)
+        expected = (-1 - self.preprocessor.offset_[1]) / self.preprocessor.scale_[1]
+        self.assertEqual(self.preprocessor.numeric_cols_[1], 'ChannelId')
+        self.assertAlmostEqual(result['ChannelId'].iloc[0], expected)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'preprocessor.pkl')
+            self.preprocessor.save(path)
+            loaded = FeaturePreprocessor.load(path)
+        pd.testing.assert_frame_equal(loaded.transform(self.df), self.preprocessor.transform(self.df))
+
+    def test_transform_before_fit_raises(self):
+        with self.assertRaises(RuntimeError):
+            FeaturePreprocessor().transform(self.df)
+
+    def test_partial_fit_and_merge_match_fit(self):
+        """Fitting partitions separately and merging them gives the parameters of fit."""
+        df = pd.concat([self.df, self.df.assign(PricingStrategy=[1, 4, 4, 2], Amount=[5.0, 6.0, 7.0, 8.0])],
+                       ignore_index=True)
+        for method in ['standardize', 'normalize']:
+            expected = FeaturePreprocessor(method=method).fit(df)
+            merged = FeaturePreprocessor(method=method).partial_fit(df.iloc[:3])
+            merged.merge(FeaturePreprocessor(method=method).partial_fit(df.iloc[3:5]))
+            merged.partial_fit(df.iloc[5:])
+            self.assertEqual(merged.numeric_cols_, expected.numeric_cols_)
+            for col in ['ProductCategory', 'ChannelId']:
+                np.testing.assert_array_equal(merged.categories_[col], expected.categories_[col])
+            np.testing.assert_allclose(merged.offset_, expected.offset_)
+            np.testing.assert_allclose(merged.scale_, expected.scale_)
+            np.testing.assert_allclose(merged.mean_, expected.mean_)
+
+    def test_merge_requires_matching_partial_fit(self):
+        with self.assertRaises(ValueError):
+            FeaturePreprocessor().partial_fit(self.df).merge(self.preprocessor)
+        with self.assertRaises(ValueError):
+            FeaturePreprocessor().partial_fit(self.df).merge(
+                FeaturePreprocessor(method='normalize').partial_fit(self.df))
+
+    def test_fit_preprocessor_on_raw_transactions(self):
+        raw = self.df.assign(TransactionStartTime=pd.date_range('2023-01-01', periods=4, freq='D'))
+        preprocessor = fit_preprocessor(raw)
+        self.assertIn('Transaction_Count', preprocessor.numeric_cols_)
+        self.assertIn('Transaction_Month', preprocessor.numeric_cols_)
+        self.assertNotIn('CustomerId', preprocessor.numeric_cols_)
+
+
+if __name__ == '__main__':
+    unittest.main()
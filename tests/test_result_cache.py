@@ -0,0 +1,136 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from api.result_cache import PredictionCache, SQLiteCacheBackend, canonical_key
+
+
+class TestCanonicalKey(unittest.TestCase):
+
+    def test_ignores_field_order_and_utc_offset(self):
+        utc = datetime(2018, 11, 15, 2, 18, 49, tzinfo=timezone.utc)
+        local = utc.astimezone(timezone(timedelta(hours=3)))
+        self.assertEqual(
+            canonical_key({"CustomerId": 1, "TransactionStartTime": utc}),
+            canonical_key({"TransactionStartTime": local, "CustomerId": 1}),
+        )
+
+    def test_depends_on_values_and_namespace(self):
+        fields = {"CustomerId": 1, "Amount": 10.0}
+        self.assertNotEqual(canonical_key(fields), canonical_key({**fields, "Amount": 11.0}))
+        self.assertNotEqual(canonical_key(fields, "model-a"), canonical_key(fields, "model-b"))
+
+
+class TestPredictionCache(unittest.TestCase):
+
+    def test_hit_and_miss_counters(self):
+        cache = PredictionCache(max_size=10)
+        key = cache.key({"CustomerId": 1})
+        self.assertIsNone(cache.get(key))
+        cache.put(key, "Good")
+        self.assertEqual(cache.get(key), "Good")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (1, 1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_evicts_least_recently_used(self):
+        cache = PredictionCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_entries_expire(self):
+        cache = PredictionCache(ttl_seconds=0.01)
+        cache.put("a", 1)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_sqlite_backend_is_shared(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "predictions.db")
+            first = PredictionCache(backend=SQLiteCacheBackend(path))
+            second = PredictionCache(backend=SQLiteCacheBackend(path))
+            first.put("a", "Bad")
+            # A miss in the second process-local cache is answered by the shared backend
+            self.assertEqual(second.get("a"), "Bad")
+            self.assertEqual(second.hits, 1)
+            self.assertEqual(len(second), 1)
+            first.close()
+            second.close()
+
+    def test_sqlite_backend_expiry(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            backend = SQLiteCacheBackend(os.path.join(tmp, "predictions.db"))
+            backend.put("a", "Good", ttl_seconds=-1)
+            self.assertIsNone(backend.get("a"))
+            self.assertEqual(backend.purge_expired(), 1)
+            backend.close()
+
+    def test_sqlite_backend_stays_bounded(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            backend = SQLiteCacheBackend(os.path.join(tmp, "predictions.db"), max_entries=20)
+            for i in range(100):
+                backend.put(str(i), i, ttl_seconds=60 + i)
+            count = backend._connect().execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+            # Trimmed every max_entries // 10 writes, keeping the entries that live longest
+            self.assertLessEqual(count, 22)
+            self.assertEqual(backend.get("99"), 99)
+            self.assertIsNone(backend.get("0"))
+            backend.close()
+
+    def test_backend_hit_keeps_remaining_lifetime(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            backend = SQLiteCacheBackend(os.path.join(tmp, "predictions.db"))
+            backend.put("a", "Good", ttl_seconds=0.05)
+            cache = PredictionCache(ttl_seconds=60, backend=backend)
+            self.assertEqual(cache.get("a"), "Good")
+            time.sleep(0.1)
+            self.assertIsNone(cache.get("a"))
+            cache.close()
+
+    def test_async_backend_access_does_not_block_the_loop(self):
+        class SlowBackend:
+            def get_entry(self, key):
+                time.sleep(0.2)
+                return None
+
+            def put(self, key, value, ttl_seconds):
+                time.sleep(0.2)
+
+        cache = PredictionCache(backend=SlowBackend())
+        ticks = []
+
+        async def tick():
+            for _ in range(5):
+                await asyncio.sleep(0.02)
+                ticks.append(time.monotonic())
+
+        async def main():
+            ticker = asyncio.create_task(tick())
+            start = time.monotonic()
+            self.assertIsNone(await cache.aget("a"))
+            await cache.aput("a", "Bad")
+            await ticker
+            return start
+
+        start = asyncio.run(main())
+        # The loop kept running while the backend was busy
+        self.assertLess(ticks[-1] - start, 0.3)
+        self.assertEqual(cache.get("a"), "Bad")
+
+
+if __name__ == "__main__":
+    unittest.main()
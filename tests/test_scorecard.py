@@ -0,0 +1,64 @@
+import unittest
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.scorecard import CreditScorecard
+
+
+class TestCreditScorecard(unittest.TestCase):
+
+    def setUp(self):
+        self.scorecard = CreditScorecard(base_score=600, base_odds=1.0, pdo=50)
+
+    def test_points_to_double_odds(self):
+        # Even odds score the base score; each doubling of the good odds adds pdo points
+        scores = self.scorecard.score([0.5, 1 / 3, 1 / 5, 2 / 3])
+        np.testing.assert_array_equal(scores, [600, 650, 700, 550])
+
+    def test_scores_are_clipped_and_monotone(self):
+        probability = np.linspace(0.0, 1.0, 101)
+        scores = self.scorecard.score(probability)
+        self.assertEqual((scores.max(), scores.min()), (850, 300))
+        self.assertTrue(np.all(np.diff(scores) <= 0))
+
+    def test_loan_terms_by_band(self):
+        amounts, terms = self.scorecard.loan_terms([300, 500, 579, 580, 700, 850])
+        np.testing.assert_array_equal(amounts, [0, 50_000, 50_000, 200_000, 500_000, 1_000_000])
+        np.testing.assert_array_equal(terms, [0, 1, 1, 3, 6, 12])
+
+    def test_evaluate_returns_one_value_per_row(self):
+        result = self.scorecard.evaluate(np.array([0.1, 0.5, 0.9]))
+        self.assertEqual(set(result), {'risk_probability', 'credit_score', 'loan_amount', 'loan_term_months'})
+        for values in result.values():
+            self.assertEqual(len(values), 3)
+        np.testing.assert_array_equal(result['risk_probability'], [0.1, 0.5, 0.9])
+
+    def test_platt_calibration(self):
+        rng = np.random.default_rng(0)
+        true_probability = rng.uniform(0.05, 0.95, 20000)
+        y = (rng.uniform(size=20000) < true_probability).astype(int)
+        # An overconfident model: logits stretched by a factor of 3
+        z = np.log(true_probability / (1 - true_probability))
+        overconfident = 1 / (1 + np.exp(-3 * z))
+        calibrated = self.scorecard.calibrate(overconfident, y).calibrated_probability(overconfident)
+        self.assertLess(np.abs(calibrated - true_probability).mean(), 0.02)
+        self.assertAlmostEqual(self.scorecard.calibration_[0], 1 / 3, delta=0.05)
+
+    def test_save_and_load(self):
+        scorecard = CreditScorecard(loan_bands=[(550, 1000.0, 2)])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'scorecard.pkl')
+            scorecard.save(path)
+            loaded = CreditScorecard.load(path)
+        self.assertEqual(loaded.loan_bands, [(550, 1000.0, 2)])
+        np.testing.assert_array_equal(loaded.score([0.2, 0.7]), scorecard.score([0.2, 0.7]))
+
+
+if __name__ == '__main__':
+    unittest.main()
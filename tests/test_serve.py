@@ -0,0 +1,78 @@
+import unittest
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import joblib
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from api.api import load_model
+from api.serve import export_model
+from scripts.tree_engine import CompiledTreeEnsemble
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestExportModel(unittest.TestCase):
+
+    def test_exported_model_trees_are_memory_mapped(self):
+        original = joblib.load(os.path.join(ROOT, "api", "model", "best_model.pkl"))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = export_model(os.path.join(tmp, "model.pkl"))
+            mapped = load_model(path, mmap_mode="r")
+            self.assertIsInstance(mapped, CompiledTreeEnsemble)
+            # The tree nodes themselves, not only the scaler, are shared from the page cache
+            for name in ["feature", "threshold", "left", "right", "value"]:
+                self.assertIsInstance(getattr(mapped, name), np.memmap, name)
+            X = pd.DataFrame(
+                np.random.default_rng(0).normal(size=(20, len(original.feature_names_in_))),
+                columns=original.feature_names_in_,
+            )
+            np.testing.assert_array_equal(mapped.predict_proba(X), original.predict_proba(X))
+            del mapped
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "The pre-fork launcher requires os.fork")
+class TestPreforkServer(unittest.TestCase):
+
+    def test_workers_share_one_socket(self):
+        port = free_port()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "api.serve", "--port", str(port), "--workers", "2",
+             "--log-level", "warning"],
+            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            url = f"http://127.0.0.1:{port}/"
+            deadline = time.monotonic() + 60
+            while True:
+                try:
+                    response = httpx.get(url)
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline or process.poll() is not None:
+                        self.fail("Server did not start")
+                    time.sleep(0.2)
+            self.assertEqual(response.status_code, 200)
+            with open(f"/proc/{process.pid}/task/{process.pid}/children") as f:
+                self.assertEqual(len(f.read().split()), 2)
+        finally:
+            process.terminate()
+            self.assertEqual(process.wait(timeout=30), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
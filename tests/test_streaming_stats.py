@@ -0,0 +1,128 @@
+import unittest
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import generate_transactions, write_csv
+from scripts.eda_analysis import CreditRiskAnalysis
+from scripts.streaming_stats import (SUMMARY_COLUMNS, KLLSketch, MisraGries, StreamingSummary,
+                                     summarize_chunks, summarize_csv)
+
+
+def chunks_of(df, size):
+    return (df.iloc[start:start + size] for start in range(0, len(df), size))
+
+
+class TestStreamingSummary(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 1_500
+        self.df = pd.DataFrame({
+            'Amount': np.round(rng.normal(500, 200, n), -1),
+            'PricingStrategy': rng.integers(0, 5, n),
+            'Value': np.round(rng.exponential(300, n), -1) + 1e6,
+            'Constant': np.full(n, 2.0),
+            'Label': rng.choice(['a', 'b'], n),
+        })
+        self.df.loc[::7, 'Amount'] = np.nan
+
+    def expected(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return CreditRiskAnalysis(self.df).summary_statistics()
+
+    def test_matches_summary_statistics(self):
+        """Below the sketch sizes every statistic equals the in-memory version."""
+        result = summarize_chunks(chunks_of(self.df, 200))
+        expected = self.expected()
+        self.assertEqual(list(result.columns), SUMMARY_COLUMNS + ['mode_exact'])
+        self.assertEqual(SUMMARY_COLUMNS, list(expected.columns))
+        self.assertTrue(result['mode_exact'].all())
+        pd.testing.assert_frame_equal(result[SUMMARY_COLUMNS], expected, check_dtype=False, rtol=1e-9)
+
+    def test_merged_partitions_match_single_pass(self):
+        single = StreamingSummary().update(self.df).to_frame()
+        merged = StreamingSummary().update(self.df.iloc[:600])
+        merged.merge(StreamingSummary().update(self.df.iloc[600:1000]))
+        merged.merge(StreamingSummary().merge(StreamingSummary().update(self.df.iloc[1000:])))
+        pd.testing.assert_frame_equal(merged.to_frame(), single, rtol=1e-9)
+
+    def test_large_data_is_approximate_within_bounds(self):
+        rng = np.random.default_rng(1)
+        n = 200_000
+        df = pd.DataFrame({'x': rng.lognormal(0, 1, n), 'y': rng.integers(0, 5_000, n).astype(float)})
+        df.loc[:2_000, 'y'] = 7.0
+        result = summarize_chunks(chunks_of(df, 25_000), quantile_k=512, mode_k=64)
+        # Moments stay exact
+        self.assertAlmostEqual(result.loc['x', 'mean'], df['x'].mean(), places=10)
+        self.assertAlmostEqual(result.loc['x', 'skewness'], df['x'].skew(), places=8)
+        self.assertAlmostEqual(result.loc['x', 'kurtosis'], df['x'].kurtosis(), places=6)
+        # Quartiles are within a small rank error, and the heavy hitter is found
+        ordered = np.sort(df['x'].to_numpy())
+        for q, column in [(0.25, '25%'), (0.5, 'median'), (0.75, '75%')]:
+            rank = np.searchsorted(ordered, result.loc['x', column]) / n
+            self.assertLess(abs(rank - q), 0.01)
+        self.assertEqual(result.loc['y', 'mode'], 7.0)
+        self.assertFalse(result.loc['y', 'mode_exact'])
+        # Every value of the continuous column is distinct; the mode is estimated, not NaN
+        self.assertFalse(np.isnan(result.loc['x', 'mode']))
+        self.assertFalse(result.loc['x', 'mode_exact'])
+
+    def test_summarize_csv_in_parallel(self):
+        transactions = generate_transactions(3_000, n_customers=100, seed=2)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = write_csv(transactions, os.path.join(tmp_dir, 'data.csv'))
+            # Sketches larger than the data keep both runs exact, so they must agree
+            with contextlib.redirect_stdout(io.StringIO()):
+                serial = summarize_csv(path, n_workers=1, quantile_k=4096, mode_k=4096)
+            parallel = summarize_csv(path, n_workers=2, chunk_mb=0.1, quantile_k=4096, mode_k=4096)
+        # Identifiers are not summarized
+        self.assertNotIn('CustomerId', serial.index)
+        self.assertIn('Amount', serial.index)
+        pd.testing.assert_frame_equal(parallel, serial, rtol=1e-9)
+
+
+class TestSketches(unittest.TestCase):
+
+    def test_kll_is_exact_below_k(self):
+        values = np.random.default_rng(2).normal(size=300)
+        sketch = KLLSketch(k=512).update(values[:100]).update(values[100:])
+        np.testing.assert_allclose(sketch.quantile([0.1, 0.5, 0.9]), np.quantile(values, [0.1, 0.5, 0.9]))
+
+    def test_kll_preserves_total_weight(self):
+        sketch = KLLSketch(k=64)
+        for _ in range(10):
+            sketch.update(np.random.default_rng(3).random(1_001))
+        weight = sum(len(items) * 2 ** level for level, items in enumerate(sketch.levels))
+        self.assertEqual(weight, 10_010)
+        self.assertEqual(sketch.count, 10_010)
+        self.assertTrue(np.isnan(KLLSketch().quantile(0.5)[0]))
+
+    def test_misra_gries_mode(self):
+        summary = MisraGries(k=3).update(np.array([4.0, 4.0, 1.0, 1.0, np.nan]))
+        self.assertTrue(summary.exact)
+        # Ties resolve to the smallest value, like Series.mode
+        self.assertEqual(summary.mode(), 1.0)
+        summary.merge(MisraGries(k=3).update(np.array([9.0, 8.0, 7.0, 4.0, 4.0])))
+        self.assertFalse(summary.exact)
+        self.assertEqual(summary.mode(), 4.0)
+
+    def test_misra_gries_keeps_a_candidate_when_all_counts_tie(self):
+        summary = MisraGries(k=4)
+        for start in range(0, 100, 10):
+            summary.update(np.arange(start, start + 10, dtype=float))
+        self.assertFalse(summary.exact)
+        self.assertIn(summary.mode(), np.arange(100.0))
+        self.assertTrue(np.isnan(MisraGries().mode()))
+
+
+if __name__ == '__main__':
+    unittest.main()
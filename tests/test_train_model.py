@@ -0,0 +1,107 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.train_model import FEATURES, ModelTrainer, build_training_frame, candidate_models
+
+
+def make_customers(n=400, seed=0):
+    """Customer-level features where recent, frequent customers are good."""
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, len(FEATURES))), columns=FEATURES)
+    risk = 1.5 * X['Recency'] - X['Frequency'] + rng.normal(scale=0.5, size=n)
+    return X, pd.Series((risk > 0).astype(np.int64), name='Risk_Label')
+
+
+class TestBuildTrainingFrame(unittest.TestCase):
+
+    def test_one_row_per_customer_with_rfm_target(self):
+        features_df = pd.DataFrame({
+            'CustomerId': [1, 1, 2, 3],
+            'ProductCategory': [0.5, 0.1, -0.2, 0.3],
+            'PricingStrategy': [1.0, 2.0, 3.0, 4.0],
+            'Transaction_Count': [2.0, 2.0, 1.0, 1.0],
+            'Transaction_Month': [0.1, 0.1, 0.2, 0.3],
+            'Transaction_Year': [0.0, 0.0, 0.0, 0.0],
+        })
+        rfm = pd.DataFrame({
+            'CustomerId': [1, 2, 3],
+            'Recency': [1, 40, 80],
+            'Frequency': [2, 1, 1],
+            'Monetary': [300.0, 20.0, 10.0],
+            'Risk_Label': ['Good', 'Bad', None],
+        })
+        X, y = build_training_frame(features_df, rfm)
+        # Customers without a label are left out; the first transaction represents the customer
+        self.assertEqual(list(X.index), [1, 2])
+        self.assertEqual(list(X.columns), FEATURES)
+        self.assertEqual(X.loc[1, 'ProductCategory'], 0.5)
+        self.assertEqual(y.tolist(), [0, 1])
+
+
+class TestModelTrainer(unittest.TestCase):
+
+    def setUp(self):
+        self.X, self.y = make_customers()
+        self.candidates = {
+            'logistic_regression': (LogisticRegression(), {'classifier__C': [0.01, 1, 100]}),
+            'decision_tree': (DecisionTreeClassifier(random_state=0), {'classifier__max_depth': [1, 3, 5]}),
+        }
+
+    def test_selects_best_candidate_on_shared_folds(self):
+        trainer = ModelTrainer(self.candidates, cv=3, random_state=0).fit(self.X, self.y)
+        self.assertEqual(len(trainer.splits_), 3)
+        self.assertEqual(set(trainer.results_), set(self.candidates))
+        best_score = max(result['cv_score'] for result in trainer.results_.values())
+        self.assertEqual(trainer.results_[trainer.best_name_]['cv_score'], best_score)
+        # The data is linearly separable up to noise
+        self.assertEqual(trainer.best_name_, 'logistic_regression')
+        self.assertGreater(trainer.results_['logistic_regression']['test_metrics']['roc_auc'], 0.9)
+        self.assertIsNone(trainer.best_estimator_.memory)
+
+    def test_parallel_search_is_reproducible(self):
+        serial = ModelTrainer(self.candidates, cv=3, n_jobs=1, random_state=0).fit(self.X, self.y)
+        parallel = ModelTrainer(self.candidates, cv=3, n_jobs=2, random_state=0).fit(self.X, self.y)
+        for name in self.candidates:
+            self.assertEqual(parallel.results_[name]['best_params'], serial.results_[name]['best_params'])
+            self.assertAlmostEqual(parallel.results_[name]['cv_score'], serial.results_[name]['cv_score'])
+        np.testing.assert_allclose(parallel.best_estimator_.predict_proba(self.X),
+                                   serial.best_estimator_.predict_proba(self.X))
+
+    def test_save_writes_model_and_metadata(self):
+        trainer = ModelTrainer(self.candidates, cv=3, random_state=0).fit(self.X, self.y)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model_path = os.path.join(tmp_dir, 'model', 'best_model.pkl')
+            metadata_path = trainer.save(model_path)
+            self.assertEqual(metadata_path, os.path.join(tmp_dir, 'model', 'best_model.json'))
+            model = joblib.load(model_path)
+            with open(metadata_path) as f:
+                metadata = json.load(f)
+        np.testing.assert_allclose(model.predict_proba(self.X), trainer.best_estimator_.predict_proba(self.X))
+        self.assertEqual(metadata['model'], trainer.best_name_)
+        self.assertEqual(metadata['features'], FEATURES)
+        self.assertEqual(metadata['classes'], [0, 1])
+        self.assertEqual(metadata['n_train'] + metadata['n_test'], len(self.X))
+        self.assertEqual(set(metadata['candidates']), set(self.candidates))
+
+    def test_default_candidates_match_notebook_models(self):
+        candidates = candidate_models()
+        self.assertEqual(list(candidates), ['logistic_regression', 'decision_tree',
+                                            'random_forest', 'gradient_boosting'])
+        self.assertEqual(candidates['gradient_boosting'][0].n_iter_no_change, 10)
+        self.assertIsNone(candidate_models(early_stopping=False)['gradient_boosting'][0].n_iter_no_change)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.synthetic import generate_transactions, write_csv
+from scripts.data_loader import iter_data_chunks
+from scripts.preprocessing import FeaturePreprocessor
+from scripts.training_data import TrainingSetBuilder, engineer_partition, partition_of
+
+END_DATE = pd.Timestamp('2019-03-01', tz='UTC')
+
+
+class TestPartitionOf(unittest.TestCase):
+
+    def test_customers_stay_together(self):
+        customers = np.array([5, 7, 5, 9, 7, 5])
+        partitions = partition_of(customers, 4)
+        self.assertTrue(((partitions >= 0) & (partitions < 4)).all())
+        for customer in np.unique(customers):
+            self.assertEqual(len(set(partitions[customers == customer])), 1)
+        np.testing.assert_array_equal(partition_of(customers, 4), partitions)
+
+
+class TestTrainingSetBuilder(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.data_path = write_csv(generate_transactions(4_000, n_customers=200, seed=3),
+                                  os.path.join(cls.tmp_dir.name, 'data.csv'))
+        with patch('builtins.print'):
+            cls.transactions = next(iter_data_chunks(cls.data_path, chunksize=10_000))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def build(self, source=None, output='features.csv', **kwargs):
+        output_path = os.path.join(self.tmp_dir.name, output)
+        rfm_path = os.path.join(self.tmp_dir.name, 'rfm-' + output)
+        summary = TrainingSetBuilder(**kwargs).build(
+            self.data_path if source is None else source, output_path, rfm_path, end_date=END_DATE)
+        return summary, output_path, rfm_path
+
+    @staticmethod
+    def read_bytes(*paths):
+        contents = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                contents.append(f.read())
+        return contents
+
+    def test_output_does_not_depend_on_workers_or_spilling(self):
+        """Parallel, spilled builds write exactly the bytes of a single-process build."""
+        summary, *serial = self.build(n_workers=1, n_partitions=8)
+        self.assertEqual(summary['rows'], 4_000)
+        self.assertEqual(summary['spilled_files'], 0)
+
+        # Small ranges and a tiny memory limit force several tasks and spilling
+        summary, *parallel = self.build(output='parallel.csv', n_workers=2, n_partitions=8,
+                                        chunk_mb=0.1, memory_limit_mb=0.01)
+        self.assertGreater(summary['spilled_files'], 0)
+        self.assertEqual(self.read_bytes(*parallel), self.read_bytes(*serial))
+
+    def test_matches_in_memory_feature_engineering(self):
+        """The output equals engineering, encoding and scaling the whole table at once."""
+        _, output_path, rfm_path = self.build(n_workers=2, n_partitions=5, chunk_mb=0.1)
+        result = pd.read_csv(output_path)
+
+        engineered = engineer_partition(self.transactions.copy())
+        preprocessor = FeaturePreprocessor(exclude_cols=['Amount', 'TransactionId', 'CustomerId'])
+        expected = preprocessor.fit(engineered).transform(engineered)
+        # Missing values are imputed with the column mean, which is zero once standardized
+        expected[preprocessor.numeric_cols_] = expected[preprocessor.numeric_cols_].fillna(0.0)
+        self.assertEqual(list(result.columns), list(expected.columns))
+        self.assertFalse(result.isna().any().any())
+        numeric = [col for col in expected.columns if col != 'TransactionStartTime']
+        np.testing.assert_allclose(result[numeric].to_numpy(dtype=np.float64),
+                                   expected[numeric].to_numpy(dtype=np.float64), atol=1e-9)
+
+        rfm = pd.read_csv(rfm_path)
+        self.assertEqual(len(rfm), self.transactions['CustomerId'].nunique())
+        self.assertTrue(rfm['CustomerId'].is_monotonic_increasing)
+        self.assertTrue(set(rfm['Risk_Label']) <= {'Good', 'Bad'})
+
+    def test_cached_engineering_matches_uncached_build(self):
+        cache_dir = os.path.join(self.tmp_dir.name, 'cache')
+        _, *uncached = self.build(n_workers=1, n_partitions=4)
+        _, *first = self.build(output='cached.csv', n_workers=1, n_partitions=4, cache_dir=cache_dir)
+        with patch('scripts.training_data.FeatureEngineering.create_customer_features') as mock_features:
+            _, *second = self.build(output='cached.csv', n_workers=1, n_partitions=4, cache_dir=cache_dir)
+            mock_features.assert_not_called()
+        self.assertEqual(len(os.listdir(cache_dir)), 4)
+        self.assertEqual(self.read_bytes(*first), self.read_bytes(*uncached))
+        self.assertEqual(self.read_bytes(*second), self.read_bytes(*uncached))
+
+    def test_dataframe_source_and_parquet_output(self):
+        _, csv_path, _ = self.build(n_workers=1, n_partitions=4)
+        summary, parquet_path, rfm_path = self.build(self.transactions, output='features.parquet',
+                                                     n_workers=2, n_partitions=4, chunksize=1_500)
+        self.assertEqual(summary['rows'], 4_000)
+        result = pd.read_parquet(parquet_path)
+        expected = pd.read_csv(csv_path)
+        self.assertEqual(list(result.columns), list(expected.columns))
+        numeric = [col for col in expected.columns if col != 'TransactionStartTime']
+        np.testing.assert_allclose(result[numeric].to_numpy(dtype=np.float64),
+                                   expected[numeric].to_numpy(dtype=np.float64))
+        self.assertIn('Risk_Label', pd.read_parquet(rfm_path).columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
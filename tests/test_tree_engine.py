@@ -0,0 +1,97 @@
+import unittest
+import os
+import sys
+import tempfile
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+# Add the project root to the path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from scripts.tree_engine import CompiledTreeEnsemble
+
+
+class TestCompiledTreeEnsemble(unittest.TestCase):
+
+    def setUp(self):
+        """Set up a small binary classification problem."""
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(1000, 5))
+        self.y = np.where(self.X[:, 0] + 0.5 * self.X[:, 1] + rng.normal(size=1000) > 0, 'Bad', 'Good')
+
+    def assert_parity(self, model, X):
+        compiled = CompiledTreeEnsemble.from_sklearn(model)
+        np.testing.assert_array_equal(compiled.predict_proba(X), model.predict_proba(X))
+        np.testing.assert_array_equal(compiled.predict(X), model.predict(X))
+        return compiled
+
+    def test_best_model_parity(self):
+        model = joblib.load(os.path.join(ROOT, 'api', 'model', 'best_model.pkl'))
+        rng = np.random.default_rng(1)
+        X = pd.DataFrame(
+            rng.normal(size=(5000, 7)) * [1, 1, 10, 4, 1, 100, 50] + [2, 2, 5, 6, 2018, 30, 20],
+            columns=model.feature_names_in_,
+        )
+        compiled = self.assert_parity(model, X)
+        # Columns are matched by name, like sklearn
+        np.testing.assert_array_equal(compiled.predict(X[X.columns[::-1]]), model.predict(X))
+
+    def test_gradient_boosting_with_scaler_parity(self):
+        model = Pipeline([
+            ('scaler', StandardScaler()),
+            ('classifier', GradientBoostingClassifier(n_estimators=30, max_depth=4, random_state=0)),
+        ]).fit(self.X, self.y)
+        self.assert_parity(model, self.X)
+
+    def test_exponential_loss_probability_parity(self):
+        model = GradientBoostingClassifier(loss='exponential', n_estimators=30, random_state=0).fit(self.X, self.y)
+        compiled = self.assert_parity(model, self.X)
+        self.assertEqual(compiled.link_scale, 2.0)
+
+    def test_random_forest_parity_with_missing_values(self):
+        X = self.X.copy()
+        X[::9, 1] = np.nan
+        model = RandomForestClassifier(n_estimators=25, random_state=0).fit(X, self.y)
+        self.assert_parity(model, X)
+
+    def test_decision_tree_parity(self):
+        model = DecisionTreeClassifier(max_depth=6, random_state=0).fit(self.X, self.y)
+        compiled = self.assert_parity(model, self.X)
+        np.testing.assert_array_equal(compiled.apply(self.X)[:, 0], model.apply(self.X.astype(np.float32)))
+
+    def test_save_and_load_memory_mapped(self):
+        model = GradientBoostingClassifier(n_estimators=10, random_state=0).fit(self.X, self.y)
+        compiled = CompiledTreeEnsemble.from_sklearn(model)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'compiled.pkl')
+            compiled.save(path)
+            loaded = CompiledTreeEnsemble.load(path, mmap_mode='r')
+            self.assertIsInstance(loaded.threshold, np.memmap)
+            np.testing.assert_array_equal(loaded.predict_proba(self.X), model.predict_proba(self.X))
+            del loaded
+
+    def test_rejects_unsupported_models(self):
+        with self.assertRaises(TypeError):
+            CompiledTreeEnsemble.from_sklearn(LogisticRegression().fit(self.X, self.y))
+        with self.assertRaises(TypeError):
+            CompiledTreeEnsemble.from_sklearn(Pipeline([
+                ('scaler', MinMaxScaler()), ('tree', DecisionTreeClassifier())]).fit(self.X, self.y))
+
+    def test_gradient_boosting_rejects_nan(self):
+        model = GradientBoostingClassifier(n_estimators=5, random_state=0).fit(self.X, self.y)
+        X = self.X.copy()
+        X[0, 0] = np.nan
+        with self.assertRaises(ValueError):
+            CompiledTreeEnsemble.from_sklearn(model).predict(X)
+
+
+if __name__ == '__main__':
+    unittest.main()